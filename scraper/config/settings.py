@@ -3,6 +3,8 @@ Configuración del scraper Univalle
 """
 
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -10,54 +12,155 @@ from dotenv import load_dotenv
 env_path = Path(__file__).parent.parent / '.env'
 load_dotenv(dotenv_path=env_path)
 
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Configuración tipada del scraper.
+    
+    Se construye una sola vez al importar el módulo a partir de las variables
+    de entorno; las constantes en mayúsculas de este módulo son alias de sus
+    campos y se mantienen por compatibilidad.
+    """
+    # URLs
+    univalle_base_url: str
+    univalle_endpoint: str
+    univalle_periodos_url: str
+    
+    # Google Sheets
+    google_sheets_credentials_path: str
+    google_sheets_spreadsheet_id: str  # Deprecated: usar SOURCE/TARGET
+    google_sheets_source_id: str
+    google_sheets_target_id: str
+    
+    # Cookies opcionales (pueden estar vacías)
+    cookie_phpsessid: str
+    cookie_asigacad: str
+    
+    # Configuración de scraping
+    request_timeout: int
+    request_max_retries: int
+    request_retry_delay: int
+    
+    # Configuración de períodos
+    default_periodos_count: int
+    target_period: str
+    periodos_cache_file: str  # caché en disco de la lista de períodos
+    periodos_cache_ttl: int  # segundos; 0 desactiva la caché en disco
+    http_cache_name: str  # base SQLite de la caché HTTP del portal (requests_cache)
+    http_cache_ttl: int  # segundos; 0 (por defecto) desactiva la caché HTTP
+    
+    # Google Sheets API Configuration
+    sheets_read_timeout: int  # segundos
+    sheets_batch_size: int  # filas por batch
+    sheets_max_retries: int
+    sheets_retry_delay: int  # segundos iniciales
+    sheets_backoff_factor: float  # multiplicador de delay
+    
+    # Rate limiting
+    requests_per_minute: int
+    request_delay: float  # segundos entre requests
+    
+    # Configuración de logging
+    log_level: str
+    log_format: str
+    log_file: str
+
+
+def _cargar_settings() -> Settings:
+    """Lee y convierte todas las variables de entorno en una sola pasada."""
+    env = os.environ
+    base_url = env.get('UNIVALLE_BASE_URL', 'https://proxse26.univalle.edu.co/asignacion')
+    
+    return Settings(
+        univalle_base_url=base_url,
+        univalle_endpoint=f"{base_url}/vin_inicio_impresion.php3",
+        univalle_periodos_url=f"{base_url}/vin_docente.php3",
+        google_sheets_credentials_path=env.get('GOOGLE_SHEETS_CREDENTIALS_PATH', 'credentials.json'),
+        google_sheets_spreadsheet_id=env.get('GOOGLE_SHEETS_SPREADSHEET_ID', ''),
+        google_sheets_source_id=env.get('GOOGLE_SHEETS_SOURCE_ID', env.get('SHEET_SOURCE', '')),
+        google_sheets_target_id=env.get('GOOGLE_SHEETS_TARGET_ID', env.get('SHEET_TARGET', '')),
+        cookie_phpsessid=env.get('COOKIE_PHPSESSID', ''),
+        cookie_asigacad=env.get('COOKIE_ASIGACAD', ''),
+        request_timeout=int(env.get('REQUEST_TIMEOUT', '30')),
+        request_max_retries=int(env.get('REQUEST_MAX_RETRIES', '3')),
+        request_retry_delay=int(env.get('REQUEST_RETRY_DELAY', '2')),
+        default_periodos_count=int(env.get('DEFAULT_PERIODOS_COUNT', '8')),
+        target_period=env.get('TARGET_PERIOD', ''),
+        periodos_cache_file=env.get('PERIODOS_CACHE_FILE', 'periodos_cache.json'),
+        periodos_cache_ttl=int(env.get('PERIODOS_CACHE_TTL', '3600')),
+        http_cache_name=env.get('HTTP_CACHE_NAME', '.cache/univalle'),
+        http_cache_ttl=int(env.get('HTTP_CACHE_TTL', '0')),
+        sheets_read_timeout=int(env.get('SHEETS_READ_TIMEOUT', '120')),
+        sheets_batch_size=int(env.get('SHEETS_BATCH_SIZE', '1200')),
+        sheets_max_retries=int(env.get('SHEETS_MAX_RETRIES', '5')),
+        sheets_retry_delay=int(env.get('SHEETS_RETRY_DELAY', '5')),
+        sheets_backoff_factor=float(env.get('SHEETS_BACKOFF_FACTOR', '2')),
+        requests_per_minute=int(env.get('REQUESTS_PER_MINUTE', '60')),
+        request_delay=float(env.get('REQUEST_DELAY', '1.0')),
+        log_level=env.get('LOG_LEVEL', 'INFO'),
+        log_format=env.get('LOG_FORMAT', '%(asctime)s - %(name)s - %(levelname)s - %(message)s'),
+        log_file=env.get('LOG_FILE', 'scraper.log'),
+    )
+
+
+SETTINGS = _cargar_settings()
+
+# Alias de compatibilidad (los módulos importan estas constantes directamente)
 # URLs
-UNIVALLE_BASE_URL = os.getenv('UNIVALLE_BASE_URL', 'https://proxse26.univalle.edu.co/asignacion')
-UNIVALLE_ENDPOINT = f"{UNIVALLE_BASE_URL}/vin_inicio_impresion.php3"
-UNIVALLE_PERIODOS_URL = f"{UNIVALLE_BASE_URL}/vin_docente.php3"
+UNIVALLE_BASE_URL = SETTINGS.univalle_base_url
+UNIVALLE_ENDPOINT = SETTINGS.univalle_endpoint
+UNIVALLE_PERIODOS_URL = SETTINGS.univalle_periodos_url
 
 # Google Sheets
-GOOGLE_SHEETS_CREDENTIALS_PATH = os.getenv('GOOGLE_SHEETS_CREDENTIALS_PATH', 'credentials.json')
-GOOGLE_SHEETS_SPREADSHEET_ID = os.getenv('GOOGLE_SHEETS_SPREADSHEET_ID', '')  # Deprecated: usar SOURCE/TARGET
-GOOGLE_SHEETS_SOURCE_ID = os.getenv('GOOGLE_SHEETS_SOURCE_ID', os.getenv('SHEET_SOURCE', ''))
-GOOGLE_SHEETS_TARGET_ID = os.getenv('GOOGLE_SHEETS_TARGET_ID', os.getenv('SHEET_TARGET', ''))
+GOOGLE_SHEETS_CREDENTIALS_PATH = SETTINGS.google_sheets_credentials_path
+GOOGLE_SHEETS_SPREADSHEET_ID = SETTINGS.google_sheets_spreadsheet_id  # Deprecated: usar SOURCE/TARGET
+GOOGLE_SHEETS_SOURCE_ID = SETTINGS.google_sheets_source_id
+GOOGLE_SHEETS_TARGET_ID = SETTINGS.google_sheets_target_id
 
 # Cookies opcionales (pueden estar vacías)
-COOKIE_PHPSESSID = os.getenv('COOKIE_PHPSESSID', '')
-COOKIE_ASIGACAD = os.getenv('COOKIE_ASIGACAD', '')
+COOKIE_PHPSESSID = SETTINGS.cookie_phpsessid
+COOKIE_ASIGACAD = SETTINGS.cookie_asigacad
 
 # Configuración de scraping
-REQUEST_TIMEOUT = int(os.getenv('REQUEST_TIMEOUT', '30'))
-REQUEST_MAX_RETRIES = int(os.getenv('REQUEST_MAX_RETRIES', '3'))
-REQUEST_RETRY_DELAY = int(os.getenv('REQUEST_RETRY_DELAY', '2'))
+REQUEST_TIMEOUT = SETTINGS.request_timeout
+REQUEST_MAX_RETRIES = SETTINGS.request_max_retries
+REQUEST_RETRY_DELAY = SETTINGS.request_retry_delay
 
 # Configuración de períodos
-DEFAULT_PERIODOS_COUNT = int(os.getenv('DEFAULT_PERIODOS_COUNT', '8'))
-TARGET_PERIOD = os.getenv('TARGET_PERIOD', '')
+DEFAULT_PERIODOS_COUNT = SETTINGS.default_periodos_count
+TARGET_PERIOD = SETTINGS.target_period
+PERIODOS_CACHE_FILE = SETTINGS.periodos_cache_file
+PERIODOS_CACHE_TTL = SETTINGS.periodos_cache_ttl
+HTTP_CACHE_NAME = SETTINGS.http_cache_name
+HTTP_CACHE_TTL = SETTINGS.http_cache_ttl
 
 # Google Sheets API Configuration
-SHEETS_READ_TIMEOUT = int(os.getenv('SHEETS_READ_TIMEOUT', '120'))  # segundos
-SHEETS_BATCH_SIZE = int(os.getenv('SHEETS_BATCH_SIZE', '1200'))  # filas por batch
-SHEETS_MAX_RETRIES = int(os.getenv('SHEETS_MAX_RETRIES', '5'))
-SHEETS_RETRY_DELAY = int(os.getenv('SHEETS_RETRY_DELAY', '5'))  # segundos iniciales
-SHEETS_BACKOFF_FACTOR = float(os.getenv('SHEETS_BACKOFF_FACTOR', '2'))  # multiplicador de delay
+SHEETS_READ_TIMEOUT = SETTINGS.sheets_read_timeout
+SHEETS_BATCH_SIZE = SETTINGS.sheets_batch_size
+SHEETS_MAX_RETRIES = SETTINGS.sheets_max_retries
+SHEETS_RETRY_DELAY = SETTINGS.sheets_retry_delay
+SHEETS_BACKOFF_FACTOR = SETTINGS.sheets_backoff_factor
 
 # Rate limiting
-REQUESTS_PER_MINUTE = int(os.getenv('REQUESTS_PER_MINUTE', '60'))
-REQUEST_DELAY = float(os.getenv('REQUEST_DELAY', '1.0'))  # segundos entre requests
+REQUESTS_PER_MINUTE = SETTINGS.requests_per_minute
+REQUEST_DELAY = SETTINGS.request_delay
 
 # Configuración de logging
-LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
-LOG_FORMAT = os.getenv(
-    'LOG_FORMAT',
-    '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-LOG_FILE = os.getenv('LOG_FILE', 'scraper.log')
+LOG_LEVEL = SETTINGS.log_level
+LOG_FORMAT = SETTINGS.log_format
+LOG_FILE = SETTINGS.log_file
 
 # Validación de configuración requerida
+@lru_cache(maxsize=1)
 def validate_config():
     """
     Valida que la configuración requerida esté presente.
     
+    El resultado exitoso se cachea: la configuración se resuelve una sola vez
+    al importar el módulo, así que llamadas repetidas no vuelven a tocar el
+    sistema de archivos. Si la validación falla, la excepción no se cachea.
+    
     Raises:
         ValueError: Si falta configuración requerida
     """
@@ -81,8 +184,12 @@ def validate_config():
     # La validación del formato se hace en period_manager.get_target_period()
     
     # Verificar que el archivo de credenciales existe si se especificó
-    if GOOGLE_SHEETS_CREDENTIALS_PATH and not Path(GOOGLE_SHEETS_CREDENTIALS_PATH).exists():
-        raise FileNotFoundError(
-            f"Archivo de credenciales no encontrado: {GOOGLE_SHEETS_CREDENTIALS_PATH}"
-        )
+    # (un solo stat, sin construir un objeto Path)
+    if GOOGLE_SHEETS_CREDENTIALS_PATH:
+        try:
+            os.stat(GOOGLE_SHEETS_CREDENTIALS_PATH)
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"Archivo de credenciales no encontrado: {GOOGLE_SHEETS_CREDENTIALS_PATH}"
+            ) from None
 
@@ -3,15 +3,23 @@ Orquestador principal del scraper Univalle
 """
 #CL=Clase, PS=Practica Supervisada, MG=Clase Magistral, LB=Laboratorio, TA=Tutoria Academica, TD=Trabajo de campo, CD=Curso Dirigido, SM=Seminario, TL=Taller
 import sys
+import atexit
 import logging
 import argparse
+import queue
 import time
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
 from datetime import datetime
-from collections import defaultdict
+from contextlib import nullcontext
+from itertools import chain, islice
+from operator import attrgetter, itemgetter
 import json
 import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+
+import requests
 
 try:
     from tqdm import tqdm
@@ -24,6 +32,12 @@ except ImportError:
             print(desc)
         return iterable
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Agregar el directorio padre al path para imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -36,24 +50,43 @@ from scraper.config.settings import (
     TARGET_PERIOD,
 )
 from scraper.services.univalle_scraper import UnivalleScraper, DatosDocente
-from scraper.services.sheets_service import SheetsService
+from scraper.services.sheets_service import SheetsService, SheetsWriteBuffer
 from scraper.services.period_manager import PeriodManager
 from scraper.utils.helpers import (
     validar_cedula,
     limpiar_cedula,
     formatear_nombre_completo,
 )
+from scraper.utils.ratelimit import TokenBucket, AdaptiveTokenBucket
+
+logger = logging.getLogger(__name__)
 
 
 def configurar_logging():
-    """Configura el sistema de logging."""
+    """
+    Configura el sistema de logging.
+    
+    Los loggers solo encolan registros (QueueHandler); un QueueListener en su
+    propio hilo los formatea y escribe en archivo y stdout, así el formateo y
+    la E/S de los logs no frenan los hilos de scraping.
+    """
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [
+        logging.FileHandler(LOG_FILE, encoding='utf-8'),
+        logging.StreamHandler(sys.stdout)
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    cola_logs = queue.Queue(-1)
+    listener = QueueListener(cola_logs, *handlers, respect_handler_level=True)
+    listener.start()
+    # Vaciar la cola antes de salir para no perder los últimos registros
+    atexit.register(listener.stop)
+    
     logging.basicConfig(
         level=getattr(logging, LOG_LEVEL.upper()),
-        format=LOG_FORMAT,
-        handlers=[
-            logging.FileHandler(LOG_FILE, encoding='utf-8'),
-            logging.StreamHandler(sys.stdout)
-        ]
+        handlers=[QueueHandler(cola_logs)]
     )
 
 
@@ -64,7 +97,8 @@ def procesar_docente(
     scraper: UnivalleScraper,
     sheets_service: SheetsService,
     cedula: str,
-    periodos: List[Dict[str, Any]]
+    periodos: List[Dict[str, Any]],
+    buffer: Optional[SheetsWriteBuffer] = None
 ) -> Dict[str, Any]:
     """
     Procesa un docente para múltiples períodos.
@@ -74,18 +108,20 @@ def procesar_docente(
         sheets_service: Instancia del servicio de Sheets
         cedula: Cédula del docente
         periodos: Lista de períodos a procesar
+        buffer: Buffer de escritura compartido entre docentes (None = uno propio
+            que se vacía al terminar este docente)
         
     Returns:
-        Diccionario con resultados del procesamiento
+        Diccionario con resultados del procesamiento. Un período consta en
+        'periodos_procesados' cuando sus filas ya están escritas; con un buffer
+        compartido eso ocurre al vaciarse el buffer, no al retornar
     """
-    logger = logging.getLogger(__name__)
-    
     cedula_limpia = limpiar_cedula(cedula)
     
     if not validar_cedula(cedula_limpia):
         raise ValueError(f"Cédula inválida: {cedula}")
     
-    logger.info(f"Procesando docente: {cedula_limpia}")
+    logger.info("Procesando docente: %s", cedula_limpia)
     
     resultados = {
         'cedula': cedula_limpia,
@@ -93,49 +129,83 @@ def procesar_docente(
         'errores': []
     }
     
-    for periodo in periodos:
-        periodo_id = periodo['idPeriod']
-        periodo_label = periodo['label']
-        
-        try:
-            logger.info(f"Procesando período {periodo_label} (ID: {periodo_id})")
-            
-            # Scraping
-            datos = scraper.procesar_docente(cedula_limpia, periodo_id)
-            
-            # Guardar en Sheets
-            guardar_datos_en_sheets(sheets_service, datos, periodo_label)
-            
-            resultados['periodos_procesados'].append({
-                'periodo': periodo_label,
-                'idPeriod': periodo_id,
-                'pregrado': len(datos.actividades_pregrado),
-                'postgrado': len(datos.actividades_postgrado),
-                'investigacion': len(datos.actividades_investigacion),
-            })
-            
-            logger.info(
-                f"Período {periodo_label} completado: "
-                f"{len(datos.actividades_pregrado)} pregrado, "
-                f"{len(datos.actividades_postgrado)} postgrado, "
-                f"{len(datos.actividades_investigacion)} investigación"
-            )
+    # Scraping de todos los períodos en paralelo (un request por período)
+    datos_por_periodo = scraper.procesar_docente_multi(
+        cedula_limpia,
+        [periodo['idPeriod'] for periodo in periodos]
+    )
+    
+    # Las filas de todos los períodos se escriben juntas al final
+    with nullcontext(buffer) if buffer is not None else SheetsWriteBuffer(sheets_service) as buffer:
+        for periodo in periodos:
+            periodo_id = periodo['idPeriod']
+            periodo_label = periodo['label']
             
-        except Exception as e:
-            error_msg = f"Error procesando período {periodo_label}: {e}"
-            logger.error(error_msg, exc_info=True)
-            resultados['errores'].append({
-                'periodo': periodo_label,
-                'error': str(e)
-            })
+            try:
+                logger.info("Procesando período %s (ID: %s)", periodo_label, periodo_id)
+                
+                datos = datos_por_periodo[periodo_id]
+                if isinstance(datos, Exception):
+                    raise datos
+                
+                resumen = {
+                    'periodo': periodo_label,
+                    'idPeriod': periodo_id,
+                    'pregrado': len(datos.actividades_pregrado),
+                    'postgrado': len(datos.actividades_postgrado),
+                    'investigacion': len(datos.actividades_investigacion),
+                }
+                
+                # El período cuenta como procesado cuando el buffer escribe sus filas
+                def _al_escribir(error: Optional[Exception], resumen: Dict[str, Any] = resumen):
+                    if error is None:
+                        resultados['periodos_procesados'].append(resumen)
+                    else:
+                        logger.error(
+                            "Filas de %s para período %s no escritas: %s",
+                            cedula_limpia, resumen['periodo'], error
+                        )
+                        resultados['errores'].append({
+                            'periodo': resumen['periodo'],
+                            'error': str(error)
+                        })
+                
+                # Guardar en Sheets
+                guardar_datos_en_sheets(
+                    sheets_service, datos, periodo_label, buffer=buffer, al_terminar=_al_escribir
+                )
+                
+                logger.info(
+                    "Período %s scrapeado: %d pregrado, %d postgrado, %d investigación",
+                    periodo_label,
+                    len(datos.actividades_pregrado),
+                    len(datos.actividades_postgrado),
+                    len(datos.actividades_investigacion)
+                )
+                
+            except Exception as e:
+                error_msg = f"Error procesando período {periodo_label}: {e}"
+                logger.error(error_msg, exc_info=True)
+                resultados['errores'].append({
+                    'periodo': periodo_label,
+                    'error': str(e)
+                })
     
     return resultados
 
 
+# Columnas de una asignatura (pregrado/postgrado) tras cédula y período
+_campos_asignatura = attrgetter('codigo', 'nombre_asignatura', 'grupo', 'tipo', 'horas_semestre')
+# Columnas de una actividad de investigación tras cédula y período
+_campos_investigacion = attrgetter('codigo', 'nombre_proyecto', 'aprobado_por', 'horas_semestre')
+
+
 def guardar_datos_en_sheets(
     sheets_service: SheetsService,
     datos: DatosDocente,
-    periodo_label: str
+    periodo_label: str,
+    buffer: Optional[SheetsWriteBuffer] = None,
+    al_terminar: Optional[Callable[[Optional[Exception]], None]] = None
 ):
     """
     Guarda los datos de un docente en Google Sheets.
@@ -144,9 +214,10 @@ def guardar_datos_en_sheets(
         sheets_service: Instancia del servicio de Sheets
         datos: Datos del docente
         periodo_label: Label del período
+        buffer: Buffer donde acumular las filas (None = escribir directamente)
+        al_terminar: Se llama con None cuando las filas están escritas; con buffer,
+            también con el error si se descartan (ver SheetsWriteBuffer.agregar_lote)
     """
-    logger = logging.getLogger(__name__)
-    
     info = datos.informacion_personal
     
     # Hoja principal del período
@@ -168,66 +239,73 @@ def guardar_datos_en_sheets(
         info.cargo,
     ]
     
-    sheets_service.agregar_fila(hoja_principal, fila_principal)
+    filas_por_hoja = {hoja_principal: [fila_principal]}
     
-    # Guardar actividades de pregrado
-    if datos.actividades_pregrado:
-        hoja_pregrado = f"{hoja_principal}_Pregrado"
-        filas_pregrado = []
-        
-        for actividad in datos.actividades_pregrado:
-            fila = [
-                info.cedula,
-                periodo_label,
-                actividad.codigo,
-                actividad.nombre_asignatura,
-                actividad.grupo,
-                actividad.tipo,
-                actividad.horas_semestre,
-            ]
-            filas_pregrado.append(fila)
-        
-        sheets_service.agregar_filas(hoja_pregrado, filas_pregrado)
-        logger.debug(f"Guardadas {len(filas_pregrado)} actividades de pregrado")
+    # Guardar actividades de pregrado, postgrado e investigación: las columnas
+    # comunes se calculan una vez y el resto se extrae con un attrgetter por tipo
+    prefijo = (info.cedula, periodo_label)
+    for actividades, sufijo, nivel, campos in (
+        (datos.actividades_pregrado, 'Pregrado', 'pregrado', _campos_asignatura),
+        (datos.actividades_postgrado, 'Postgrado', 'postgrado', _campos_asignatura),
+        (datos.actividades_investigacion, 'Investigacion', 'investigación', _campos_investigacion),
+    ):
+        if not actividades:
+            continue
+        filas = [[*prefijo, *valores] for valores in map(campos, actividades)]
+        filas_por_hoja[f"{hoja_principal}_{sufijo}"] = filas
+        logger.debug("Preparadas %d actividades de %s", len(filas), nivel)
     
-    # Guardar actividades de postgrado
-    if datos.actividades_postgrado:
-        hoja_postgrado = f"{hoja_principal}_Postgrado"
-        filas_postgrado = []
-        
-        for actividad in datos.actividades_postgrado:
-            fila = [
-                info.cedula,
-                periodo_label,
-                actividad.codigo,
-                actividad.nombre_asignatura,
-                actividad.grupo,
-                actividad.tipo,
-                actividad.horas_semestre,
-            ]
-            filas_postgrado.append(fila)
-        
-        sheets_service.agregar_filas(hoja_postgrado, filas_postgrado)
-        logger.debug(f"Guardadas {len(filas_postgrado)} actividades de postgrado")
+    # Todas las hojas del período como un solo lote del buffer
+    if buffer is not None:
+        buffer.agregar_lote(filas_por_hoja, al_terminar)
+        return
     
-    # Guardar actividades de investigación
-    if datos.actividades_investigacion:
-        hoja_investigacion = f"{hoja_principal}_Investigacion"
-        filas_investigacion = []
-        
-        for actividad in datos.actividades_investigacion:
-            fila = [
-                info.cedula,
-                periodo_label,
-                actividad.codigo,
-                actividad.nombre_proyecto,
-                actividad.aprobado_por,
-                actividad.horas_semestre,
-            ]
-            filas_investigacion.append(fila)
-        
-        sheets_service.agregar_filas(hoja_investigacion, filas_investigacion)
-        logger.debug(f"Guardadas {len(filas_investigacion)} actividades de investigación")
+    for nombre_hoja, filas in filas_por_hoja.items():
+        sheets_service.agregar_filas(nombre_hoja, filas)
+    if al_terminar is not None:
+        al_terminar(None)
+
+
+# Headers de las hojas por tipo creadas por crear_estructura_hojas
+_SHEET_HEADERS = {
+    'principal': (
+        'Cédula', 'Nombre', 'Apellido1', 'Apellido2',
+        'Escuela', 'Departamento', 'Período',
+        'Vinculación', 'Categoría', 'Dedicación',
+        'Nivel Alcanzado', 'Cargo', 'Fecha'
+    ),
+    'pregrado': (
+        'Cédula', 'Período', 'Código', 'Nombre Asignatura',
+        'Grupo', 'Tipo', 'Horas Semestre', 'Fecha'
+    ),
+    'postgrado': (
+        'Cédula', 'Período', 'Código', 'Nombre Asignatura',
+        'Grupo', 'Tipo', 'Horas Semestre', 'Fecha'
+    ),
+    'investigacion': (
+        'Cédula', 'Período', 'Código', 'Nombre Proyecto',
+        'Aprobado Por', 'Horas Semestre', 'Fecha'
+    ),
+    'tesis': (
+        'Cédula', 'Período', 'Código Estudiante', 'Título Tesis',
+        'Plan', 'Horas Semestre', 'Fecha'
+    ),
+    'extension': (
+        'Cédula', 'Período', 'Tipo', 'Nombre', 'Horas Semestre', 'Fecha'
+    ),
+    'administrativas': (
+        'Cédula', 'Período', 'Cargo', 'Descripción', 'Horas Semestre', 'Fecha'
+    ),
+    'complementarias': (
+        'Cédula', 'Período', 'Tipo', 'Descripción', 'Horas Semestre', 'Fecha'
+    ),
+    'intelectuales': (
+        'Cédula', 'Período', 'Título', 'Tipo', 'Descripción', 'Fecha'
+    ),
+    'comision': (
+        'Cédula', 'Período', 'Tipo Comisión', 'Descripción', 'Fecha'
+    ),
+}
 
 
 def crear_estructura_hojas(period_manager: PeriodManager, num_periodos: int):
@@ -238,53 +316,11 @@ def crear_estructura_hojas(period_manager: PeriodManager, num_periodos: int):
         period_manager: Instancia del gestor de períodos
         num_periodos: Número de períodos a crear
     """
-    logger = logging.getLogger(__name__)
-    
     logger.info("Creando estructura de hojas...")
     
     periodos = period_manager.obtener_ultimos_n_periodos(num_periodos)
     
-    headers = {
-        'principal': [
-            'Cédula', 'Nombre', 'Apellido1', 'Apellido2',
-            'Escuela', 'Departamento', 'Período',
-            'Vinculación', 'Categoría', 'Dedicación',
-            'Nivel Alcanzado', 'Cargo', 'Fecha'
-        ],
-        'pregrado': [
-            'Cédula', 'Período', 'Código', 'Nombre Asignatura',
-            'Grupo', 'Tipo', 'Horas Semestre', 'Fecha'
-        ],
-        'postgrado': [
-            'Cédula', 'Período', 'Código', 'Nombre Asignatura',
-            'Grupo', 'Tipo', 'Horas Semestre', 'Fecha'
-        ],
-        'investigacion': [
-            'Cédula', 'Período', 'Código', 'Nombre Proyecto',
-            'Aprobado Por', 'Horas Semestre', 'Fecha'
-        ],
-        'tesis': [
-            'Cédula', 'Período', 'Código Estudiante', 'Título Tesis',
-            'Plan', 'Horas Semestre', 'Fecha'
-        ],
-        'extension': [
-            'Cédula', 'Período', 'Tipo', 'Nombre', 'Horas Semestre', 'Fecha'
-        ],
-        'administrativas': [
-            'Cédula', 'Período', 'Cargo', 'Descripción', 'Horas Semestre', 'Fecha'
-        ],
-        'complementarias': [
-            'Cédula', 'Período', 'Tipo', 'Descripción', 'Horas Semestre', 'Fecha'
-        ],
-        'intelectuales': [
-            'Cédula', 'Período', 'Título', 'Tipo', 'Descripción', 'Fecha'
-        ],
-        'comision': [
-            'Cédula', 'Período', 'Tipo Comisión', 'Descripción', 'Fecha'
-        ],
-    }
-    
-    period_manager.crear_hojas_periodos(periodos, headers, limpiar_existentes=False)
+    period_manager.crear_hojas_periodos(periodos, _SHEET_HEADERS, limpiar_existentes=False)
     
     logger.info(f"Estructura creada para {len(periodos)} períodos")
 
@@ -314,6 +350,20 @@ def enviar_notificacion(errores_criticos: List[str], logger: logging.Logger):
     # send_slack_notification(errores_criticos)
 
 
+# Nombre completo de cada código de tipo de actividad (se construye una sola vez)
+_TIPOS_ACTIVIDAD = {
+    'CL': 'Clase',
+    'PS': 'Practica Supervisada',
+    'MG': 'Clase Magistral',
+    'LB': 'Laboratorio',
+    'TA': 'Tutoria Academica',
+    'TD': 'Trabajo de campo',
+    'CD': 'Curso Dirigido',
+    'SM': 'Seminario',
+    'TL': 'Taller'
+}
+
+
 def mapear_tipo_actividad(codigo: str) -> str:
     """
     Mapea el código de tipo de actividad a su nombre completo.
@@ -324,167 +374,231 @@ def mapear_tipo_actividad(codigo: str) -> str:
     Returns:
         Nombre completo del tipo de actividad
     """
-    mapeo = {
-        'CL': 'Clase',
-        'PS': 'Practica Supervisada',
-        'MG': 'Clase Magistral',
-        'LB': 'Laboratorio',
-        'TA': 'Tutoria Academica',
-        'TD': 'Trabajo de campo',
-        'CD': 'Curso Dirigido',
-        'SM': 'Seminario',
-        'TL': 'Taller'
-    }
+    # Caso común: el código ya viene limpio y en mayúsculas
+    nombre = _TIPOS_ACTIVIDAD.get(codigo)
+    if nombre is not None:
+        return nombre
     
     # Limpiar y normalizar el código
     codigo_limpio = str(codigo).strip().upper() if codigo else ''
     
     # Retornar el nombre completo o el código original si no se encuentra
-    return mapeo.get(codigo_limpio, codigo_limpio)
+    return _TIPOS_ACTIVIDAD.get(codigo_limpio, codigo_limpio)
+
 
+# 17 columnas en el orden correcto (según period_manager.py)
+_ACTIVIDAD_HEADERS = (
+    'Cedula',              # 1
+    'Nombre Profesor',     # 2
+    'Escuela',             # 3
+    'Departamento',        # 4
+    'Tipo Actividad',      # 5
+    'Categoría',           # 6
+    'Nombre Actividad',    # 7
+    'Número de Horas',     # 8
+    'Periodo',             # 9
+    'Detalle Actividad',   # 10
+    'Actividad',           # 11
+    'Vinculación',         # 12
+    'Dedicación',          # 13
+    'Nivel',               # 14
+    'Cargo',               # 15
+    'departamento',        # 16 - departamento del profesor (minúscula)
+    'Fecha'                # 17
+)
 
-def agrupar_actividades_por_periodo(actividades: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+# Campos de la actividad copiados tal cual a cada fila de la hoja del período
+# (columnas 1-7 y 11-15); el resto de columnas se calculan por fila
+_CAMPOS_FILA_INICIO = (
+    'cedula', 'nombre_profesor', 'escuela', 'departamento',
+    'tipo_actividad', 'categoria', 'nombre_actividad',
+)
+_CAMPOS_FILA_FIN = ('actividad', 'vinculacion', 'dedicacion', 'nivel', 'cargo')
+_campos_fila_inicio = itemgetter(*_CAMPOS_FILA_INICIO)
+_campos_fila_fin = itemgetter(*_CAMPOS_FILA_FIN)
+_CAMPOS_ACTIVIDAD_FILA = frozenset(_CAMPOS_FILA_INICIO + _CAMPOS_FILA_FIN)
+_VALORES_POR_DEFECTO_FILA = dict.fromkeys(_CAMPOS_ACTIVIDAD_FILA, '')
+
+
+def construir_filas_actividades(
+    actividades: List[Dict[str, Any]],
+    periodo_label: str,
+    logger: logging.Logger
+) -> List[List[Any]]:
     """
-    Agrupa actividades por período.
+    Convierte actividades (diccionarios) en filas de la hoja del período.
     
     Args:
-        actividades: Lista de actividades de un profesor
+        actividades: Lista de actividades
+        periodo_label: Período a usar si la actividad no trae uno
+        logger: Logger para registrar
         
     Returns:
-        Diccionario con período como clave y lista de actividades como valor
+        Lista de filas de 16 columnas
     """
-    agrupadas = defaultdict(list)
-    
-    for actividad in actividades:
-        periodo = actividad.get('periodo', '')
-        if periodo:
-            agrupadas[periodo].append(actividad)
+    # El ancho es fijo por construcción (12 campos de los itemgetter + 4
+    # calculados) y las horas siempre quedan como int, así que no se validan
+    # fila por fila
+    filas = []
+    for contador, actividad in enumerate(actividades, 1):
+        # Asegurar que el número de horas nunca sea vacío/None y sea entero
+        horas_semestre = actividad.get('numero_horas', 0)
+        if horas_semestre in ('', None):
+            horas_semestre = 0
+        try:
+            # Convertir a float primero para manejar decimales, luego tomar solo la parte entera
+            horas_semestre = int(float(horas_semestre))
+        except (ValueError, TypeError):
+            logger.warning("⚠️ Valor de horas_semestre no convertible a entero: %r. Usando 0", horas_semestre)
+            horas_semestre = 0
+        
+        # Usar periodo_label si el periodo de la actividad está vacío
+        periodo_valor = actividad.get('periodo', '') or periodo_label
+        
+        # Obtener el código de tipo y mapearlo a su nombre completo
+        tipo_codigo = actividad.get('tipo', '')
+        if tipo_codigo != '':
+            detalle_actividad = mapear_tipo_actividad(tipo_codigo)
+        else:
+            # Priorizar el código de la actividad; si no existe, usar el detalle precalculado
+            detalle_actividad = actividad.get('codigo', '') or actividad.get('detalle_actividad', '')
+
+        # Completar campos faltantes con '' una sola vez y extraerlos con itemgetter
+        if not actividad.keys() >= _CAMPOS_ACTIVIDAD_FILA:
+            actividad = {**_VALORES_POR_DEFECTO_FILA, **actividad}
+        
+        row_data = [
+            *_campos_fila_inicio(actividad),          # 1-7. Cedula ... Nombre Actividad
+            horas_semestre,                           # 8. Número de Horas
+            periodo_valor,                            # 9. Periodo
+            detalle_actividad,                        # 10. Detalle Actividad (CL->Clase, etc.)
+            *_campos_fila_fin(actividad),             # 11-15. Actividad ... Cargo
+            actividad.get('departamento_profesor', actividad['departamento']),  # 16. departamento del profesor
+        ]
+        
+        # Log de ejemplo cada 100 registros (solo si INFO está habilitado)
+        if contador % 100 == 0 and logger.isEnabledFor(logging.INFO):
+            logger.info("📊 Ejemplo de row #%d:", contador)
+            logger.info("   %s", row_data)
+        
+        filas.append(row_data)
     
-    return dict(agrupadas)
+    return filas
 
 
-def escribir_actividades_en_hojas(
-    sheets_service: SheetsService,
-    actividades_por_periodo: Dict[str, List[Dict[str, Any]]],
-    logger: logging.Logger
-):
+def _iter_cedulas_archivo(ruta: str) -> Iterator[str]:
     """
-    Escribe actividades agrupadas por período en las hojas correspondientes.
+    Lee cédulas de un archivo (una por línea) sin cargarlo completo en memoria.
     
-    Usa batch write para eficiencia.
+    Descarta las inválidas antes de hacer cualquier request y omite las
+    repetidas conservando el orden del archivo. Al terminar registra cuántas
+    se leyeron, descartaron y entregaron.
     
     Args:
-        sheets_service: Servicio de Google Sheets
-        actividades_por_periodo: Diccionario con período como clave y lista de actividades
-        logger: Logger para registrar
+        ruta: Ruta al archivo de cédulas
+        
+    Yields:
+        Cédulas limpias, válidas y únicas
     """
-    # 17 columnas en el orden correcto (según period_manager.py)
-    headers = [
-        'Cedula',              # 1
-        'Nombre Profesor',     # 2
-        'Escuela',             # 3
-        'Departamento',        # 4
-        'Tipo Actividad',      # 5
-        'Categoría',           # 6
-        'Nombre Actividad',    # 7
-        'Número de Horas',     # 8
-        'Periodo',             # 9
-        'Detalle Actividad',   # 10
-        'Actividad',           # 11
-        'Vinculación',         # 12
-        'Dedicación',          # 13
-        'Nivel',               # 14
-        'Cargo',               # 15
-        'departamento',        # 16 - departamento del profesor (minúscula)
-        'Fecha'                # 17
-    ]
+    vistas = set()
+    leidas = 0
+    invalidas = 0
+    with open(ruta, 'r', encoding='utf-8') as f:
+        for linea in f:
+            linea = linea.strip()
+            if not linea:
+                continue
+            leidas += 1
+            cedula = limpiar_cedula(linea)
+            if not validar_cedula(cedula):
+                invalidas += 1
+                continue
+            if cedula in vistas:
+                continue
+            vistas.add(cedula)
+            yield cedula
     
-    for periodo_label, actividades in actividades_por_periodo.items():
-        try:
-            logger.debug(f"Escribiendo {len(actividades)} actividades para período {periodo_label}")
-            
-            # Convertir diccionarios a listas de valores (16 columnas)
-            filas = []
-            contador = 0
-            for actividad in actividades:
-                contador += 1
-                # Asegurar que el número de horas nunca sea vacío/None y sea entero
-                horas_semestre = actividad.get('numero_horas', 0)
-                if horas_semestre in ('', None):
-                    horas_semestre = 0
-                try:
-                    # Convertir a float primero para manejar decimales, luego tomar solo la parte entera
-                    horas_semestre = int(float(horas_semestre))
-                except (ValueError, TypeError):
-                    logger.warning(f"⚠️ Valor de horas_semestre no convertible a entero: {horas_semestre!r}. Usando 0")
-                    horas_semestre = 0
-                
-                # Usar periodo_label si el periodo de la actividad está vacío
-                periodo_valor = actividad.get('periodo', '') or periodo_label
-                
-                # Obtener el código de tipo y mapearlo a su nombre completo
-                tipo_codigo = actividad.get('tipo', '')
-                if tipo_codigo != '':
-                    detalle_actividad = mapear_tipo_actividad(tipo_codigo)
-                else:
-                    # Priorizar el código de la actividad; si no existe, usar el detalle precalculado
-                    detalle_actividad = actividad.get('codigo', '') or actividad.get('detalle_actividad', '')
+    if invalidas:
+        logger.warning("⚠️ %d cédulas inválidas descartadas", invalidas)
+    logger.info("%d cédulas leídas, %d únicas y válidas", leidas, len(vistas))
 
-                row_data = [
-                    actividad.get('cedula', ''),              # 1. Cedula
-                    actividad.get('nombre_profesor', ''),     # 2. Nombre Profesor
-                    actividad.get('escuela', ''),             # 3. Escuela
-                    actividad.get('departamento', ''),        # 4. Departamento
-                    actividad.get('tipo_actividad', ''),      # 5. Tipo Actividad
-                    actividad.get('categoria', ''),           # 6. Categoría
-                    actividad.get('nombre_actividad', ''),    # 7. Nombre Actividad
-                    horas_semestre,                           # 8. Número de Horas
-                    periodo_valor,                            # 9. Periodo
-                    detalle_actividad,                        # 10. Detalle Actividad (CL->Clase, etc.)
-                    actividad.get('actividad', ''),           # 11. Actividad
-                    actividad.get('vinculacion', ''),         # 12. Vinculación
-                    actividad.get('dedicacion', ''),          # 13. Dedicación
-                    actividad.get('nivel', ''),               # 14. Nivel
-                    actividad.get('cargo', ''),               # 15. Cargo
-                    actividad.get('departamento_profesor', actividad.get('departamento', '')),  # 16. departamento del profesor
-                ]
-                
-                # Validar cantidad de columnas antes de escribir
-                if len(row_data) != 16:
-                    logger.error(
-                        f"❌ Row inválido para {actividad.get('cedula', '')}: "
-                        f"tiene {len(row_data)} columnas, esperadas 16"
-                    )
-                    logger.error(f"   Row: {row_data}")
-                    continue
-                
-                # Validar que columna 8 (índice 7) sea número
-                if not isinstance(row_data[7], (int, float)):
-                    logger.warning(
-                        f"⚠️ Horas no es número para {actividad.get('cedula', '')}: {row_data[7]!r}"
-                    )
-                    row_data[7] = 0.0
-                
-                # Log de ejemplo cada 100 registros
-                if contador % 100 == 0:
-                    logger.info(f"📊 Ejemplo de row #{contador}:")
-                    logger.info(f"   {row_data}")
-                
-                filas.append(row_data)
 
-            if not filas:
-                logger.warning(f"No hay filas válidas para escribir en período {periodo_label}")
-                continue
-            
-            # Escribir en batch a la hoja del período
-            nombre_hoja = periodo_label
-            sheets_service.agregar_filas(nombre_hoja, filas)
-            
-            logger.debug(f"✓ {len(filas)} filas escritas en hoja '{nombre_hoja}'")
-            
+def _completar_acotado(
+    executor: ThreadPoolExecutor,
+    funcion,
+    items: Iterable[Any],
+    max_pendientes: int
+) -> Iterator[Tuple[Any, Future]]:
+    """
+    Envía cada item al executor sin tener más de max_pendientes en vuelo.
+    
+    A diferencia de enviar todo y usar as_completed, los items se consumen a
+    medida que se liberan huecos, así que el iterable puede ser perezoso.
+    
+    Yields:
+        (item, futuro) en orden de finalización
+    """
+    pendientes: Dict[Future, Any] = {}
+    for item in items:
+        pendientes[executor.submit(funcion, item)] = item
+        if len(pendientes) >= max_pendientes:
+            listos, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+            for futuro in listos:
+                yield pendientes.pop(futuro), futuro
+    for futuro in as_completed(pendientes):
+        yield pendientes[futuro], futuro
+
+
+def _es_error_de_saturacion(exc: BaseException) -> bool:
+    """Indica si el error sugiere que el portal está limitando o saturado (429, 5xx, timeouts)."""
+    if isinstance(exc, requests.HTTPError):
+        status = exc.response.status_code if exc.response is not None else None
+        return status is None or status == 429 or status >= 500
+    return isinstance(exc, requests.RequestException)
+
+
+def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serializa a JSON UTF-8 con orjson si está disponible (stdlib json si no)."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode('utf-8')
+
+
+_json_loads = orjson.loads if HAS_ORJSON else json.loads
+
+
+def _cargar_checkpoint(checkpoint_file: str, checkpoint_log: str) -> Dict[str, None]:
+    """
+    Lee las cédulas ya procesadas del checkpoint JSON y de su log JSONL.
+    
+    El log contiene las cédulas terminadas después de la última compactación
+    (por ejemplo, si la ejecución anterior se interrumpió). Una línea corrupta
+    al final del log, típica de un corte a mitad de escritura, se ignora.
+    
+    Returns:
+        Diccionario usado como conjunto ordenado de cédulas procesadas
+    """
+    cedulas_procesadas: Dict[str, None] = {}
+    
+    if os.path.exists(checkpoint_file):
+        try:
+            with open(checkpoint_file, "rb") as f:
+                cedulas_procesadas = dict.fromkeys(_json_loads(f.read()).get("cedulas_procesadas", []))
         except Exception as e:
-            logger.error(f"Error escribiendo actividades para período {periodo_label}: {e}", exc_info=True)
-            raise
+            logger.warning(f"⚠️ No se pudo cargar checkpoint '{checkpoint_file}': {e}")
+    
+    if os.path.exists(checkpoint_log):
+        try:
+            with open(checkpoint_log, "rb") as f:
+                for linea in f:
+                    try:
+                        cedulas_procesadas[_json_loads(linea)["cedula"]] = None
+                    except (ValueError, KeyError, TypeError):
+                        logger.warning("⚠️ Línea inválida en checkpoint '%s' ignorada", checkpoint_log)
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo cargar checkpoint '{checkpoint_log}': {e}")
+    
+    return cedulas_procesadas
 
 
 def flujo_completo(
@@ -494,7 +608,11 @@ def flujo_completo(
     target_sheet_url: Optional[str] = None,
     target_period: Optional[str] = None,
     delay_entre_cedulas: float = 1.0,
-    max_cedulas: Optional[int] = None
+    max_cedulas: Optional[int] = None,
+    max_workers: int = 2,
+    requests_por_segundo: Optional[float] = None,
+    usar_cache: bool = True,
+    max_requests_por_segundo: float = 0.0
 ):
     """
     Flujo completo de scraping para un período específico:
@@ -503,7 +621,7 @@ def flujo_completo(
     2. Obtener período objetivo (TARGET_PERIOD)
     3. Preparar hoja del período
     4. Scrapear cada cédula para el período
-    5. Escribir datos en batch
+    5. Escribir datos por tramos mientras se scrapea
     6. Logging completo y notificaciones
     
     Args:
@@ -514,8 +632,16 @@ def flujo_completo(
         target_period: Período a procesar (None = usar TARGET_PERIOD de variable de entorno)
         delay_entre_cedulas: Delay entre cédulas en segundos (default: 1.0)
         max_cedulas: Máximo número de cédulas a procesar (None = procesar todas)
+        max_workers: Número de hilos que scrapean cédulas en paralelo (default: 2,
+            así la siguiente cédula se descarga mientras se procesa la actual)
+        requests_por_segundo: Ritmo máximo global de cédulas por segundo entre todos
+            los hilos (None = derivado de delay_entre_cedulas, 0 = sin límite)
+        usar_cache: Reutilizar respuestas del portal guardadas en disco si la caché
+            está activada con HTTP_CACHE_TTL > 0 (desactivada por defecto)
+        max_requests_por_segundo: Tope de requests por segundo al portal, además
+            del ritmo de cédulas (0 = sin tope)
     """
-    logger = logging.getLogger(__name__)
+    max_workers = max(1, max_workers)
     inicio_total = time.time()
     
     logger.info("="*80)
@@ -535,7 +661,10 @@ def flujo_completo(
     try:
         # 1. Inicializar servicios
         logger.info("\n[PASO 1/5] Inicializando servicios...")
-        scraper = UnivalleScraper()
+        scraper = UnivalleScraper(
+            usar_cache=usar_cache,
+            max_requests_por_segundo=max_requests_por_segundo
+        )
         sheets_service = SheetsService()
         period_manager = PeriodManager(sheets_service, scraper)
         logger.info("✓ Servicios inicializados")
@@ -565,34 +694,29 @@ def flujo_completo(
         # 3. Leer cédulas desde Google Sheet
         logger.info(f"\n[PASO 3/5] Leyendo cédulas desde hoja '{source_worksheet}', columna {source_column}...")
         try:
-            # Usar método batch más eficiente (usa configuración de settings)
-            if source_sheet_url:
-                cedulas = sheets_service.get_cedulas_batch(
-                    sheet_url=source_sheet_url,
-                    worksheet_name=source_worksheet,
-                    column=source_column
-                )
-            else:
-                cedulas = sheets_service.get_cedulas_batch(
-                    worksheet_name=source_worksheet,
-                    column=source_column
-                )
+            # Leer por bloques: el resto de bloques se lee mientras se scrapea
+            bloques_cedulas = sheets_service.iter_cedulas_batch(
+                sheet_url=source_sheet_url,
+                worksheet_name=source_worksheet,
+                column=source_column
+            )
+            
+            # Leer el primer bloque ahora para fallar antes de preparar la hoja destino
+            primer_bloque = next(bloques_cedulas, None)
+            if not primer_bloque:
+                raise ValueError(f"No se encontraron cédulas en la hoja '{source_worksheet}'")
+            logger.info(f"✓ Primer bloque: {len(primer_bloque)} cédulas (el resto se lee durante el scraping)")
             
-            estadisticas['cedulas_leidas'] = len(cedulas)
-            logger.info(f"✓ {len(cedulas)} cédulas encontradas")
+            cedulas = chain.from_iterable(chain((primer_bloque,), bloques_cedulas))
             
             # Limitar número de cédulas si se especificó max_cedulas
             if max_cedulas and max_cedulas > 0:
-                cedulas_originales = len(cedulas)
-                cedulas = cedulas[:max_cedulas]
+                cedulas = islice(cedulas, max_cedulas)
                 logger.warning(
-                    f"⚠️  LÍMITE APLICADO: Procesando {len(cedulas)} de {cedulas_originales} cédulas "
+                    f"⚠️  LÍMITE APLICADO: Procesando como máximo {max_cedulas} cédulas "
                     f"(max_cedulas={max_cedulas})"
                 )
             
-            if not cedulas:
-                raise ValueError(f"No se encontraron cédulas en la hoja '{source_worksheet}'")
-            
         except Exception as e:
             error_msg = f"Error leyendo cédulas: {e}"
             logger.error(error_msg, exc_info=True)
@@ -633,23 +757,24 @@ def flujo_completo(
         # 5. Obtener ID del período objetivo
         logger.info(f"\n[PASO 5/7] Obteniendo ID del período {target_period}...")
         try:
-            logger.info("Obteniendo períodos disponibles desde el sistema...")
-            periodos_disponibles = scraper.obtener_periodos_disponibles()
+            # Reutilizar la lista obtenida en el paso 4 (no cambia durante la ejecución)
             logger.info(f"✓ {len(periodos_disponibles)} períodos disponibles en el sistema")
             
             # Buscar ID del período objetivo
-            periodo_match = next(
-                (p for p in periodos_disponibles if p['label'] == target_period),
-                None
-            )
+            ids_por_label = {p['label']: p['idPeriod'] for p in periodos_disponibles}
+            
+            if target_period not in ids_por_label:
+                # La lista puede venir de la caché en disco: confirmar con el portal
+                periodos_disponibles = scraper.obtener_periodos_disponibles(refrescar=True)
+                ids_por_label = {p['label']: p['idPeriod'] for p in periodos_disponibles}
             
-            if not periodo_match:
+            if target_period not in ids_por_label:
                 raise ValueError(
                     f"No se encontró el período {target_period} en el sistema. "
                     f"Períodos disponibles: {[p['label'] for p in periodos_disponibles[:10]]}"
                 )
             
-            periodo_id = periodo_match['idPeriod']
+            periodo_id = ids_por_label[target_period]
             logger.info(f"✓ Período {target_period} → ID: {periodo_id}")
             
         except Exception as e:
@@ -659,156 +784,206 @@ def flujo_completo(
             raise
         
         # 6. Scrapear cada cédula para el período objetivo (con soporte de checkpoint)
-        logger.info(f"\n[PASO 6/7] Scrapeando {len(cedulas)} cédulas para período {target_period}...")
+        logger.info(f"\n[PASO 6/7] Scrapeando cédulas para período {target_period}...")
         
-        # Archivo de checkpoint (por período)
+        # Archivo de checkpoint (por período): el JSON compactado de ejecuciones
+        # anteriores más un log JSONL al que se añade una línea por cédula
         checkpoint_file = f"checkpoint_{target_period.replace('-', '_')}.json"
+        checkpoint_log = checkpoint_file.replace('.json', '.jsonl')
+        
+        # Cargar cédulas ya procesadas si existe checkpoint (dict como conjunto
+        # ordenado: pertenencia O(1) y el JSON conserva el orden de proceso)
+        cedulas_procesadas = _cargar_checkpoint(checkpoint_file, checkpoint_log)
+        if cedulas_procesadas:
+            logger.info(f"🔁 Checkpoint encontrado: {len(cedulas_procesadas)} cédulas ya procesadas")
+        
+        # Cédulas cuyas filas no se pudieron escribir (se reintentan en la siguiente ejecución)
+        errores_escritura: List[str] = []
         
-        # Cargar cédulas ya procesadas si existe checkpoint
-        cedulas_procesadas: List[str] = []
-        if os.path.exists(checkpoint_file):
+        # Ritmo global compartido por todos los workers; cada worker espera
+        # solo lo necesario en lugar de dormir un delay fijo tras cada cédula.
+        # Se reduce si el portal limita o falla y se recupera hasta el configurado
+        if requests_por_segundo is None:
+            requests_por_segundo = 1.0 / delay_entre_cedulas if delay_entre_cedulas > 0 else 0.0
+        limitador = AdaptiveTokenBucket(rate=requests_por_segundo, burst=max_workers)
+        
+        def _scrapear_cedula(cedula_limpia: str) -> List[Dict[str, Any]]:
+            limitador.acquire()
+            logger.debug("Scrapeando %s para período %s (ID: %s)", cedula_limpia, target_period, periodo_id)
             try:
-                with open(checkpoint_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    cedulas_procesadas = data.get("cedulas_procesadas", [])
-                logger.info(f"🔁 Checkpoint encontrado: {len(cedulas_procesadas)} cédulas ya procesadas")
+                actividades = scraper.scrape_teacher_data(
+                    cedula_limpia,
+                    id_periodo=periodo_id,
+                    max_retries=3,
+                    delay_min=0.5,
+                    delay_max=1.0,
+                    periodo_label=target_period
+                )
             except Exception as e:
-                logger.warning(f"⚠️ No se pudo cargar checkpoint '{checkpoint_file}': {e}")
-        
-        # Filtrar pendientes respetando max_cedulas aplicado antes
-        cedulas_pendientes = [c for c in cedulas if limpiar_cedula(c) not in cedulas_procesadas]
-        total_cedulas = len(cedulas)
-        total_pendientes = len(cedulas_pendientes)
+                if _es_error_de_saturacion(e):
+                    limitador.registrar_limite()
+                raise
+            limitador.registrar_exito()
+            return actividades
         
         logger.info(
-            f"📊 Total cédulas a procesar en hoja: {total_cedulas} | "
-            f"Ya procesadas (checkpoint): {len(cedulas_procesadas)} | "
-            f"Pendientes: {total_pendientes}"
+            f"🧵 Workers: {max_workers} | "
+            f"Ritmo: {f'{requests_por_segundo:.2f} req/s' if requests_por_segundo > 0 else 'sin límite'}"
         )
         
-        # Acumulador de actividades para el período
-        actividades_periodo: List[Dict[str, Any]] = []
-        errores_cedulas: List[str] = []
+        def _marcar_procesada(cedula_limpia: str):
+            """Marca la cédula en el checkpoint: una línea por cédula, sin reescribirlo."""
+            cedulas_procesadas[cedula_limpia] = None
+            try:
+                log_checkpoint.write(_json_dumps({"cedula": cedula_limpia, "ts": time.time()}) + b"\n")
+            except Exception as e:
+                logger.warning("⚠️ No se pudo guardar checkpoint '%s': %s", checkpoint_log, e)
         
-        if not cedulas_pendientes:
-            logger.info("✅ No hay cédulas pendientes según el checkpoint; se omite scraping.")
-        else:
-            iterador_cedulas = tqdm(
-                cedulas_pendientes,
+        def _al_escribir(cedula_limpia: str, num_actividades: int):
+            """Callback del buffer: la cédula cuenta como procesada solo si sus filas se escribieron."""
+            def _avisar(error: Optional[Exception]):
+                if error is None:
+                    estadisticas['total_actividades'] += num_actividades
+                    estadisticas['cedulas_procesadas'] += 1
+                    _marcar_procesada(cedula_limpia)
+                else:
+                    estadisticas['errores_por_cedula'][cedula_limpia] = [f"Filas no escritas: {error}"]
+                    estadisticas['cedulas_con_error'] += 1
+                    errores_escritura.append(cedula_limpia)
+            return _avisar
+        
+        # Los workers solo scrapean; el estado compartido (estadísticas,
+        # checkpoint) se actualiza en este hilo al recoger cada resultado o
+        # al vaciarse el buffer (sin temporizador, solo se vacía desde este
+        # hilo), así que no necesita lock. Las filas se escriben por tramos
+        # de hasta MAX_CELDAS_BUFFER celdas en lugar de acumular el período
+        # entero para una sola solicitud, y una cédula entra al log solo
+        # cuando su tramo está escrito: si una escritura falla, o la
+        # ejecución se interrumpe, sus cédulas se vuelven a scrapear en la
+        # siguiente. Un tramo que falla no se reintenta (max_intentos=1) para
+        # no retener las filas. El log se abre sin buffer: cada línea llega
+        # al archivo con su propio write()
+        with open(checkpoint_log, "ab", buffering=0) as log_checkpoint, \
+                SheetsWriteBuffer(sheets_service, intervalo=0, max_intentos=1) as buffer, \
+                ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Encolar las cédulas a medida que llegan de la hoja fuente, con
+            # solo unas pocas por worker en vuelo (la hoja se sigue leyendo
+            # por bloques mientras se scrapea)
+            def _cedulas_pendientes() -> Iterator[str]:
+                try:
+                    for cedula_limpia in cedulas:
+                        estadisticas['cedulas_leidas'] += 1
+                        if cedula_limpia not in cedulas_procesadas:
+                            yield cedula_limpia
+                except Exception as e:
+                    # Procesar igualmente las cédulas ya encoladas
+                    error_msg = f"Error leyendo cédulas: {e}"
+                    logger.error(error_msg, exc_info=True)
+                    errores_criticos.append(error_msg)
+            
+            completados = _completar_acotado(
+                executor,
+                _scrapear_cedula,
+                _cedulas_pendientes(),
+                max_pendientes=max_workers * 4
+            )
+            iterador_resultados = tqdm(
+                completados,
                 desc=f"Scrapeando cédulas para {target_period}",
                 unit="cedula",
                 disable=not HAS_TQDM
             )
             
-            for idx, cedula in enumerate(iterador_cedulas, 1):
+            total_pendientes = 0
+            for total_pendientes, (cedula_limpia, futuro) in enumerate(iterador_resultados, 1):
                 if HAS_TQDM:
-                    iterador_cedulas.set_description(f"Scrapeando {cedula} - {target_period}")
-                
-                cedula_limpia = limpiar_cedula(cedula)
-                errores_cedula: List[str] = []
+                    iterador_resultados.set_description(f"Scrapeando {cedula_limpia} - {target_period}")
                 
                 logger.info(
-                    f"🔄 Procesando cédula {idx} de {total_pendientes} "
-                    f"({cedula_limpia}) - global {len(cedulas_procesadas) + 1} de {total_cedulas}"
+                    "🔄 Procesando cédula %d (%s) - %d leídas de la hoja",
+                    total_pendientes, cedula_limpia, estadisticas['cedulas_leidas']
                 )
                 
                 try:
-                    logger.debug(f"Scrapeando {cedula_limpia} para período {target_period} (ID: {periodo_id})")
-                    actividades_cedula = scraper.scrape_teacher_data(
-                        cedula_limpia,
-                        id_periodo=periodo_id,
-                        max_retries=3,
-                        delay_min=0.5,
-                        delay_max=1.0
-                    )
-                    
-                    # Asegurar que todas las actividades tengan el período correcto
-                    for actividad in actividades_cedula:
-                        if not actividad.get('periodo') or actividad.get('periodo') != target_period:
-                            actividad['periodo'] = target_period
-                    
+                    # Las actividades ya vienen con 'periodo' = target_period
+                    actividades_cedula = futuro.result()
+                
                     if actividades_cedula:
-                        actividades_periodo.extend(actividades_cedula)
-                        estadisticas['total_actividades'] += len(actividades_cedula)
-                        estadisticas['cedulas_procesadas'] += 1
-                        logger.info(f"✓ {cedula_limpia}: {len(actividades_cedula)} actividades extraídas")
+                        # Cada resultado se convierte a sus filas de 16 columnas al
+                        # llegar, sin guardar los diccionarios de actividad
+                        buffer.agregar_lote(
+                            {target_period: construir_filas_actividades(actividades_cedula, target_period, logger)},
+                            _al_escribir(cedula_limpia, len(actividades_cedula))
+                        )
+                        logger.info("✓ %s: %d actividades extraídas", cedula_limpia, len(actividades_cedula))
                     else:
                         # Contar cédulas sin actividades separadamente
                         if 'cedulas_sin_actividades' not in estadisticas:
                             estadisticas['cedulas_sin_actividades'] = 0
                         estadisticas['cedulas_sin_actividades'] += 1
-                        logger.warning(f"⚠️ {cedula_limpia}: No se encontraron actividades para período {target_period}")
-                    
-                    # Marcar como procesada y guardar checkpoint cada 100
-                    cedulas_procesadas.append(cedula_limpia)
-                    if len(cedulas_procesadas) % 100 == 0:
-                        try:
-                            with open(checkpoint_file, "w", encoding="utf-8") as f:
-                                json.dump(
-                                    {
-                                        "cedulas_procesadas": cedulas_procesadas,
-                                        "timestamp": datetime.now().isoformat(),
-                                        "periodo": target_period,
-                                        "total_cedulas": total_cedulas,
-                                    },
-                                    f,
-                                    ensure_ascii=False,
-                                    indent=2,
-                                )
-                            logger.info(f"💾 Checkpoint guardado: {len(cedulas_procesadas)} cédulas procesadas")
-                        except Exception as e:
-                            logger.warning(f"⚠️ No se pudo guardar checkpoint '{checkpoint_file}': {e}")
-                    
+                        logger.warning("⚠️ %s: No se encontraron actividades para período %s", cedula_limpia, target_period)
+                        # Nada que escribir: procesada desde ya
+                        _marcar_procesada(cedula_limpia)
+                
                 except Exception as e:
                     error_msg = f"Error procesando {cedula_limpia}: {e}"
                     logger.error(error_msg, exc_info=True)
-                    errores_cedula.append(str(e))
-                    estadisticas['errores_por_cedula'][cedula_limpia] = errores_cedula
-                    errores_cedulas.append(cedula_limpia)
+                    estadisticas['errores_por_cedula'][cedula_limpia] = [str(e)]
                     estadisticas['cedulas_con_error'] += 1
-                
-                # Delay entre cédulas
-                if delay_entre_cedulas > 0:
-                    time.sleep(delay_entre_cedulas)
+            
+            total_cedulas = estadisticas['cedulas_leidas']
+            logger.info(
+                f"📊 Total cédulas en hoja: {total_cedulas} | "
+                f"Ya procesadas (checkpoint): {total_cedulas - total_pendientes} | "
+                f"Scrapeadas en esta ejecución: {total_pendientes}"
+            )
+            if not total_pendientes:
+                logger.info("✅ No hay cédulas pendientes según el checkpoint; se omite scraping.")
+            
+            logger.info(f"\n✓ Scraping completado: {estadisticas['cedulas_procesadas']} escritas hasta ahora, {estadisticas['cedulas_con_error']} con errores")
+            
+            # 7. Escribir el último tramo de filas
+            logger.info(f"\n[PASO 7/7] Escribiendo datos en hoja del período {target_period}...")
+            try:
+                buffer.flush()
+            except Exception as e:
+                # Las cédulas del tramo ya quedaron en errores_escritura
+                logger.error(f"Error escribiendo período {target_period}: {e}", exc_info=True)
+        
+        if errores_escritura:
+            error_msg = (
+                f"Error escribiendo período {target_period}: {len(errores_escritura)} cédulas "
+                f"sin escribir, se reintentarán en la siguiente ejecución"
+            )
+            logger.error(error_msg)
+            errores_criticos.append(error_msg)
+        elif estadisticas['total_actividades']:
+            logger.info(f"✓ Período {target_period}: {estadisticas['total_actividades']} actividades escritas")
+        else:
+            logger.warning("⚠️ No hay actividades para escribir")
         
-        # Guardar checkpoint final
+        # Compactar el log en el checkpoint JSON final (solo contiene cédulas ya
+        # escritas); si el log está vacío el JSON existente ya contiene todas las
+        # cédulas y no hace falta reescribirlo
         try:
-            with open(checkpoint_file, "w", encoding="utf-8") as f:
-                json.dump(
-                    {
-                        "cedulas_procesadas": cedulas_procesadas,
-                        "timestamp": datetime.now().isoformat(),
-                        "periodo": target_period,
-                        "total_cedulas": total_cedulas,
-                    },
-                    f,
-                    ensure_ascii=False,
-                    indent=2,
-                )
-            logger.info(f"✅ Checkpoint final guardado: {len(cedulas_procesadas)} cédulas procesadas en total")
+            if os.path.getsize(checkpoint_log) > 0 or not os.path.exists(checkpoint_file):
+                with open(checkpoint_file, "wb") as f:
+                    f.write(_json_dumps(
+                        {
+                            "cedulas_procesadas": list(cedulas_procesadas),
+                            "timestamp": datetime.now().isoformat(),
+                            "periodo": target_period,
+                            "total_cedulas": total_cedulas,
+                        },
+                        indent=True,
+                    ))
+                logger.info(f"✅ Checkpoint final guardado: {len(cedulas_procesadas)} cédulas procesadas en total")
+            else:
+                logger.info(f"✅ Checkpoint sin cambios: {len(cedulas_procesadas)} cédulas procesadas en total")
+            os.remove(checkpoint_log)
         except Exception as e:
             logger.warning(f"⚠️ No se pudo guardar checkpoint final '{checkpoint_file}': {e}")
         
-        logger.info(f"\n✓ Scraping completado: {estadisticas['cedulas_procesadas']} exitosas, {estadisticas['cedulas_con_error']} con errores")
-        
-        # 7. Escribir datos en batch
-        logger.info(f"\n[PASO 7/7] Escribiendo datos en hoja del período {target_period}...")
-        
-        if not actividades_periodo:
-            logger.warning("⚠️ No hay actividades para escribir")
-        else:
-            try:
-                escribir_actividades_en_hojas(
-                    sheets_service,
-                    {target_period: actividades_periodo},
-                    logger
-                )
-                logger.info(f"✓ Período {target_period}: {len(actividades_periodo)} actividades escritas")
-            except Exception as e:
-                error_msg = f"Error escribiendo período {target_period}: {e}"
-                logger.error(error_msg, exc_info=True)
-                errores_criticos.append(error_msg)
-        
         # 7. Resumen final
         tiempo_total = time.time() - inicio_total
         logger.info(f"\n[PASO 7/7] Generando resumen final...")
@@ -823,12 +998,14 @@ def flujo_completo(
         logger.info(f"Cédulas sin actividades para el período: {estadisticas.get('cedulas_sin_actividades', 0)}")
         logger.info(f"Cédulas con errores: {estadisticas['cedulas_con_error']}")
         logger.info(f"Total actividades extraídas: {estadisticas['total_actividades']}")
-        logger.info(f"Actividades para período {target_period}: {len(actividades_periodo)}")
+        estadisticas['respuestas_cache'] = scraper.respuestas_desde_cache
+        if scraper.usar_cache:
+            logger.info(f"Respuestas servidas desde caché HTTP: {estadisticas['respuestas_cache']}")
         
         # Errores
         if estadisticas['errores_por_cedula']:
             logger.warning(f"\nErrores por cédula ({len(estadisticas['errores_por_cedula'])}):")
-            for cedula, errores in list(estadisticas['errores_por_cedula'].items())[:10]:  # Mostrar solo primeros 10
+            for cedula, errores in islice(estadisticas['errores_por_cedula'].items(), 10):  # Mostrar solo primeros 10
                 logger.warning(f"  {cedula}: {errores[0] if errores else 'Error desconocido'}")
             if len(estadisticas['errores_por_cedula']) > 10:
                 logger.warning(f"  ... y {len(estadisticas['errores_por_cedula']) - 10} más")
@@ -864,10 +1041,132 @@ def flujo_completo(
         }
 
 
+def ejecutar_modo_completo(
+    args: argparse.Namespace,
+    scraper: UnivalleScraper,
+    sheets_service: SheetsService,
+    period_manager: PeriodManager,
+    logger: logging.Logger
+):
+    """Modo completo: flujo_completo() con los argumentos de línea de comandos."""
+    logger.info("Ejecutando flujo completo...")
+    resultado = flujo_completo(
+        source_sheet_url=args.source_sheet_url,
+        source_worksheet=args.source_worksheet,
+        source_column=args.source_column,
+        target_sheet_url=args.target_sheet_url,
+        target_period=args.target_period,
+        delay_entre_cedulas=args.delay_cedulas,
+        max_cedulas=args.max_cedulas,
+        max_workers=args.workers,
+        requests_por_segundo=args.rate,
+        usar_cache=not args.no_cache,
+        max_requests_por_segundo=args.max_rps
+    )
+    
+    if not resultado['exito']:
+        sys.exit(1)
+
+
+def ejecutar_modo_individual(
+    args: argparse.Namespace,
+    scraper: UnivalleScraper,
+    sheets_service: SheetsService,
+    period_manager: PeriodManager,
+    logger: logging.Logger
+):
+    """Modo individual (mantener compatibilidad): procesa solo --cedula."""
+    periodos = period_manager.obtener_ultimos_n_periodos(args.periodos)
+    resultado = procesar_docente(scraper, sheets_service, args.cedula, periodos)
+    
+    logger.info("Procesamiento completado:")
+    logger.info(f"  Períodos procesados: {len(resultado['periodos_procesados'])}")
+    logger.info(f"  Errores: {len(resultado['errores'])}")
+
+
+def ejecutar_modo_archivo(
+    args: argparse.Namespace,
+    scraper: UnivalleScraper,
+    sheets_service: SheetsService,
+    period_manager: PeriodManager,
+    logger: logging.Logger
+):
+    """Modo archivo (mantener compatibilidad): procesa las cédulas de --cedulas-archivo."""
+    periodos = period_manager.obtener_ultimos_n_periodos(args.periodos)
+    
+    resultados_totales = {
+        'exitosos': 0,
+        'errores': 0,
+        'detalles': []
+    }
+    
+    # Ritmo de cédulas (un token por docente, como --delay-cedulas en modo
+    # secuencial) sin ráfaga inicial; el tope de requests al portal de
+    # --max-rps lo aplica el scraper a cada período consultado
+    max_workers = max(1, args.workers)
+    rate = args.rate
+    if rate is None:
+        rate = 1.0 / args.delay_cedulas if args.delay_cedulas > 0 else 0.0
+    limitador = TokenBucket(rate=rate, burst=1)
+    logger.info(
+        f"🧵 Workers: {max_workers} | "
+        f"Ritmo: {f'{rate:.2f} cédulas/s' if rate > 0 else 'sin límite'} | "
+        f"Portal: {f'{args.max_rps:.2f} req/s' if args.max_rps > 0 else 'sin tope'}"
+    )
+    
+    def _procesar(cedula: str) -> Dict[str, Any]:
+        limitador.acquire()
+        return procesar_docente(scraper, sheets_service, cedula, periodos, buffer=buffer)
+    
+    # Un solo buffer para todos los docentes: se escribe por tamaño/tiempo
+    # y al final, en lugar de una solicitud a Sheets por docente. Los
+    # docentes se procesan en paralelo (--workers); el buffer es seguro
+    # entre hilos y los resultados se recogen en este hilo. Las cédulas se
+    # leen del archivo a medida que el pool las pide: solo hay unas pocas
+    # por worker en vuelo, no la lista completa en memoria
+    with SheetsWriteBuffer(sheets_service) as buffer, \
+            ThreadPoolExecutor(max_workers=max_workers) as executor:
+        completados = _completar_acotado(
+            executor,
+            _procesar,
+            _iter_cedulas_archivo(args.cedulas_archivo),
+            max_pendientes=max_workers * 4
+        )
+        for cedula, futuro in tqdm(completados, desc="Procesando cédulas", disable=not HAS_TQDM):
+            try:
+                resultados_totales['detalles'].append(futuro.result())
+            except Exception as e:
+                logger.error("Error procesando %s: %s", cedula, e, exc_info=True)
+                resultados_totales['errores'] += 1
+    
+    # Contar después de cerrar el buffer: hasta entonces las filas de los
+    # últimos docentes pueden no estar escritas (ver procesar_docente)
+    for resultado in resultados_totales['detalles']:
+        if resultado['errores']:
+            resultados_totales['errores'] += 1
+        else:
+            resultados_totales['exitosos'] += 1
+    
+    logger.info("Procesamiento masivo completado:")
+    logger.info(f"  Exitosos: {resultados_totales['exitosos']}")
+    logger.info(f"  Errores: {resultados_totales['errores']}")
+    logger.info(
+        f"  Períodos escritos: "
+        f"{sum(len(resultado['periodos_procesados']) for resultado in resultados_totales['detalles'])}"
+    )
+
+
+# Modo de ejecución (--modo) -> función que lo ejecuta
+MODOS = {
+    'completo': ejecutar_modo_completo,
+    'individual': ejecutar_modo_individual,
+    'archivo': ejecutar_modo_archivo,
+}
+
+
 def main():
     """Función principal del orquestador."""
     configurar_logging()
-    logger = logging.getLogger(__name__)
     
     parser = argparse.ArgumentParser(
         description='Scraper de datos académicos del portal Univalle - Flujo completo'
@@ -876,7 +1175,7 @@ def main():
     parser.add_argument(
         '--modo',
         type=str,
-        choices=['completo', 'individual', 'archivo'],
+        choices=list(MODOS),
         default='completo',
         help='Modo de ejecución: completo (default), individual, archivo'
     )
@@ -919,7 +1218,8 @@ def main():
         '--delay-cedulas',
         type=float,
         default=1.0,
-        help='Delay entre cédulas en segundos (default: 1.0)'
+        help='Segundos entre el inicio de una cédula y la siguiente, entre todos '
+             'los workers (default: 1.0)'
     )
     
     parser.add_argument(
@@ -929,6 +1229,37 @@ def main():
         help='Máximo número de cédulas a procesar (default: None, procesa todas)'
     )
     
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=2,
+        help='Número de cédulas a scrapear en paralelo (default: 2, 1 = secuencial)'
+    )
+    
+    parser.add_argument(
+        '--rate',
+        type=float,
+        default=None,
+        help='Máximo de cédulas por segundo entre todos los workers '
+             '(default: 1/--delay-cedulas, 0 = sin límite)'
+    )
+    
+    parser.add_argument(
+        '--max-rps',
+        type=float,
+        default=0.0,
+        help='Máximo de requests por segundo al portal entre todos los workers; '
+             'en modo archivo cada cédula hace un request por período '
+             '(default: 0 = sin tope, solo rige el ritmo de cédulas)'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='No reutilizar respuestas del portal guardadas en la caché HTTP en disco '
+             '(la caché solo se usa si HTTP_CACHE_TTL > 0; desactivada por defecto)'
+    )
+    
     # Argumentos para modo individual
     parser.add_argument(
         '--cedula',
@@ -963,72 +1294,27 @@ def main():
     
     args = parser.parse_args()
     
+    # Argumentos obligatorios según el modo
+    if args.modo == 'individual' and not args.cedula:
+        parser.error("--cedula es requerido en modo individual")
+    if args.modo == 'archivo' and not args.cedulas_archivo:
+        parser.error("--cedulas-archivo es requerido en modo archivo")
+    
     try:
         # Validar configuración
         validate_config()
         logger.info("✓ Configuración validada correctamente")
         
         # Inicializar servicios
-        scraper = UnivalleScraper()
+        scraper = UnivalleScraper(
+            usar_cache=not args.no_cache,
+            max_requests_por_segundo=args.max_rps
+        )
         sheets_service = SheetsService()
         period_manager = PeriodManager(sheets_service, scraper)
         
         # Ejecutar según modo
-        if args.modo == 'completo':
-            logger.info("Ejecutando flujo completo...")
-            resultado = flujo_completo(
-                source_sheet_url=args.source_sheet_url,
-                source_worksheet=args.source_worksheet,
-                source_column=args.source_column,
-                target_sheet_url=args.target_sheet_url,
-                target_period=args.target_period,
-                delay_entre_cedulas=args.delay_cedulas,
-                max_cedulas=args.max_cedulas
-            )
-            
-            if not resultado['exito']:
-                sys.exit(1)
-        
-        elif args.modo == 'individual':
-            # Modo individual (mantener compatibilidad)
-            if not args.cedula:
-                parser.error("--cedula es requerido en modo individual")
-            
-            periodos = period_manager.obtener_ultimos_n_periodos(args.periodos)
-            resultado = procesar_docente(scraper, sheets_service, args.cedula, periodos)
-            
-            logger.info("Procesamiento completado:")
-            logger.info(f"  Períodos procesados: {len(resultado['periodos_procesados'])}")
-            logger.info(f"  Errores: {len(resultado['errores'])}")
-        
-        elif args.modo == 'archivo':
-            # Modo archivo (mantener compatibilidad)
-            if not args.cedulas_archivo:
-                parser.error("--cedulas-archivo es requerido en modo archivo")
-            
-            with open(args.cedulas_archivo, 'r', encoding='utf-8') as f:
-                cedulas = [line.strip() for line in f if line.strip()]
-            
-            periodos = period_manager.obtener_ultimos_n_periodos(args.periodos)
-            
-            resultados_totales = {
-                'exitosos': 0,
-                'errores': 0,
-                'detalles': []
-            }
-            
-            for cedula in tqdm(cedulas, desc="Procesando cédulas", disable=not HAS_TQDM):
-                try:
-                    resultado = procesar_docente(scraper, sheets_service, cedula, periodos)
-                    resultados_totales['exitosos'] += 1
-                    resultados_totales['detalles'].append(resultado)
-                except Exception as e:
-                    logger.error(f"Error procesando {cedula}: {e}", exc_info=True)
-                    resultados_totales['errores'] += 1
-            
-            logger.info("Procesamiento masivo completado:")
-            logger.info(f"  Exitosos: {resultados_totales['exitosos']}")
-            logger.info(f"  Errores: {resultados_totales['errores']}")
+        MODOS[args.modo](args, scraper, sheets_service, period_manager, logger)
         
         logger.info("✓ Proceso completado exitosamente")
         
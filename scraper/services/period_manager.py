@@ -3,19 +3,91 @@ Gestor de períodos académicos
 """
 
 import logging
-import os
+import time
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta, timezone
 
 import gspread.exceptions
 
-from scraper.services.sheets_service import SheetsService
+from scraper.services.sheets_service import SheetsService, nuevo_sheet_id
 from scraper.services.univalle_scraper import UnivalleScraper
-from scraper.config.settings import DEFAULT_PERIODOS_COUNT
+from scraper.config.settings import DEFAULT_PERIODOS_COUNT, TARGET_PERIOD
 from scraper.utils.helpers import parsear_periodo_label
 
 logger = logging.getLogger(__name__)
 
+# Tipos de actividad con hoja propia por período (Periodo_<label>_<Tipo>)
+TIPOS_ACTIVIDADES = (
+    'Pregrado', 'Postgrado', 'Investigacion',
+    'Extension', 'Tesis', 'Administrativas',
+    'Complementarias', 'Intelectuales', 'Comision'
+)
+# (tipo, clave en el diccionario de headers) precalculado para no llamar lower() por período
+_TIPOS_Y_CLAVES = tuple((tipo, tipo.lower()) for tipo in TIPOS_ACTIVIDADES)
+_HEADERS_TIPO_POR_DEFECTO = ['Cédula', 'Período', 'Detalles', 'Fecha']
+
+# Headers de la hoja única por período (17 columnas)
+#No están, Porcentaje horas, Detalle actividad Sí se necesita 4 y 3 de dicciembre, tambien hay algo del cargo, Cargo y departamento
+#Porcentaje horas no se necesita, Detalle actividad es lom mismo que nombre actividad, cargo es lo mismo que vincuclacion
+_HEADERS_HOJA_PERIODO = (
+    'Cedula',
+    'Nombre Profesor',
+    'Escuela',
+    'Departamento',
+    'Tipo de Actividad',
+    'Categoría',
+    'Nombre de actividad',
+    'Número de horas',
+    #id
+    'Período',
+    #Porcentaje horas,
+    'Detalle actividad',
+    'Actividad',
+    'Vinculación',
+    'Dedicación',
+    'Nivel',
+    'Cargo',
+    # 'departamento' (minúscula) no es un duplicado de 'Departamento': la columna 16
+    # es el departamento del profesor y la 4 el de la actividad
+    'departamento',
+    'Fecha'
+)
+
+
+def _normalizar_header(header: str) -> str:
+    """Forma de un header usada para comparar (gspread siempre entrega strings)."""
+    return header.strip().lower()
+
+
+# Forma normalizada para comparar con la fila 1 de una hoja existente
+_HEADERS_HOJA_PERIODO_NORMALIZADOS = tuple(map(_normalizar_header, _HEADERS_HOJA_PERIODO))
+
+
+def _es_error_hoja_existente(error: gspread.exceptions.APIError) -> bool:
+    """
+    Indica si la API rechazó un addSheet porque ya hay una hoja con ese título.
+    
+    Se revisa el cuerpo JSON del error (status INVALID_ARGUMENT) en lugar de
+    str(error), cuyo formato depende de la versión de gspread.
+    """
+    try:
+        detalle = error.response.json().get('error', {})
+    except (AttributeError, ValueError):
+        return False
+    return (
+        detalle.get('status') == 'INVALID_ARGUMENT'
+        and 'already exists' in detalle.get('message', '').lower()
+    )
+
+
+# Segundos que se reutiliza la lectura de la hoja 'Configuracion'
+PERIODOS_ACTIVOS_TTL = 60.0
+# Columnas label y activo de 'Configuracion', sin el header
+_RANGO_CONFIGURACION = "'Configuracion'!A2:B"
+
+# Filas con que se crea (y a las que se recorta) la hoja de un período
+FILAS_HOJA_PERIODO = 1000
+
 
 def calcular_periodo_anterior(year: int, term: int) -> tuple:
     """
@@ -49,6 +121,14 @@ class PeriodManager:
         """
         self.sheets_service = sheets_service
         self.scraper = scraper
+        
+        # La lista de períodos del portal ya la memoiza el scraper (en proceso y
+        # en disco); aquí solo se cachea la lectura de la hoja de configuración
+        self._periodos_activos: Optional[List[Dict[str, Any]]] = None
+        self._periodos_activos_leidos = 0.0
+        
+        # TARGET_PERIOD ya validado por get_target_period()
+        self._target_period: Optional[str] = None
     
     def obtener_ultimos_n_periodos(self, n: int = DEFAULT_PERIODOS_COUNT) -> List[Dict[str, Any]]:
         """
@@ -95,40 +175,37 @@ class PeriodManager:
         """
         logger.info(f"Creando hojas para {len(periodos)} períodos")
         
+        headers_principales = headers.get('principal', [
+            'Cédula', 'Nombre', 'Apellido1', 'Apellido2',
+            'Escuela', 'Departamento', 'Período', 'Fecha'
+        ])
+        
+        # Headers de cada tipo de actividad, resueltos una vez para todos los períodos
+        headers_por_tipo = tuple(
+            (tipo, headers.get(clave_headers, _HEADERS_TIPO_POR_DEFECTO))
+            for tipo, clave_headers in _TIPOS_Y_CLAVES
+        )
+        
+        # Todas las hojas se crean/actualizan juntas en lugar de una llamada por hoja
+        headers_por_hoja = {}
         for periodo in periodos:
-            periodo_label = periodo.get('label', f"Periodo_{periodo['idPeriod']}")
+            # El fallback solo se construye si falta 'label' (dict.get lo evaluaría siempre)
+            periodo_label = periodo['label'] if 'label' in periodo else f"Periodo_{periodo['idPeriod']}"
             
-            # Crear hoja principal del período
+            # Hoja principal del período
             hoja_nombre = f"Periodo_{periodo_label}"
-            headers_principales = headers.get('principal', [
-                'Cédula', 'Nombre', 'Apellido1', 'Apellido2',
-                'Escuela', 'Departamento', 'Período', 'Fecha'
-            ])
+            prefijo_tipo = hoja_nombre + "_"
+            headers_por_hoja[hoja_nombre] = headers_principales
             
-            self.sheets_service.crear_hoja(
-                hoja_nombre,
-                headers_principales,
-                limpiar_existente=limpiar_existentes
-            )
-            
-            # Crear hojas específicas por tipo de actividad
-            tipos_actividades = [
-                'Pregrado', 'Postgrado', 'Investigacion',
-                'Extension', 'Tesis', 'Administrativas',
-                'Complementarias', 'Intelectuales', 'Comision'
-            ]
-            
-            for tipo in tipos_actividades:
-                hoja_tipo_nombre = f"{hoja_nombre}_{tipo}"
-                headers_tipo = headers.get(tipo.lower(), ['Cédula', 'Período', 'Detalles', 'Fecha'])
-                
-                self.sheets_service.crear_hoja(
-                    hoja_tipo_nombre,
-                    headers_tipo,
-                    limpiar_existente=limpiar_existentes
-                )
-            
-            logger.info(f"Hoja creada/actualizada: {hoja_nombre}")
+            # Hojas específicas por tipo de actividad
+            for tipo, headers_tipo in headers_por_tipo:
+                headers_por_hoja[prefijo_tipo + tipo] = headers_tipo
+        
+        self.sheets_service.crear_hojas_lote(
+            headers_por_hoja,
+            limpiar_existentes=limpiar_existentes
+        )
+        logger.info(f"Hojas creadas/actualizadas: {len(headers_por_hoja)}")
     
     def limpiar_hojas_periodos(self, periodos: List[Dict[str, Any]]):
         """
@@ -139,65 +216,70 @@ class PeriodManager:
         """
         logger.info(f"Limpiando hojas de {len(periodos)} períodos")
         
+        nombres_hojas = []
         for periodo in periodos:
-            periodo_label = periodo.get('label', f"Periodo_{periodo['idPeriod']}")
+            periodo_label = periodo['label'] if 'label' in periodo else f"Periodo_{periodo['idPeriod']}"
             hoja_nombre = f"Periodo_{periodo_label}"
+            prefijo_tipo = hoja_nombre + "_"
             
-            try:
-                # Limpiar hoja principal
-                self.sheets_service.limpiar_hoja(hoja_nombre)
-                
-                # Limpiar hojas de actividades
-                tipos_actividades = [
-                    'Pregrado', 'Postgrado', 'Investigacion',
-                    'Extension', 'Tesis', 'Administrativas',
-                    'Complementarias', 'Intelectuales', 'Comision'
-                ]
-                
-                for tipo in tipos_actividades:
-                    hoja_tipo_nombre = f"{hoja_nombre}_{tipo}"
-                    try:
-                        self.sheets_service.limpiar_hoja(hoja_tipo_nombre)
-                    except Exception as e:
-                        logger.warning(f"No se pudo limpiar {hoja_tipo_nombre}: {e}")
-                
-                logger.info(f"Período {hoja_nombre} limpiado")
-                
-            except Exception as e:
-                logger.error(f"Error al limpiar período {hoja_nombre}: {e}")
+            # Hoja principal y hojas de actividades
+            nombres_hojas.append(hoja_nombre)
+            nombres_hojas.extend(prefijo_tipo + tipo for tipo in TIPOS_ACTIVIDADES)
+        
+        try:
+            no_encontradas = self.sheets_service.limpiar_hojas_lote(nombres_hojas)
+            for hoja_nombre in no_encontradas:
+                logger.warning(f"No se pudo limpiar {hoja_nombre}: la hoja no existe")
+        except Exception as e:
+            logger.error(f"Error al limpiar hojas de períodos: {e}")
     
     def obtener_periodos_activos(self) -> List[Dict[str, Any]]:
         """
         Obtiene los períodos activos desde una hoja de configuración.
         
+        La lectura se reutiliza durante PERIODOS_ACTIVOS_TTL segundos.
+        
         Returns:
             Lista de períodos activos
         """
+        if (
+            self._periodos_activos is not None
+            and time.monotonic() - self._periodos_activos_leidos < PERIODOS_ACTIVOS_TTL
+        ):
+            return list(self._periodos_activos)
+        
         try:
-            # Intentar leer desde hoja de configuración
-            valores = self.sheets_service.obtener_todos_los_valores('Configuracion')
-            
-            periodos_activos = []
-            for fila in valores[1:]:  # Saltar header
-                if len(fila) >= 2 and fila[1].lower() == 'x':  # Columna activo
-                    periodo_label = fila[0]
-                    periodo_info = parsear_periodo_label(periodo_label)
-                    
-                    if periodo_info:
-                        # Buscar ID del período (esto requeriría mapeo adicional)
-                        periodos_activos.append({
-                            'label': periodo_label,
-                            'year': periodo_info['year'],
-                            'term': periodo_info['term']
-                        })
-            
-            return periodos_activos
+            # Intentar leer desde hoja de configuración: solo label y activo
+            # (columnas A:B) desde la fila 2, sin el header ni el resto de columnas
+            filas, = self.sheets_service.batch_get([_RANGO_CONFIGURACION])
+            return self._guardar_periodos_activos(filas)
             
         except Exception as e:
             logger.warning(f"No se pudo leer períodos activos: {e}")
             # Fallback: usar últimos N períodos
             return self.obtener_ultimos_n_periodos()
     
+    def _guardar_periodos_activos(self, filas: List[List[str]]) -> List[Dict[str, Any]]:
+        """Extrae los períodos activos de las filas de 'Configuracion' y los cachea."""
+        periodos_activos = []
+        # La API omite las celdas vacías al final de la fila: sin columna B no está activo
+        for fila in filas:
+            if len(fila) >= 2 and fila[1].casefold() == 'x':  # Columna activo
+                periodo_label = fila[0]
+                periodo_info = parsear_periodo_label(periodo_label)
+                
+                if periodo_info:
+                    # Buscar ID del período (esto requeriría mapeo adicional)
+                    periodos_activos.append({
+                        'label': periodo_label,
+                        'year': periodo_info['year'],
+                        'term': periodo_info['term']
+                    })
+        
+        self._periodos_activos = periodos_activos
+        self._periodos_activos_leidos = time.monotonic()
+        return list(periodos_activos)
+    
     def normalizar_nombre_hoja_periodo(self, periodo: Dict[str, Any]) -> str:
         """
         Normaliza el nombre de hoja para un período.
@@ -208,7 +290,7 @@ class PeriodManager:
         Returns:
             Nombre normalizado de la hoja
         """
-        label = periodo.get('label', f"Periodo_{periodo.get('idPeriod', '')}")
+        label = periodo['label'] if 'label' in periodo else f"Periodo_{periodo.get('idPeriod', '')}"
         return f"Periodo_{label}"
     
     def validar_periodo(self, periodo: Dict[str, Any]) -> bool:
@@ -228,6 +310,9 @@ class PeriodManager:
         """
         Obtiene el período objetivo desde la variable de entorno TARGET_PERIOD.
         
+        El valor se lee una sola vez al importar la configuración (Settings es
+        inmutable), así que se valida en la primera llamada y luego se reutiliza.
+        
         Returns:
             Período en formato "2026-1" o "2025-2"
             
@@ -240,7 +325,11 @@ class PeriodManager:
             >>> print(period)
             '2026-1'
         """
-        target_period = os.getenv('TARGET_PERIOD')
+        # Ya validado en una llamada anterior
+        if self._target_period is not None:
+            return self._target_period
+        
+        target_period = TARGET_PERIOD
         
         if not target_period:
             raise ValueError(
@@ -259,9 +348,14 @@ class PeriodManager:
         
         logger.info(f"Período objetivo obtenido: {target_period}")
         
+        self._target_period = target_period
         return target_period
     
-    def prepare_single_period_sheet(self, sheet_url: Optional[str] = None, period: str = None):
+    def prepare_single_period_sheet(
+        self,
+        sheet_url: Optional[str] = None,
+        period: str = None
+    ):
         """
         Prepara la hoja de un período específico en Google Sheets.
         
@@ -288,11 +382,9 @@ class PeriodManager:
             >>> manager.prepare_single_period_sheet(period="2026-1")
         """
         if not period:
+            # get_target_period() ya valida el formato
             period = self.get_target_period()
-        
-        # Validar formato del período
-        periodo_info = parsear_periodo_label(period)
-        if not periodo_info:
+        elif not parsear_periodo_label(period):
             raise ValueError(
                 f"Formato de período inválido: {period}. "
                 f"Debe ser en formato 'YYYY-T' (ej: '2026-1', '2025-2')"
@@ -301,29 +393,7 @@ class PeriodManager:
         logger.info(f"Preparando hoja para período: {period}")
         
         # Headers especificados (17 columnas)
-        #No están, Porcentaje horas, Detalle actividad Sí se necesita 4 y 3 de dicciembre, tambien hay algo del cargo, Cargo y departamento
-        #Porcentaje horas no se necesita, Detalle actividad es lom mismo que nombre actividad, cargo es lo mismo que vincuclacion
-        headers = [
-            'Cedula',
-            'Nombre Profesor',
-            'Escuela',
-            'Departamento',
-            'Tipo de Actividad',
-            'Categoría',
-            'Nombre de actividad',
-            'Número de horas',
-            #id
-            'Período',
-            #Porcentaje horas,
-            'Detalle actividad', 
-            'Actividad',
-            'Vinculación',
-            'Dedicación',
-            'Nivel',
-            'Cargo',
-            'departamento',
-            'Fecha'
-        ]
+        headers = _HEADERS_HOJA_PERIODO
         
         # Obtener o crear conexión a la hoja de cálculo
         if sheet_url:
@@ -340,106 +410,143 @@ class PeriodManager:
         nombre_hoja = period  # El nombre de la hoja es el período (ej: "2026-1")
         
         try:
-            # Verificar si la hoja existe
-            worksheet = None
-            hoja_existe = False
+            # Verificar si la hoja existe con un solo fetch de metadatos: el mapa
+            # título -> Worksheet evita un spreadsheet.worksheet() por búsqueda
+            hojas = {ws.title: ws for ws in spreadsheet.worksheets()}
+            worksheet = hojas.get(nombre_hoja)
+            hoja_existe = worksheet is not None
             
-            try:
-                worksheet = spreadsheet.worksheet(nombre_hoja)
-                hoja_existe = True
+            if hoja_existe:
                 logger.info(f"Hoja '{nombre_hoja}' existe, limpiando datos (manteniendo headers)")
-            except gspread.exceptions.WorksheetNotFound:
-                hoja_existe = False
+            else:
                 logger.info(f"Hoja '{nombre_hoja}' no existe, será creada")
             
-            if hoja_existe and worksheet:
+            if hoja_existe:
                 # Hoja existe, limpiar datos manteniendo headers
                 try:
-                    # Obtener todos los valores
-                    todos_valores = worksheet.get_all_values()
+                    # Solo se lee la fila de headers: el contenido se limpia a ciegas
+                    # sin descargar la hoja completa para saber cuántas filas tiene
+                    primera_fila = worksheet.row_values(1)
                     
-                    if len(todos_valores) > 0:
-                        # Verificar si la primera fila tiene headers
-                        primera_fila = todos_valores[0]
-                        
-                        # Limpiar todas las filas excepto la primera
-                        # Usar batch_clear en lugar de delete_rows para evitar el error
-                        # "cannot delete all non-frozen rows"
-                        if len(todos_valores) > 1:
-                            # Calcular rango a limpiar (desde fila 2 hasta el final)
-                            ultima_fila = len(todos_valores)
-                            # Usar batch_clear para limpiar el contenido sin eliminar filas
-                            # Esto evita el error de "cannot delete all non-frozen rows"
-                            rango_limpiar = f'A2:Z{ultima_fila}'
-                            worksheet.batch_clear([rango_limpiar])
-                            logger.debug(f"Limpiado contenido de {ultima_fila - 1} filas de datos")
-                            
-                            # Si hay más de 1000 filas, limpiar también las filas extra
-                            # usando delete_rows solo si hay filas suficientes
-                            if ultima_fila > 1000:
-                                # Dejar solo la primera fila y algunas filas vacías
-                                # Eliminar desde la fila 1001 en adelante
-                                try:
-                                    worksheet.delete_rows(1001, ultima_fila)
-                                    logger.debug(f"Eliminadas filas adicionales (1001-{ultima_fila})")
-                                except Exception as del_err:
-                                    logger.warning(f"No se pudieron eliminar filas adicionales: {del_err}")
-                        
-                        # Verificar si los headers coinciden
-                        headers_existentes = [str(h).lower().strip() for h in primera_fila]
-                        headers_esperados = [str(h).lower().strip() for h in headers]
-                        
-                        # Si los headers no coinciden, actualizarlos
-                        if headers_existentes != headers_esperados:
-                            logger.info(f"Actualizando headers en hoja '{nombre_hoja}'")
-                            # Actualizar la primera fila con los headers correctos
-                            worksheet.update('A1', [headers])
-                        else:
-                            logger.debug(f"Headers correctos en hoja '{nombre_hoja}'")
+                    # Todas las modificaciones van en un solo spreadsheets.batchUpdate:
+                    # limpiar todo lo que está debajo de la fila 1 (updateCells
+                    # sin valores borra el contenido sin eliminar filas, lo que evita el
+                    # error "cannot delete all non-frozen rows"), recortar la grilla a
+                    # FILAS_HOJA_PERIODO filas y headers
+                    total_filas = worksheet.row_count
+                    requests = []
+                    if total_filas > 1:
+                        requests.append({
+                            'updateCells': {
+                                'range': {
+                                    'sheetId': worksheet.id,
+                                    'startRowIndex': 1,
+                                },
+                                'fields': 'userEnteredValue',
+                            }
+                        })
+                    
+                    # Si la grilla tiene más de FILAS_HOJA_PERIODO filas, eliminar las filas extra
+                    if total_filas > FILAS_HOJA_PERIODO:
+                        requests.append({
+                            'deleteDimension': {
+                                'range': {
+                                    'sheetId': worksheet.id,
+                                    'dimension': 'ROWS',
+                                    'startIndex': FILAS_HOJA_PERIODO,
+                                    'endIndex': total_filas,
+                                }
+                            }
+                        })
+                        logger.debug("Eliminando filas adicionales (%d-%d)", FILAS_HOJA_PERIODO + 1, total_filas)
+                    
+                    # Verificar si los headers coinciden. La comparación es por
+                    # posición (no por conjunto): las filas se escriben por índice
+                    # de columna, así que un header en otra columna también cuenta
+                    headers_existentes = tuple(map(_normalizar_header, primera_fila))
+                    
+                    # Si los headers no coinciden (o la hoja está vacía), actualizarlos
+                    if headers_existentes != _HEADERS_HOJA_PERIODO_NORMALIZADOS:
+                        logger.info(f"Actualizando headers en hoja '{nombre_hoja}'")
+                        # updateCells no amplía la grilla: una hoja con menos
+                        # columnas que headers haría fallar todo el batchUpdate
+                        if worksheet.col_count < len(headers):
+                            requests.append({
+                                'appendDimension': {
+                                    'sheetId': worksheet.id,
+                                    'dimension': 'COLUMNS',
+                                    'length': len(headers) - worksheet.col_count,
+                                }
+                            })
+                        requests.append({
+                            'updateCells': {
+                                'rows': [{'values': [
+                                    {'userEnteredValue': {'stringValue': h}} for h in headers
+                                ]}],
+                                'fields': 'userEnteredValue',
+                                'start': {'sheetId': worksheet.id, 'rowIndex': 0, 'columnIndex': 0},
+                            }
+                        })
                     else:
-                        # Hoja vacía, agregar headers
-                        logger.info(f"Hoja '{nombre_hoja}' está vacía, agregando headers")
-                        worksheet.update('A1', [headers])
+                        logger.debug(f"Headers correctos en hoja '{nombre_hoja}'")
+                    
+                    if requests:
+                        logger.debug(
+                            "Hoja '%s': %d subsolicitudes en un solo batchUpdate",
+                            nombre_hoja, len(requests)
+                        )
+                        spreadsheet.batch_update({'requests': requests})
                 
                 except Exception as e:
                     logger.warning(f"Error al limpiar hoja '{nombre_hoja}': {e}")
-                    # Si falla la limpieza, intentar actualizar solo los headers
+                    # Si falla el batchUpdate no se aplicó nada: limpiar la hoja
+                    # completa y reescribir los headers con llamadas separadas (solo
+                    # headers dejaría los datos anteriores y se duplicarían filas)
                     try:
-                        worksheet.update('A1', [headers])
-                        logger.info(f"Headers actualizados en hoja '{nombre_hoja}'")
+                        if worksheet.col_count < len(headers):
+                            worksheet.add_cols(len(headers) - worksheet.col_count)
+                        worksheet.clear()
+                        worksheet.update('A1', [list(headers)])
+                        logger.info(f"Hoja '{nombre_hoja}' limpiada y headers actualizados")
                     except Exception as header_err:
-                        logger.error(f"Error al actualizar headers: {header_err}")
+                        logger.error(f"Error al limpiar hoja y actualizar headers: {header_err}")
                         raise
             
             else:
-                # Hoja no existe, crearla
-                # Verificar primero que realmente no existe (por si acaso)
+                # Hoja no existe, crearla con sus headers en un solo batchUpdate
+                # (el sheetId se asigna aquí para poder escribir la fila 1 en la
+                # misma solicitud). Si otro proceso la creó después de leer los
+                # metadatos, la API rechaza el addSheet con INVALID_ARGUMENT
+                logger.info(f"Creando hoja '{nombre_hoja}'")
+                sheet_id = nuevo_sheet_id(ws.id for ws in hojas.values())
                 try:
-                    worksheet = spreadsheet.worksheet(nombre_hoja)
-                    logger.info(f"Hoja '{nombre_hoja}' encontrada después de verificación")
-                except gspread.exceptions.WorksheetNotFound:
-                    # Realmente no existe, crearla
-                    logger.info(f"Creando hoja '{nombre_hoja}'")
-                    try:
-                        worksheet = spreadsheet.add_worksheet(
-                            title=nombre_hoja,
-                            rows=1000,
-                            cols=len(headers)
-                        )
-                        
-                        # Agregar headers
-                        worksheet.update('A1', [headers])
-                        
-                        logger.info(f"Hoja '{nombre_hoja}' creada con {len(headers)} columnas")
-                    except gspread.exceptions.APIError as api_err:
-                        # Si el error es que la hoja ya existe, obtenerla
-                        if 'already exists' in str(api_err).lower():
-                            logger.warning(f"Hoja '{nombre_hoja}' ya existe (creada por otro proceso), obteniéndola")
-                            worksheet = spreadsheet.worksheet(nombre_hoja)
-                            # Asegurar que tenga los headers correctos
-                            worksheet.update('A1', [headers])
-                        else:
-                            raise
+                    spreadsheet.batch_update({'requests': [
+                        {'addSheet': {'properties': {
+                            'sheetId': sheet_id,
+                            'title': nombre_hoja,
+                            'gridProperties': {'rowCount': FILAS_HOJA_PERIODO, 'columnCount': len(headers)},
+                        }}},
+                        {'updateCells': {
+                            'rows': [{'values': [
+                                {'userEnteredValue': {'stringValue': h}} for h in headers
+                            ]}],
+                            'fields': 'userEnteredValue',
+                            'start': {'sheetId': sheet_id, 'rowIndex': 0, 'columnIndex': 0},
+                        }},
+                    ]})
+                    self.sheets_service.invalidar_ids_hojas(spreadsheet.id)
+                    
+                    logger.info(f"Hoja '{nombre_hoja}' creada con {len(headers)} columnas")
+                except gspread.exceptions.APIError as api_err:
+                    # Si el error es que la hoja ya existe, obtenerla
+                    if _es_error_hoja_existente(api_err):
+                        self.sheets_service.invalidar_ids_hojas(spreadsheet.id)
+                        logger.warning(f"Hoja '{nombre_hoja}' ya existe (creada por otro proceso), obteniéndola")
+                        worksheet = spreadsheet.worksheet(nombre_hoja)
+                        # Asegurar que tenga los headers correctos
+                        worksheet.update('A1', [list(headers)])
+                    else:
+                        raise
         
         except Exception as e:
             logger.error(f"Error preparando hoja '{nombre_hoja}': {e}", exc_info=True)
@@ -455,7 +562,7 @@ class PeriodManager:
             except Exception:
                 header_val = ''
 
-            if str(header_val).strip().lower() != 'fecha':
+            if _normalizar_header(header_val) != 'fecha':
                 try:
                     escuelas_ws.update_cell(1, 3, 'Fecha')
                     logger.info("Header 'Fecha' actualizado en hoja 'Escuelas' columna C")
@@ -465,12 +572,11 @@ class PeriodManager:
             zona_colombia = timezone(timedelta(hours=-5))
             ts = datetime.now(zona_colombia).strftime('%Y-%m-%d %H:%M:%S')
 
-            # Escribir en las primeras 8 filas bajo el header (filas 2..9)
-            for row_idx in range(2, 10):
-                try:
-                    escuelas_ws.update_cell(row_idx, 3, ts)
-                except Exception as e:
-                    logger.warning(f"No se pudo escribir fecha en 'Escuelas' fila {row_idx}: {e}")
+            # Escribir en las primeras 8 filas bajo el header (filas 2..9) con una sola llamada
+            try:
+                escuelas_ws.update('C2:C9', [[ts]] * 8)
+            except Exception as e:
+                logger.warning(f"No se pudo escribir fecha en 'Escuelas' filas 2-9: {e}")
 
             logger.info("Fecha registrada en 'Escuelas' columna C filas 2-9")
 
@@ -478,4 +584,3 @@ class PeriodManager:
             logger.warning(f"Error al intentar registrar la fecha en la hoja 'Escuelas': {e}")
 
         logger.info(f"✓ Hoja '{nombre_hoja}' preparada exitosamente")
-
@@ -3,8 +3,11 @@ Servicio para interactuar con Google Sheets
 """
 
 import logging
+import random
+import socket
+import threading
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
 from datetime import datetime
 
 import gspread
@@ -17,10 +20,12 @@ logger = logging.getLogger(__name__)
 # Import opcional de googleapiclient (requiere google-api-python-client)
 try:
     from googleapiclient.discovery import build
+    from googleapiclient.errors import HttpError
     HAS_GOOGLEAPICLIENT = True
 except ImportError:
     HAS_GOOGLEAPICLIENT = False
     build = None
+    HttpError = None
     logger.warning(
         "google-api-python-client no está instalado. "
         "Algunas funcionalidades avanzadas no estarán disponibles. "
@@ -30,7 +35,9 @@ except ImportError:
 from tenacity import (
     retry,
     wait_exponential,
+    wait_exponential_jitter,
     stop_after_attempt,
+    retry_if_exception,
     retry_if_exception_type,
     before_sleep_log,
 )
@@ -51,6 +58,72 @@ from scraper.config.settings import (
 from scraper.utils.helpers import sanitizar_valor_hoja, validar_cedula, limpiar_cedula
 
 
+def _es_error_cuota(excepcion: BaseException) -> bool:
+    """
+    Indica si la excepción es un 429 (cuota excedida) de la API de Sheets.
+    
+    Solo estas escrituras se reintentan: la API las rechaza sin aplicarlas, mientras
+    que reintentar un append tras otros errores podría duplicar filas.
+    """
+    respuesta = getattr(excepcion, 'response', None)
+    return isinstance(excepcion, APIError) and getattr(respuesta, 'status_code', None) == 429
+
+
+# Reintento con backoff exponencial para escrituras rechazadas por cuota
+_reintentar_por_cuota = retry(
+    wait=wait_exponential_jitter(initial=1, max=60),
+    stop=stop_after_attempt(5),
+    retry=retry_if_exception(_es_error_cuota),
+    reraise=True,
+    before_sleep=before_sleep_log(logger, logging.WARNING)
+)
+
+
+def _es_error_transitorio(excepcion: BaseException) -> bool:
+    """
+    Indica si la excepción es un 429 o un 5xx de la API de Sheets, o un timeout
+    o corte de conexión.
+    
+    Cubre tanto los APIError de gspread como los HttpError de googleapiclient.
+    Solo para operaciones idempotentes (p. ej. limpiar hojas o leer rangos),
+    donde repetir una solicitud que sí se aplicó no cambia el resultado.
+    """
+    if isinstance(excepcion, (socket.timeout, ConnectionError)):
+        return True
+    if isinstance(excepcion, APIError):
+        codigo = getattr(getattr(excepcion, 'response', None), 'status_code', None) or 0
+    elif HttpError is not None and isinstance(excepcion, HttpError):
+        codigo = getattr(getattr(excepcion, 'resp', None), 'status', None) or 0
+    else:
+        return False
+    codigo = int(codigo)
+    return codigo == 429 or codigo >= 500
+
+
+# Reintento con backoff exponencial para operaciones idempotentes
+_reintentar_si_transitorio = retry(
+    wait=wait_exponential_jitter(initial=1, max=60),
+    stop=stop_after_attempt(5),
+    retry=retry_if_exception(_es_error_transitorio),
+    reraise=True,
+    before_sleep=before_sleep_log(logger, logging.WARNING)
+)
+
+
+def nuevo_sheet_id(existentes: Iterable[int]) -> int:
+    """
+    Elige un sheetId aleatorio que no esté en `existentes` para un AddSheetRequest.
+    
+    Aleatorio y no max+1: otro proceso puede estar creando hojas en el mismo
+    spreadsheet con el mismo mapa de ids y elegiría el mismo max+1.
+    """
+    existentes = set(existentes)
+    sheet_id = random.randrange(1, 2**31 - 1)
+    while sheet_id in existentes:
+        sheet_id = random.randrange(1, 2**31 - 1)
+    return sheet_id
+
+
 class SheetsService:
     """Servicio para manejar Google Sheets."""
     
@@ -137,6 +210,10 @@ class SheetsService:
             # Inicializar caché de spreadsheets
             self._spreadsheet_cache: Dict[str, Any] = {}
             
+            # Caché de títulos -> sheetId por spreadsheet (ver _ids_hojas)
+            self._ids_hojas_cache: Dict[str, Dict[str, int]] = {}
+            self._lock_ids_hojas = threading.Lock()
+            
             logger.info(f"✓ Conectado a Google Sheets: {self.spreadsheet.title} (ID: {sheet_id})")
         except FileNotFoundError:
             logger.error(f"❌ Archivo de credenciales no encontrado: {GOOGLE_SHEETS_CREDENTIALS_PATH}")
@@ -216,6 +293,37 @@ class SheetsService:
             raise ValueError("No se configuró GOOGLE_SHEETS_TARGET_ID")
         return self.client.open_by_key(sheet_id)
     
+    def _ids_hojas(self, spreadsheet, nombres: Iterable[str] = ()) -> Dict[str, int]:
+        """
+        Mapa título -> sheetId de un spreadsheet, leído con worksheets() una vez
+        y reutilizado entre llamadas.
+        
+        Si alguno de `nombres` no está en el mapa se vuelve a leer, por si la
+        hoja fue creada después (por otro proceso o desde la interfaz).
+        
+        Returns:
+            Copia del mapa (el llamador puede modificarla)
+        """
+        with self._lock_ids_hojas:
+            ids_hojas = self._ids_hojas_cache.get(spreadsheet.id)
+            if ids_hojas is None or any(nombre not in ids_hojas for nombre in nombres):
+                ids_hojas = {hoja.title: hoja.id for hoja in spreadsheet.worksheets()}
+                self._ids_hojas_cache[spreadsheet.id] = ids_hojas
+            return dict(ids_hojas)
+    
+    def invalidar_ids_hojas(self, spreadsheet_id: Optional[str] = None):
+        """
+        Descarta el mapa título -> sheetId en caché tras crear o borrar hojas.
+        
+        Args:
+            spreadsheet_id: Spreadsheet a invalidar (None = todos)
+        """
+        with self._lock_ids_hojas:
+            if spreadsheet_id is None:
+                self._ids_hojas_cache.clear()
+            else:
+                self._ids_hojas_cache.pop(spreadsheet_id, None)
+    
     def obtener_hoja(self, nombre_hoja: str, crear_si_no_existe: bool = False, usar_target: bool = True):
         """
         Obtiene una hoja por nombre.
@@ -235,11 +343,13 @@ class SheetsService:
             if crear_si_no_existe:
                 logger.info(f"Creando hoja: {nombre_hoja}")
                 spreadsheet = self.get_target_spreadsheet() if usar_target else self.get_source_spreadsheet()
-                return spreadsheet.add_worksheet(
+                hoja = spreadsheet.add_worksheet(
                     title=nombre_hoja,
                     rows=1000,
                     cols=20
                 )
+                self.invalidar_ids_hojas(spreadsheet.id)
+                return hoja
             raise
     
     def crear_hoja(self, nombre_hoja: str, headers: List[str], limpiar_existente: bool = False, usar_target: bool = True):
@@ -286,6 +396,109 @@ class SheetsService:
             logger.error(f"Error al limpiar hoja {nombre_hoja}: {e}")
             raise
     
+    @_reintentar_por_cuota
+    def crear_hojas_lote(
+        self,
+        headers_por_hoja: Dict[str, List[str]],
+        limpiar_existentes: bool = False,
+        usar_target: bool = True
+    ):
+        """
+        Crea varias hojas con headers en una sola llamada spreadsheets.batchUpdate.
+        
+        Las hojas que faltan se agregan con AddSheetRequest (con el sheetId
+        asignado aquí, para poder escribir sus headers en la misma solicitud).
+        Las que ya existen se dejan como están, salvo que limpiar_existentes sea
+        True: entonces se limpia su contenido y se reescriben los headers.
+        
+        Args:
+            headers_por_hoja: Diccionario nombre_hoja -> lista de headers
+            limpiar_existentes: Si es True, limpia las hojas que ya existen
+            usar_target: Si es True, crea en la hoja destino; si es False, en la fuente
+        """
+        if not headers_por_hoja:
+            return
+        
+        try:
+            spreadsheet = self.get_target_spreadsheet() if usar_target else self.get_source_spreadsheet()
+            # Sin refrescar por faltantes: las hojas que falten se van a crear
+            ids_hojas = self._ids_hojas(spreadsheet)
+            
+            requests_lote = []
+            nuevas = 0
+            for nombre_hoja, headers in headers_por_hoja.items():
+                if nombre_hoja in ids_hojas:
+                    if not limpiar_existentes:
+                        continue
+                    # updateCells sin valores sobre toda la hoja equivale a hoja.clear()
+                    requests_lote.append({'updateCells': {
+                        'range': {'sheetId': ids_hojas[nombre_hoja]},
+                        'fields': 'userEnteredValue',
+                    }})
+                else:
+                    ids_hojas[nombre_hoja] = nuevo_sheet_id(ids_hojas.values())
+                    nuevas += 1
+                    requests_lote.append({'addSheet': {'properties': {
+                        'sheetId': ids_hojas[nombre_hoja],
+                        'title': nombre_hoja,
+                        'gridProperties': {'rowCount': 1000, 'columnCount': max(1, len(headers))},
+                    }}})
+                
+                requests_lote.append({'updateCells': {
+                    'rows': [{'values': [
+                        {'userEnteredValue': {'stringValue': str(h)}} for h in headers
+                    ]}],
+                    'fields': 'userEnteredValue',
+                    'start': {'sheetId': ids_hojas[nombre_hoja], 'rowIndex': 0, 'columnIndex': 0},
+                }})
+            
+            if requests_lote:
+                spreadsheet.batch_update({'requests': requests_lote})
+            if nuevas:
+                self.invalidar_ids_hojas(spreadsheet.id)
+            logger.info(
+                f"Hojas en lote: {nuevas} creadas, "
+                f"{len(headers_por_hoja) - nuevas} existentes"
+                f"{' limpiadas' if limpiar_existentes else ' sin cambios'}"
+            )
+        except Exception as e:
+            # El mapa en caché puede estar desactualizado (p. ej. hoja existente borrada)
+            self.invalidar_ids_hojas()
+            logger.error(f"Error al crear hojas en lote {list(headers_por_hoja)}: {e}")
+            raise
+    
+    @_reintentar_si_transitorio
+    def limpiar_hojas_lote(self, nombres_hojas: List[str]) -> List[str]:
+        """
+        Limpia el contenido de varias hojas con una sola llamada spreadsheets.batchUpdate.
+        
+        Args:
+            nombres_hojas: Nombres de las hojas a limpiar
+            
+        Returns:
+            Nombres de las hojas que no existen (no se limpian)
+        """
+        try:
+            spreadsheet = self.get_target_spreadsheet()
+            ids_hojas = self._ids_hojas(spreadsheet, nombres_hojas)
+            
+            no_encontradas = [nombre for nombre in nombres_hojas if nombre not in ids_hojas]
+            requests_lote = [
+                {'updateCells': {
+                    'range': {'sheetId': ids_hojas[nombre]},
+                    'fields': 'userEnteredValue',
+                }}
+                for nombre in nombres_hojas if nombre in ids_hojas
+            ]
+            if requests_lote:
+                spreadsheet.batch_update({'requests': requests_lote})
+            logger.info(f"{len(requests_lote)} hojas limpiadas en una sola solicitud")
+            return no_encontradas
+        except Exception as e:
+            self.invalidar_ids_hojas()
+            logger.error(f"Error al limpiar hojas en lote {nombres_hojas}: {e}")
+            raise
+    
     def agregar_fila(self, nombre_hoja: str, valores: List[Any], usar_target: bool = True):
         """
         Agrega una fila a una hoja.
@@ -303,6 +516,7 @@ class SheetsService:
             logger.error(f"Error al agregar fila a {nombre_hoja}: {e}")
             raise
     
+    @_reintentar_por_cuota
     def agregar_filas(self, nombre_hoja: str, filas: List[List[Any]], usar_target: bool = True):
         """
         Agrega múltiples filas a una hoja.
@@ -328,6 +542,80 @@ class SheetsService:
             logger.error(f"Error al agregar filas a {nombre_hoja}: {e}")
             raise
     
+    @_reintentar_por_cuota
+    def agregar_filas_lote(self, filas_por_hoja: Dict[str, List[List[Any]]], usar_target: bool = True):
+        """
+        Agrega filas a varias hojas con una sola llamada spreadsheets.batchUpdate.
+        
+        Cada hoja recibe un AppendCellsRequest, que agrega las filas después de la
+        última fila con datos (igual que append_rows) y expande la hoja si hace falta.
+        
+        Args:
+            filas_por_hoja: Diccionario nombre_hoja -> lista de filas
+            usar_target: Si es True, escribe en la hoja destino; si es False, en la fuente
+        """
+        filas_por_hoja = {hoja: filas for hoja, filas in filas_por_hoja.items() if filas}
+        if not filas_por_hoja:
+            return
+        
+        try:
+            spreadsheet = self.get_target_spreadsheet() if usar_target else self.get_source_spreadsheet()
+            ids_hojas = self._ids_hojas(spreadsheet, filas_por_hoja)
+            
+            requests_lote = []
+            for nombre_hoja, filas in filas_por_hoja.items():
+                if nombre_hoja not in ids_hojas:
+                    raise gspread.exceptions.WorksheetNotFound(nombre_hoja)
+                
+                # Los valores sanitizados son strings; las celdas vacías se omiten
+                # para que queden en blanco como con valueInputOption=RAW
+                filas_celdas = [
+                    {'values': [
+                        {'userEnteredValue': {'stringValue': valor}} if valor else {}
+                        for valor in map(sanitizar_valor_hoja, fila)
+                    ]}
+                    for fila in filas
+                ]
+                requests_lote.append({
+                    'appendCells': {
+                        'sheetId': ids_hojas[nombre_hoja],
+                        'rows': filas_celdas,
+                        'fields': 'userEnteredValue',
+                    }
+                })
+            
+            spreadsheet.batch_update({'requests': requests_lote})
+            logger.info(
+                f"Agregadas {sum(map(len, filas_por_hoja.values()))} filas "
+                f"a {len(filas_por_hoja)} hojas en una sola solicitud"
+            )
+        except Exception as e:
+            self.invalidar_ids_hojas()
+            logger.error(f"Error al agregar filas en lote a {list(filas_por_hoja)}: {e}")
+            raise
+    
+    def batch_get(self, rangos: List[str], usar_target: bool = True) -> List[List[List[Any]]]:
+        """
+        Lee varios rangos A1 con una sola llamada spreadsheets.values.batchGet.
+        
+        Args:
+            rangos: Rangos en notación A1 (ej: ["'Configuracion'!A2:B", "'2025-2'!A1:Q1"])
+            usar_target: Si es True, lee de la hoja destino; si es False, de la fuente
+            
+        Returns:
+            Valores de cada rango, en el mismo orden que `rangos` (lista vacía si
+            el rango no tiene datos)
+        """
+        if not rangos:
+            return []
+        try:
+            spreadsheet = self.get_target_spreadsheet() if usar_target else self.get_source_spreadsheet()
+            respuesta = spreadsheet.values_batch_get(rangos)
+            return [rango.get('values', []) for rango in respuesta.get('valueRanges', [])]
+        except Exception as e:
+            logger.error(f"Error al leer rangos en lote {rangos}: {e}")
+            raise
+    
     def obtener_todos_los_valores(self, nombre_hoja: str) -> List[List[Any]]:
         """
         Obtiene todos los valores de una hoja.
@@ -906,6 +1194,142 @@ class SheetsService:
                 page_size=1000
             )
     
+    @_reintentar_si_transitorio
+    def _leer_rango_valores(self, spreadsheet_id: str, range_name: str) -> List[List[Any]]:
+        """
+        Lee un rango A1 con values().get() de la API.
+        
+        Solo reintenta errores transitorios (429, 5xx, timeouts): un rango mal
+        formado o sin permisos falla de inmediato.
+        
+        Args:
+            spreadsheet_id: ID del spreadsheet
+            range_name: Rango en notación A1 (ej: "'2025-2'!D2:D501")
+        
+        Returns:
+            Lista de filas con los valores del rango
+        """
+        result = self.sheets_service_api.spreadsheets().values().get(
+            spreadsheetId=spreadsheet_id,
+            range=range_name,
+            valueRenderOption='UNFORMATTED_VALUE'
+        ).execute()
+        return result.get('values', [])
+    
+    def iter_cedulas_batch(
+        self,
+        sheet_url: Optional[str] = None,
+        worksheet_name: str = None,
+        column: str = 'D',
+        chunk: int = 500,
+        max_filas: Optional[int] = None
+    ) -> Iterator[List[str]]:
+        """
+        Lee cédulas por bloques de filas y las entrega a medida que llegan.
+        
+        Hace una llamada values().get() por bloque (D2:D501, D502:D1001, ...) en
+        lugar de leer toda la columna de una vez, para poder empezar a procesar
+        el primer bloque mientras se leen los siguientes. Los bloques vacíos no
+        detienen la lectura, que sigue hasta la última fila de la hoja. Si el
+        primer bloque no se puede leer, usa get_cedulas_paginated como fallback.
+        
+        Args:
+            sheet_url: URL de la hoja de cálculo. Si es None, usa la hoja fuente.
+            worksheet_name: Nombre de la hoja de trabajo. Si es None, usa la primera hoja.
+            column: Columna de la cual extraer las cédulas (default: 'D').
+            chunk: Número de filas por bloque (default: 500).
+            max_filas: Máximo de filas a leer. Si es None, usa SHEETS_BATCH_SIZE.
+        
+        Yields:
+            Listas de cédulas limpias y válidas, sin repetir cédulas de bloques anteriores.
+        """
+        if not HAS_GOOGLEAPICLIENT or self.sheets_service_api is None:
+            raise ImportError(
+                "google-api-python-client no está instalado. "
+                "Instala con: pip install google-api-python-client"
+            )
+        
+        if sheet_url:
+            spreadsheet_id = self._extract_sheet_id_from_url(sheet_url)
+        else:
+            spreadsheet_id = GOOGLE_SHEETS_SOURCE_ID or GOOGLE_SHEETS_SPREADSHEET_ID
+            if not spreadsheet_id:
+                raise ValueError("No se configuró GOOGLE_SHEETS_SOURCE_ID")
+        
+        spreadsheet = self.client.open_by_key(spreadsheet_id)
+        if worksheet_name:
+            hoja = spreadsheet.worksheet(worksheet_name)
+        else:
+            hoja = spreadsheet.sheet1
+            worksheet_name = hoja.title
+            logger.info(f"Usando primera hoja: {worksheet_name}")
+        
+        if max_filas is None:
+            max_filas = self.sheets_batch_size
+        
+        vistas = set()
+        invalidas = 0
+        duplicadas = 0
+        # Fila 1 es el encabezado. Se lee hasta la última fila de la hoja (con
+        # el tope de max_filas): un bloque vacío puede ser solo un tramo de
+        # filas en blanco y no indica que no haya más datos
+        fila_inicio = 2
+        ultima_fila = min(max_filas + 1, hoja.row_count)
+        while fila_inicio <= ultima_fila:
+            fila_fin = min(fila_inicio + chunk - 1, ultima_fila)
+            range_name = f"'{worksheet_name}'!{column}{fila_inicio}:{column}{fila_fin}"
+            logger.debug(f"Leyendo rango: {range_name}")
+            
+            try:
+                values = self._leer_rango_valores(spreadsheet_id, range_name)
+            except Exception as e:
+                if fila_inicio > 2:
+                    raise
+                # Mismo fallback que get_cedulas_batch si ni el primer bloque se puede leer
+                logger.error(f"Error leyendo {range_name}: {e}", exc_info=True)
+                logger.warning("Intentando lectura paginada como fallback...")
+                cedulas = self.get_cedulas_paginated(
+                    sheet_url=sheet_url,
+                    worksheet_name=worksheet_name,
+                    column=column,
+                    page_size=1000
+                )
+                if cedulas:
+                    yield cedulas
+                return
+            
+            if not values:
+                logger.debug(f"Rango {range_name} vacío, se continúa hasta la fila {ultima_fila}")
+                fila_inicio = fila_fin + 1
+                continue
+            
+            bloque = []
+            for row in values:
+                if not row:
+                    continue
+                cedula_limpia = limpiar_cedula(str(row[0]).strip())
+                if not cedula_limpia:
+                    continue
+                if cedula_limpia in vistas:
+                    duplicadas += 1
+                    continue
+                if not validar_cedula(cedula_limpia):
+                    invalidas += 1
+                    continue
+                vistas.add(cedula_limpia)
+                bloque.append(cedula_limpia)
+            
+            if bloque:
+                yield bloque
+            fila_inicio = fila_fin + 1
+        
+        logger.info(f"Leídas {len(vistas)} cédulas únicas y válidas desde la columna {column}")
+        if invalidas:
+            logger.warning(f"⚠️ {invalidas} cédulas inválidas descartadas en la columna {column}")
+        if duplicadas:
+            total = len(vistas) + duplicadas
+            logger.info(f"{duplicadas} cédulas repetidas omitidas ({duplicadas / total:.1%} de las filas válidas)")
+    
     @retry(
         wait=wait_exponential(multiplier=2, min=4, max=60),
         stop=stop_after_attempt(3),  # Menos intentos para paginación
@@ -1064,3 +1488,258 @@ class SheetsService:
             logger.error(f"Error en get_cedulas_paginated: {e}", exc_info=True)
             raise
 
+
+# Máximo de celdas acumuladas antes de vaciar el buffer de escritura
+MAX_CELDAS_BUFFER = 50000
+# Segundos máximos que una fila puede esperar en el buffer antes de escribirse
+INTERVALO_FLUSH_BUFFER = 30.0
+# Escrituras fallidas seguidas tras las que el buffer descarta las filas pendientes
+MAX_INTENTOS_BUFFER = 3
+
+
+class SheetsWriteBuffer:
+    """
+    Acumula filas por hoja y las escribe con una sola solicitud a Sheets.
+    
+    Expone agregar_filas() con la misma firma que SheetsService, de modo que puede
+    pasarse en su lugar a las funciones que escriben filas. Se vacía al salir del
+    bloque with, cuando se superan max_celdas celdas acumuladas y, mientras el
+    bloque with está activo, desde un hilo temporizador cuando la fila más antigua
+    lleva intervalo segundos esperando (aunque no lleguen filas nuevas).
+    
+    Es seguro usarlo desde varios hilos a la vez: la escritura se hace fuera del
+    lock del buffer, así que los demás hilos siguen acumulando filas mientras
+    tanto. Si una escritura falla, las filas vuelven al buffer y se reintentan en
+    el siguiente vaciado, hasta max_intentos escrituras fallidas seguidas; después
+    se descartan. Las filas de hojas que no existen se descartan de inmediato
+    (reintentarlas no las haría aparecer) y el resto del lote se escribe igual.
+    
+    agregar_lote() acepta además un callback que se llama cuando sus filas ya se
+    escribieron (con None) o cuando se descartaron (con el error), para que quien
+    las agrega no dé por guardado nada que siga en el buffer.
+    
+    Ejemplo:
+        with SheetsWriteBuffer(sheets_service) as buffer:
+            buffer.agregar_filas("2025-2", filas)
+    """
+    
+    def __init__(
+        self,
+        sheets_service: SheetsService,
+        max_celdas: int = MAX_CELDAS_BUFFER,
+        intervalo: float = INTERVALO_FLUSH_BUFFER,
+        max_intentos: int = MAX_INTENTOS_BUFFER
+    ):
+        self.sheets_service = sheets_service
+        self.max_celdas = max_celdas
+        self.intervalo = intervalo
+        self.max_intentos = max(1, max_intentos)
+        self._intentos_fallidos = 0
+        self._filas_por_hoja: Dict[str, List[List[Any]]] = {}
+        self._celdas = 0
+        self._primera_fila: Optional[float] = None
+        # Callbacks de agregar_lote pendientes, con las hojas de su lote
+        self._avisos: List[Tuple[Callable[[Optional[Exception]], None], Tuple[str, ...]]] = []
+        # _lock protege el estado del buffer; _lock_escritura serializa las
+        # escrituras para que las filas lleguen a Sheets en orden
+        self._lock = threading.Lock()
+        self._lock_escritura = threading.Lock()
+        self._detener = threading.Event()
+        self._temporizador: Optional[threading.Thread] = None
+    
+    def agregar_filas(self, nombre_hoja: str, filas: List[List[Any]]):
+        """
+        Acumula filas para una hoja; vacía el buffer si se supera el límite de
+        celdas.
+        
+        Args:
+            nombre_hoja: Nombre de la hoja
+            filas: Lista de listas con valores
+        """
+        self.agregar_lote({nombre_hoja: filas})
+    
+    def agregar_lote(
+        self,
+        filas_por_hoja: Dict[str, List[List[Any]]],
+        al_terminar: Optional[Callable[[Optional[Exception]], None]] = None
+    ):
+        """
+        Acumula filas para varias hojas como un solo lote; vacía el buffer si se
+        supera el límite de celdas.
+        
+        Args:
+            filas_por_hoja: Diccionario nombre_hoja -> lista de filas
+            al_terminar: Se llama con None cuando todas las filas del lote están
+                escritas, o con el error si alguna se descartó. Puede llamarse
+                desde otro hilo (el que vacía el buffer)
+        """
+        filas_por_hoja = {hoja: filas for hoja, filas in filas_por_hoja.items() if filas}
+        if not filas_por_hoja:
+            if al_terminar is not None:
+                self._avisar([(al_terminar, ())], {})
+            return
+        with self._lock:
+            if self._primera_fila is None:
+                self._primera_fila = time.monotonic()
+            for nombre_hoja, filas in filas_por_hoja.items():
+                self._filas_por_hoja.setdefault(nombre_hoja, []).extend(filas)
+                self._celdas += sum(map(len, filas))
+            if al_terminar is not None:
+                self._avisos.append((al_terminar, tuple(filas_por_hoja)))
+            lleno = self._celdas >= self.max_celdas
+        if lleno:
+            self._vaciar_automatico()
+    
+    def flush(self):
+        """
+        Escribe todas las filas acumuladas y vacía el buffer.
+        
+        Raises:
+            Exception: El error de agregar_filas_lote; las filas no escritas
+                quedan de nuevo en el buffer (o se descartan si ya se agotaron
+                max_intentos)
+        """
+        with self._lock_escritura:
+            self._escribir_pendientes()
+    
+    def _escribir_pendientes(self):
+        """Saca las filas del buffer bajo el lock y las escribe fuera de él (requiere _lock_escritura)."""
+        with self._lock:
+            if not self._filas_por_hoja:
+                return
+            filas_por_hoja = self._filas_por_hoja
+            celdas = self._celdas
+            primera_fila = self._primera_fila
+            avisos = self._avisos
+            self._filas_por_hoja = {}
+            self._celdas = 0
+            self._primera_fila = None
+            self._avisos = []
+        
+        # Hojas inexistentes cuyas filas se descartaron -> error
+        descartadas: Dict[str, Exception] = {}
+        while filas_por_hoja:
+            try:
+                self.sheets_service.agregar_filas_lote(filas_por_hoja)
+                self._intentos_fallidos = 0
+                break
+            except gspread.exceptions.WorksheetNotFound as e:
+                nombre_hoja = e.args[0] if e.args else None
+                if nombre_hoja not in filas_por_hoja:
+                    error = e
+                else:
+                    filas = filas_por_hoja.pop(nombre_hoja)
+                    celdas -= sum(map(len, filas))
+                    descartadas[nombre_hoja] = e
+                    logger.error(
+                        "La hoja '%s' no existe: se descartan %d filas del buffer",
+                        nombre_hoja, len(filas)
+                    )
+                    continue
+            except Exception as e:
+                error = e
+            
+            self._intentos_fallidos += 1
+            if self._intentos_fallidos >= self.max_intentos:
+                self._intentos_fallidos = 0
+                logger.error(
+                    "Se descartan %d filas del buffer para %s tras %d escrituras fallidas",
+                    sum(map(len, filas_por_hoja.values())), list(filas_por_hoja), self.max_intentos
+                )
+                self._avisar(avisos, descartadas, error)
+                raise error
+            
+            # Devolver las filas al buffer, delante de las que llegaron mientras tanto
+            with self._lock:
+                for nombre_hoja, filas in self._filas_por_hoja.items():
+                    filas_por_hoja.setdefault(nombre_hoja, []).extend(filas)
+                self._filas_por_hoja = filas_por_hoja
+                self._celdas += celdas
+                self._primera_fila = primera_fila
+                self._avisos = avisos + self._avisos
+            raise error
+        
+        self._avisar(avisos, descartadas)
+    
+    def _descartar_pendientes(self, error: Exception):
+        """Vacía el buffer sin escribir y avisa del error a los lotes pendientes."""
+        with self._lock:
+            filas_por_hoja = self._filas_por_hoja
+            avisos = self._avisos
+            self._filas_por_hoja = {}
+            self._celdas = 0
+            self._primera_fila = None
+            self._avisos = []
+        if filas_por_hoja:
+            logger.error(
+                "Se descartan %d filas no escritas del buffer para %s",
+                sum(map(len, filas_por_hoja.values())), list(filas_por_hoja)
+            )
+        self._avisar(avisos, {}, error)
+    
+    @staticmethod
+    def _avisar(
+        avisos: List[Tuple[Callable[[Optional[Exception]], None], Tuple[str, ...]]],
+        descartadas: Dict[str, Exception],
+        error: Optional[Exception] = None
+    ):
+        """Llama los callbacks de agregar_lote; un callback que falla no afecta a los demás."""
+        for al_terminar, hojas in avisos:
+            error_lote = next((descartadas[hoja] for hoja in hojas if hoja in descartadas), error)
+            try:
+                al_terminar(error_lote)
+            except Exception as e:
+                logger.error(f"Error en callback de escritura del buffer: {e}", exc_info=True)
+    
+    def _vaciar_automatico(self):
+        """Vaciado por tamaño o tiempo: un error se registra y las filas esperan al siguiente (ver max_intentos)."""
+        # Si ya hay una escritura en curso no se espera: las filas nuevas quedan
+        # para el siguiente vaciado
+        if not self._lock_escritura.acquire(blocking=False):
+            return
+        try:
+            self._escribir_pendientes()
+        except Exception as e:
+            logger.error(f"Error escribiendo filas del buffer: {e}")
+        finally:
+            self._lock_escritura.release()
+    
+    def _temporizar(self):
+        """Hilo temporizador: vacía el buffer cuando la fila más antigua cumple intervalo segundos."""
+        espera = self.intervalo
+        while not self._detener.wait(espera):
+            with self._lock:
+                primera_fila = self._primera_fila
+            if primera_fila is not None:
+                restante = primera_fila + self.intervalo - time.monotonic()
+                if restante > 0:
+                    espera = restante
+                    continue
+                self._vaciar_automatico()
+            espera = self.intervalo
+    
+    def __enter__(self):
+        if self.intervalo and self.intervalo > 0:
+            self._detener.clear()
+            self._temporizador = threading.Thread(
+                target=self._temporizar, name='sheets_write_buffer', daemon=True
+            )
+            self._temporizador.start()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if self._temporizador is not None:
+            self._detener.set()
+            self._temporizador.join()
+            self._temporizador = None
+        
+        try:
+            self.flush()
+        except Exception as e:
+            # El buffer ya no se volverá a vaciar: las filas que quedan se pierden
+            self._descartar_pendientes(e)
+            if exc_type is None:
+                raise
+            # No ocultar la excepción original si falla la escritura pendiente
+            logger.error(f"Error escribiendo filas pendientes del buffer: {e}")
+        return False
@@ -9,10 +9,14 @@ MAPEO DE DEPARTAMENTOS A ESCUELAS (implementado en helpers.determinar_escuela_de
 """
 
 import re
+import json
+import os
 import logging
 import time
 import random
 import traceback
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -22,6 +26,12 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 
+try:
+    import requests_cache
+    HAS_REQUESTS_CACHE = True
+except ImportError:
+    HAS_REQUESTS_CACHE = False
+
 from scraper.config.settings import (
     UNIVALLE_ENDPOINT,
     UNIVALLE_PERIODOS_URL,
@@ -30,6 +40,10 @@ from scraper.config.settings import (
     REQUEST_TIMEOUT,
     REQUEST_MAX_RETRIES,
     REQUEST_RETRY_DELAY,
+    PERIODOS_CACHE_FILE,
+    PERIODOS_CACHE_TTL,
+    HTTP_CACHE_NAME,
+    HTTP_CACHE_TTL,
 )
 from scraper.utils.helpers import (
     validar_cedula,
@@ -44,9 +58,49 @@ from scraper.utils.helpers import (
     formatear_nombre_completo,
     determinar_escuela_desde_departamento,
 )
+from scraper.utils.ratelimit import TokenBucket
 
 logger = logging.getLogger(__name__)
 
+# Conexiones keep-alive por host en el pool de la sesión (cubre varios workers)
+HTTP_POOL_MAXSIZE = 32
+
+def _leer_cache_periodos() -> Optional[List[Dict[str, Any]]]:
+    """Lee la lista de períodos de la caché en disco si existe y no ha expirado."""
+    if PERIODOS_CACHE_TTL <= 0:
+        return None
+    try:
+        if time.time() - os.path.getmtime(PERIODOS_CACHE_FILE) > PERIODOS_CACHE_TTL:
+            return None
+        with open(PERIODOS_CACHE_FILE, 'r', encoding='utf-8') as f:
+            periodos = json.load(f)
+    except (OSError, ValueError):
+        return None
+    logger.info(f"Períodos leídos desde caché en disco: {PERIODOS_CACHE_FILE}")
+    return periodos
+
+
+def _guardar_cache_periodos(periodos: List[Dict[str, Any]]):
+    """Guarda la lista de períodos en la caché en disco (los errores se ignoran)."""
+    if PERIODOS_CACHE_TTL <= 0 or not periodos:
+        return
+    try:
+        with open(PERIODOS_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(periodos, f, ensure_ascii=False)
+    except OSError as e:
+        logger.warning(f"No se pudo guardar caché de períodos '{PERIODOS_CACHE_FILE}': {e}")
+
+
+# Import opcional de lxml (parser en C, mucho más rápido que html.parser)
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+# Parser usado por BeautifulSoup: lxml si está disponible, html.parser como fallback
+BS4_PARSER = 'lxml' if HAS_LXML else 'html.parser'
+
 
 # Keywords para clasificación pregrado/postgrado
 KEYWORDS_POSTGRADO = [
@@ -62,6 +116,129 @@ KEYWORDS_PREGRADO = [
     'PROFESIONAL', 'CARRERA', 'PREGRADO',
 ]
 
+# Reglas para ubicar columnas de asignaturas por header:
+# (campo, palabras requeridas, palabras excluidas, solo si el campo aún no tiene columna)
+# El orden importa: gana la primera regla que cumple para cada header.
+_REGLAS_COLUMNAS_ASIGNATURA = (
+    ('horas', ('HORAS', 'SEMESTRE'), (), False),  # HORAS SEMESTRE (prioridad alta)
+    ('horas', ('HORAS',), (), True),  # HORAS (fallback si no hay HORAS SEMESTRE)
+    ('codigo', ('CODIGO',), ('ESTUDIANTE',), False),
+    ('porc', ('PORC',), (), False),  # PORC (para evitarla)
+    ('grupo', ('GRUPO',), (), False),
+    ('tipo', ('TIPO',), ('COMISION',), False),
+    ('nombre', ('NOMBRE', 'ASIGNATURA'), (), False),
+)
+# _procesar_asignaturas_con_seccion no busca PORC: un header con PORC y, p. ej.,
+# GRUPO se asigna a grupo
+_REGLAS_COLUMNAS_ASIGNATURA_SECCION = tuple(
+    regla for regla in _REGLAS_COLUMNAS_ASIGNATURA if regla[0] != 'porc'
+)
+_CAMPOS_COLUMNAS_ASIGNATURA = ('horas', 'codigo', 'porc', 'grupo', 'tipo', 'nombre')
+
+# Patrones regex precompilados (se compilan una sola vez al importar el módulo)
+_RE_CELDA = re.compile(r'<(t[dh])([^>]*)>([\s\S]*?)</\1>', re.IGNORECASE)
+_RE_COLSPAN = re.compile(r'colspan=["\']?(\d+)["\']?', re.IGNORECASE)
+_RE_ESPACIOS = re.compile(r'\s+')
+_RE_H1_ERROR = re.compile(r'<h1[^>]*>error')  # Se aplica sobre HTML ya en minúsculas
+
+# Métodos ligados de patrones usados por celda/fila (evitan la búsqueda en la
+# caché de re y la resolución de atributos en los loops de filas)
+_es_numero = re.compile(r'^\d+\.?\d*$').match
+_es_numero_o_porcentaje = re.compile(r'^\d+\.?\d*%?$').match
+_es_codigo_asignatura = re.compile(r'^[A-Z0-9]{5,8}C?$').match
+_es_decimal = re.compile(r'^(\d+)\.(\d+)$').match
+_es_solo_digitos = re.compile(r'^\d+$').match
+_es_codigo_postgrado = re.compile(r'^[7-9]\d{2,}$').match
+_es_codigo_pregrado = re.compile(r'^[1-5]\d{3,}$').match
+_quitar_porcentaje_final = re.compile(r'\s*\d+%$').sub
+_quitar_no_numericos = re.compile(r'[^\d.,]').sub
+_quitar_no_numericos_sin_coma = re.compile(r'[^\d.]').sub
+_quitar_letras = re.compile(r'[A-Za-z]').sub
+
+# Palabras sin las cuales una tabla no puede ser título de sección
+# (ver _detectar_seccion_titulo)
+_RE_MARCADORES_SECCION = re.compile(
+    r'PREGRADO|POSGRADO|POSTGRADO|TESIS|ACTIVIDADES|ARTISTICAS|COMISION'
+)
+
+_RE_FRAME_SRC = re.compile(r'name=["\']mainFrame_["\'][^>]*src=["\']([^"\']+)["\']', re.IGNORECASE)
+_RE_TABLA_ANIDADA = re.compile(
+    r'<tbody[^>]*>[\s\S]*?<tr[^>]*>[\s\S]*?<td[^>]*>[\s\S]*?(<table[^>]*>[\s\S]*?</table>)',
+    re.IGNORECASE
+)
+
+# Patrón en bytes: se aplica sobre response.content sin decodificar la página completa
+_RE_OPTION_PERIODO = re.compile(
+    rb'<option[^>]*value=["\']?(\d+)["\']?[^>]*>([\s\S]*?)</option>',
+    re.IGNORECASE
+)
+
+# Patrones de información personal en texto plano (fallback)
+# Cada patrón cubre la variante con y sin tilde, así basta una sola búsqueda por campo
+_PATRONES_TEXTO_PLANO = (
+    ('VINCULACION', 'vinculacion',
+     re.compile(r'VINCULACI[OÓ]N\s*[=:]\s*([^\s,<>&"\']+)', re.IGNORECASE)),
+    ('CATEGORIA', 'categoria',
+     re.compile(r'CATEGOR[IÍ]A\s*[=:]\s*([^\s,<>&"\']+)', re.IGNORECASE)),
+    ('DEDICACION', 'dedicacion',
+     re.compile(r'DEDICACI[OÓ]N\s*[=:]\s*([^\s,<>&"\']+)', re.IGNORECASE)),
+    ('NIVEL ALCANZADO', 'nivel_alcanzado',
+     re.compile(r'NIVEL\s+ALCANZADO\s*[=:]\s*([^\s,<>&"\']+)', re.IGNORECASE)),
+    ('CARGO', 'cargo',
+     re.compile(r'CARGO\s*[=:]\s*([^\s,<>&"\']+)', re.IGNORECASE)),
+)
+
+
+def _es_respuesta_cacheable(response: requests.Response) -> bool:
+    """
+    filter_fn de la caché HTTP: solo guarda páginas que pasan la validación
+    de contenido de scrape_teacher_data.
+    
+    El portal responde 200 también con páginas de error y de sesión expirada
+    (login); guardarlas haría que las siguientes ejecuciones las reutilizaran.
+    """
+    if response.status_code != 200:
+        return False
+    html_lower = response.content.decode('windows-1252', errors='replace').lower()
+    if len(html_lower) < 100:
+        return False
+    if '<title>error</title>' in html_lower or _RE_H1_ERROR.search(html_lower):
+        return False
+    # Formulario de período sin tablas de datos: página de login
+    primera_tabla = html_lower.find('<table')
+    sin_tablas = primera_tabla < 0 or html_lower.find('<table', primera_tabla + 1) < 0
+    return not ('<form' in html_lower and 'periodo academico' in html_lower and sin_tablas)
+
+
+def _quitar_tags(texto: str) -> str:
+    """
+    Elimina las etiquetas HTML de un texto con un recorrido lineal.
+    
+    Equivale a re.sub(r'<[^>]+>', '', texto) pero evita el motor de regex
+    y la creación de un Match por etiqueta en celdas cortas.
+    """
+    if '<' not in texto:
+        return texto
+    
+    partes = []
+    pos = 0
+    while True:
+        inicio = texto.find('<', pos)
+        if inicio < 0:
+            break
+        fin = texto.find('>', inicio + 1)
+        if fin < 0:
+            break
+        if fin == inicio + 1:
+            # '<>' no es una etiqueta: conservar el '<' y seguir buscando
+            partes.append(texto[pos:inicio + 1])
+            pos = inicio + 1
+            continue
+        partes.append(texto[pos:inicio])
+        pos = fin + 1
+    partes.append(texto[pos:])
+    return ''.join(partes)
+
 
 @dataclass
 class InformacionPersonal:
@@ -125,9 +302,60 @@ class DatosDocente:
 class UnivalleScraper:
     """Scraper para el portal Univalle."""
     
-    def __init__(self):
-        """Inicializa el scraper con configuración de sesión."""
-        self.session = requests.Session()
+    def __init__(self, usar_cache: bool = True, max_requests_por_segundo: float = 0.0):
+        """
+        Inicializa el scraper con configuración de sesión.
+        
+        Args:
+            usar_cache: Guardar en disco las respuestas del portal para no
+                repetir GETs al re-ejecutar sobre las mismas cédulas. Solo tiene
+                efecto si se activa la caché con HTTP_CACHE_TTL > 0 (desactivada
+                por defecto) y requests_cache está instalado
+            max_requests_por_segundo: Máximo de GETs por segundo al portal entre
+                todos los hilos (0 = sin límite)
+        """
+        self.usar_cache = usar_cache and HAS_REQUESTS_CACHE and HTTP_CACHE_TTL > 0
+        self.respuestas_desde_cache = 0
+        self._lock_cache = threading.Lock()
+        
+        # Tope de requests al portal, compartido por todos los hilos y
+        # sin ráfagas (los hilos de procesar_docente_multi también lo respetan)
+        self._limitador = TokenBucket(rate=max_requests_por_segundo, burst=1)
+        
+        # requests.Session no es segura entre hilos: cada hilo trabajador
+        # obtiene la suya (con su propio pool keep-alive) vía self.session
+        self._local = threading.local()
+        
+        # Períodos disponibles: no cambian durante una ejecución, se leen una vez
+        self._periodos: Optional[List[Dict[str, Any]]] = None
+        self._lock_periodos = threading.Lock()
+        
+        # Pool de procesar_docente_multi (se crea en el primer uso)
+        self._pool_periodos: Optional[ThreadPoolExecutor] = None
+        
+        # Configurar cookies si están disponibles
+        self.cookies = {}
+        if COOKIE_PHPSESSID:
+            self.cookies['PHPSESSID'] = COOKIE_PHPSESSID
+        if COOKIE_ASIGACAD:
+            self.cookies['asigacad'] = COOKIE_ASIGACAD
+    
+    def _crear_sesion(self) -> requests.Session:
+        """Crea una sesión HTTP con reintentos, pool de conexiones y headers."""
+        if self.usar_cache:
+            # SQLite admite conexiones desde varios hilos; solo se guardan 200 OK
+            # con contenido válido (el portal también devuelve errores con 200)
+            os.makedirs(os.path.dirname(HTTP_CACHE_NAME) or '.', exist_ok=True)
+            session = requests_cache.CachedSession(
+                cache_name=HTTP_CACHE_NAME,
+                backend='sqlite',
+                expire_after=HTTP_CACHE_TTL,
+                allowable_codes=(200,),
+                allowable_methods=('GET',),
+                filter_fn=_es_respuesta_cacheable
+            )
+        else:
+            session = requests.Session()
         
         # Configurar retry strategy
         retry_strategy = Retry(
@@ -136,12 +364,17 @@ class UnivalleScraper:
             status_forcelist=[429, 500, 502, 503, 504],
             allowed_methods=["GET"]
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        # Pool amplio para reutilizar conexiones keep-alive
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=HTTP_POOL_MAXSIZE,
+            pool_maxsize=HTTP_POOL_MAXSIZE
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
         
         # Configurar headers por defecto
-        self.session.headers.update({
+        session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'es-ES,es;q=0.9',
@@ -149,13 +382,29 @@ class UnivalleScraper:
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         })
-        
-        # Configurar cookies si están disponibles
-        self.cookies = {}
-        if COOKIE_PHPSESSID:
-            self.cookies['PHPSESSID'] = COOKIE_PHPSESSID
-        if COOKIE_ASIGACAD:
-            self.cookies['asigacad'] = COOKIE_ASIGACAD
+        return session
+    
+    def _descartar_de_cache(self, url: str):
+        """Borra de la caché HTTP la respuesta de url (p. ej. si no trajo datos del docente)."""
+        if not self.usar_cache:
+            return
+        try:
+            self.session.cache.delete(urls=[url])
+        except Exception as e:
+            logger.debug("No se pudo borrar %s de la caché HTTP: %s", url, e)
+    
+    @property
+    def session(self) -> requests.Session:
+        """Sesión HTTP del hilo actual (se crea en el primer uso del hilo)."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self._crear_sesion()
+        return session
+    
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """GET con la sesión del hilo actual, respetando max_requests_por_segundo."""
+        self._limitador.acquire()
+        return self.session.get(url, **kwargs)
     
     def construir_url(self, cedula: str, id_periodo: int) -> str:
         """Construye la URL de consulta."""
@@ -184,13 +433,17 @@ class UnivalleScraper:
         logger.info(f"Consultando: {url}")
         
         try:
-            response = self.session.get(
+            response = self._get(
                 url,
                 cookies=self.cookies if self.cookies else None,
                 timeout=REQUEST_TIMEOUT
             )
             response.raise_for_status()
             
+            if getattr(response, 'from_cache', False):
+                with self._lock_cache:
+                    self.respuestas_desde_cache += 1
+            
             # CRÍTICO: El portal Univalle usa Windows-1252 (Latin-1 extendido)
             # No usar UTF-8 porque los bytes se interpretarán incorrectamente
             html_bytes = response.content
@@ -208,11 +461,11 @@ class UnivalleScraper:
             if len(html) < 100:
                 raise ValueError("Respuesta vacía o muy corta del servidor")
             
-            # Manejar framesets
-            if '<frameset' in html.lower() or '<frame' in html.lower():
+            # Manejar framesets ('<frame' también cubre '<frameset')
+            if '<frame' in html.lower():
                 html = self._manejar_frameset(html, url)
             
-            logger.debug(f"HTML obtenido: {len(html)} caracteres")
+            logger.debug("HTML obtenido: %s caracteres", len(html))
             return html
             
         except requests.Timeout:
@@ -229,11 +482,7 @@ class UnivalleScraper:
         """Maneja framesets extrayendo el contenido del frame."""
         logger.debug("Detectado frameset, extrayendo contenido del frame...")
         
-        match = re.search(
-            r'name=["\']mainFrame_["\'][^>]*src=["\']([^"\']+)["\']',
-            html,
-            re.IGNORECASE
-        )
+        match = _RE_FRAME_SRC.search(html)
         
         if match:
             frame_src = match.group(1)
@@ -245,10 +494,10 @@ class UnivalleScraper:
             else:
                 frame_url = frame_src
             
-            logger.debug(f"Obteniendo contenido del frame: {frame_url}")
+            logger.debug("Obteniendo contenido del frame: %s", frame_url)
             
             try:
-                response = self.session.get(
+                response = self._get(
                     frame_url,
                     cookies=self.cookies if self.cookies else None,
                     timeout=REQUEST_TIMEOUT,
@@ -263,18 +512,39 @@ class UnivalleScraper:
         logger.warning("Frameset detectado pero no se encontró frame mainFrame_")
         return html
     
+    def _extraer_bloques(self, html: str, etiqueta: str) -> List[str]:
+        """
+        Extrae los bloques <etiqueta ...>...</etiqueta> del HTML usando str.find.
+        
+        Equivale al patrón no codicioso '<etiqueta[^>]*>[\\s\\S]*?</etiqueta>'
+        pero sin backtracking: cada límite se localiza con una búsqueda en C.
+        """
+        html_lower = html.lower()
+        apertura = f'<{etiqueta}'
+        cierre = f'</{etiqueta}>'
+        bloques = []
+        pos = 0
+        while True:
+            inicio = html_lower.find(apertura, pos)
+            if inicio < 0:
+                break
+            fin = html_lower.find(cierre, inicio)
+            if fin < 0:
+                break
+            fin += len(cierre)
+            bloques.append(html[inicio:fin])
+            pos = fin
+        return bloques
+    
     def extraer_tablas(self, html: str) -> List[str]:
         """Extrae todas las tablas del HTML."""
-        pattern = r'<table[^>]*>[\s\S]*?</table>'
-        matches = re.findall(pattern, html, re.IGNORECASE)
-        logger.debug(f"Encontradas {len(matches)} tablas en el HTML")
+        matches = self._extraer_bloques(html, 'table')
+        logger.debug("Encontradas %s tablas en el HTML", len(matches))
         return matches
     
     def extraer_filas(self, tabla_html: str) -> List[str]:
         """Extrae todas las filas de una tabla."""
-        pattern = r'<tr[^>]*>[\s\S]*?</tr>'
-        matches = re.findall(pattern, tabla_html, re.IGNORECASE)
-        return matches
+        return self._extraer_bloques(tabla_html, 'tr')
     
     def extraer_texto_de_celda(self, celda_html: str) -> str:
         """Extrae texto limpio de una celda."""
@@ -282,7 +552,7 @@ class UnivalleScraper:
         from html import unescape
         
         # Remover tags HTML
-        texto = re.sub(r'<[^>]+>', '', celda_html)
+        texto = _quitar_tags(celda_html)
         
         # Decodificar entidades HTML automáticamente (&aacute; -> á, etc.)
         texto = unescape(texto)
@@ -295,13 +565,12 @@ class UnivalleScraper:
     def extraer_celdas(self, fila_html: str) -> List[str]:
         """Extrae celdas de una fila, manejando colspan correctamente."""
         # Patrón que captura la etiqueta completa (incluyendo atributos) y el contenido
-        pattern = r'<(t[dh])([^>]*)>([\s\S]*?)</\1>'
-        matches = re.findall(pattern, fila_html, re.IGNORECASE)
+        matches = _RE_CELDA.findall(fila_html)
         
         celdas = []
         for tag, attrs, contenido in matches:
             # Buscar colspan en los ATRIBUTOS de la etiqueta (no en el contenido)
-            colspan_match = re.search(r'colspan=["\']?(\d+)["\']?', attrs, re.IGNORECASE)
+            colspan_match = _RE_COLSPAN.search(attrs)
             colspan = int(colspan_match.group(1)) if colspan_match else 1
             
             # Extraer texto del contenido
@@ -325,6 +594,11 @@ class UnivalleScraper:
         """
         texto = self.extraer_texto_de_celda(tabla_html).upper()
         
+        # Prefiltro: una sola pasada multi-patrón; si no aparece ningún marcador
+        # de sección, ninguna de las reglas siguientes puede cumplirse
+        if not _RE_MARCADORES_SECCION.search(texto):
+            return None
+        
         # Verificar si es una tabla pequeña (típicamente los subtítulos tienen poco texto)
         # y NO contiene headers de datos (CODIGO, NOMBRE DE ASIGNATURA, HORAS SEMESTRE, etc.)
         es_tabla_datos = (
@@ -395,7 +669,7 @@ class UnivalleScraper:
         Returns:
             True si la tabla fue procesada exitosamente, False si debe mantenerse el contexto
         """
-        logger.debug(f"Procesando tabla con contexto de sección: {seccion_contexto}")
+        logger.debug("Procesando tabla con contexto de sección: %s", seccion_contexto)
         
         # Buscar tabla anidada (los datos reales suelen estar en una tabla interna)
         tabla_interna = self._buscar_tabla_anidada(tabla_html)
@@ -407,7 +681,7 @@ class UnivalleScraper:
             if filas:
                 headers = self.extraer_celdas(filas[0])
         else:
-            logger.debug(f"No se encontró tabla anidada para {seccion_contexto}, usando tabla original")
+            logger.debug("No se encontró tabla anidada para %s, usando tabla original", seccion_contexto)
         
         # Si la tabla tiene muy pocas filas (solo wrapper/título), no procesarla
         # y mantener el contexto para la siguiente tabla
@@ -437,20 +711,20 @@ class UnivalleScraper:
         
         if seccion_contexto == 'INVESTIGACION':
             logger.info(f"🔵 Procesando sección INVESTIGACION con {len(filas)} filas")
-            logger.debug(f"Headers de investigación: {headers}")
+            logger.debug("Headers de investigación: %s", headers)
             investigacion = self._procesar_investigacion(
                 tabla_html, filas, headers, id_periodo
             )
             logger.info(f"✓ Agregadas {len(investigacion)} actividades de investigación (por contexto)")
             for act in investigacion:
-                logger.debug(f"  Investigación: Nombre='{act.nombre_proyecto if hasattr(act, 'nombre_proyecto') else 'N/A'}', Horas='{act.horas_semestre if hasattr(act, 'horas_semestre') else 'N/A'}', Codigo='{act.codigo if hasattr(act, 'codigo') else 'N/A'}'") 
+                logger.debug("  Investigación: Nombre='%s', Horas='%s', Codigo='%s'", act.nombre_proyecto if hasattr(act, 'nombre_proyecto') else 'N/A', act.horas_semestre if hasattr(act, 'horas_semestre') else 'N/A', act.codigo if hasattr(act, 'codigo') else 'N/A') 
             resultado.actividades_investigacion.extend(investigacion)
             return True
         
         elif seccion_contexto == 'INTELECTUALES':
             actividades = self._procesar_actividades_genericas(filas, headers, id_periodo)
             resultado.actividades_intelectuales.extend(actividades)
-            logger.debug(f"Agregadas {len(actividades)} actividades intelectuales")
+            logger.debug("Agregadas %s actividades intelectuales", len(actividades))
             return True
         
         elif seccion_contexto == 'EXTENSION':
@@ -465,21 +739,21 @@ class UnivalleScraper:
         
         elif seccion_contexto == 'COMPLEMENTARIAS':
             logger.info(f"🔵 Procesando sección COMPLEMENTARIAS con {len(filas)} filas")
-            logger.debug(f"Headers de complementarias: {headers}")
+            logger.debug("Headers de complementarias: %s", headers)
             actividades = self._procesar_actividades_genericas(filas, headers, id_periodo)
             logger.info(f"✓ Agregadas {len(actividades)} actividades complementarias (por contexto)")
             for act in actividades:
-                logger.debug(f"  Complementaria: Categoría='{act.get('CATEGORIA', '')}', Nombre='{act.get('NOMBRE', '')}', Horas='{act.get('HORAS SEMESTRE', '')}'")
+                logger.debug("  Complementaria: Categoría='%s', Nombre='%s', Horas='%s'", act.get('CATEGORIA', ''), act.get('NOMBRE', ''), act.get('HORAS SEMESTRE', ''))
             resultado.actividades_complementarias.extend(actividades)
             return True
         
         elif seccion_contexto == 'COMISION':
             logger.info(f"🔵 Procesando sección COMISION con {len(filas)} filas")
-            logger.debug(f"Headers de comisión: {headers}")
+            logger.debug("Headers de comisión: %s", headers)
             actividades = self._procesar_actividades_genericas(filas, headers, id_periodo)
             logger.info(f"✓ Agregadas {len(actividades)} actividades de COMISION")
             for act in actividades:
-                logger.debug(f"  Comisión: Categoría='{act.get('CATEGORIA', '')}', Descripción='{act.get('DESCRIPCION', '')}', Horas='{act.get('HORAS SEMESTRE', '')}')")
+                logger.debug("  Comisión: Categoría='%s', Descripción='%s', Horas='%s')", act.get('CATEGORIA', ''), act.get('DESCRIPCION', ''), act.get('HORAS SEMESTRE', ''))
             resultado.docente_en_comision.extend(actividades)
             return True
         
@@ -487,25 +761,72 @@ class UnivalleScraper:
             # Procesar asignaturas de pregrado usando la sección detectada
             actividades = self._procesar_asignaturas_con_seccion(filas, headers, id_periodo, 'pregrado')
             resultado.actividades_pregrado.extend(actividades)
-            logger.debug(f"Agregadas {len(actividades)} actividades de PREGRADO")
+            logger.debug("Agregadas %s actividades de PREGRADO", len(actividades))
             return True
         
         elif seccion_contexto == 'POSTGRADO':
             # Procesar asignaturas de postgrado usando la sección detectada
             actividades = self._procesar_asignaturas_con_seccion(filas, headers, id_periodo, 'postgrado')
             resultado.actividades_postgrado.extend(actividades)
-            logger.debug(f"Agregadas {len(actividades)} actividades de POSTGRADO")
+            logger.debug("Agregadas %s actividades de POSTGRADO", len(actividades))
             return True
         
         elif seccion_contexto == 'TESIS':
             # Procesar dirección de tesis
             tesis = self._procesar_tesis(filas, headers, id_periodo)
             resultado.actividades_tesis.extend(tesis)
-            logger.debug(f"Agregadas {len(tesis)} actividades de TESIS")
+            logger.debug("Agregadas %s actividades de TESIS", len(tesis))
             return True
         
         return True  # Por defecto, considerar procesado
     
+    def procesar_docente_multi(
+        self,
+        cedula: str,
+        ids_periodo: List[int],
+        max_workers: int = 4
+    ) -> Dict[int, Any]:
+        """
+        Procesa un docente para varios períodos consultándolos en paralelo.
+        
+        El portal responde un período por request, así que los requests no se
+        pueden fusionar; en su lugar se solapan en un pool de hilos. El pool se
+        crea en la primera llamada y se reutiliza en las siguientes, de modo que
+        sus hilos conservan sus sesiones keep-alive entre docentes.
+        
+        Args:
+            cedula: Número de cédula del docente
+            ids_periodo: IDs de los períodos académicos
+            max_workers: Máximo de requests simultáneos (default: 4; se fija al
+                crear el pool en la primera llamada)
+            
+        Returns:
+            Diccionario id_periodo -> DatosDocente, o la excepción que se produjo
+            al procesar ese período (en el mismo orden de ids_periodo)
+        """
+        resultados: Dict[int, Any] = {}
+        if not ids_periodo:
+            return resultados
+        
+        with self._lock_periodos:
+            if self._pool_periodos is None:
+                self._pool_periodos = ThreadPoolExecutor(
+                    max_workers=max(1, max_workers),
+                    thread_name_prefix='periodos'
+                )
+        
+        futuros = [
+            (id_periodo, self._pool_periodos.submit(self.procesar_docente, cedula, id_periodo))
+            for id_periodo in ids_periodo
+        ]
+        for id_periodo, futuro in futuros:
+            try:
+                resultados[id_periodo] = futuro.result()
+            except Exception as e:
+                resultados[id_periodo] = e
+        
+        return resultados
+    
     def procesar_docente(self, cedula: str, id_periodo: int) -> DatosDocente:
         """
         Procesa un docente completo y retorna todos sus datos.
@@ -544,9 +865,10 @@ class UnivalleScraper:
         seccion_actual = None
         
         for tabla_idx, tabla_html in enumerate(tablas, 1):
-            filas_count = len(self.extraer_filas(tabla_html))
-            logger.debug(f"📋 Tabla {tabla_idx}/{len(tablas)}: {filas_count} filas")
-            logger.debug(f"Procesando tabla {tabla_idx}/{len(tablas)}")
+            # Extraer filas una sola vez por tabla y reutilizarlas más abajo
+            filas = self.extraer_filas(tabla_html)
+            logger.debug("📋 Tabla %s/%s: %s filas", tabla_idx, len(tablas), len(filas))
+            logger.debug("Procesando tabla %s/%s", tabla_idx, len(tablas))
             
             # Primero verificar si es una tabla de título de sección
             seccion_detectada = self._detectar_seccion_titulo(tabla_html)
@@ -563,10 +885,9 @@ class UnivalleScraper:
                 logger.info(f"📌 Detectada sección: {seccion_actual}")
                 continue  # Pasar a la siguiente tabla (que tendrá los datos)
             
-            filas = self.extraer_filas(tabla_html)
             if not filas:
                 if seccion_actual:
-                    logger.debug(f"Tabla sin filas encontrada con contexto '{seccion_actual}' activo")
+                    logger.debug("Tabla sin filas encontrada con contexto '%s' activo", seccion_actual)
                 continue
             
             headers = self.extraer_celdas(filas[0])
@@ -576,17 +897,24 @@ class UnivalleScraper:
             if seccion_actual:
                 # Logging detallado para diagnóstico
                 primera_celda = self.extraer_texto_de_celda(filas[0]) if len(filas) > 0 else ""
-                logger.info(f"📋 Tabla con contexto '{seccion_actual}': {len(filas)} filas, Primera celda: '{primera_celda[:100]}'")
-                logger.debug(f"Intentando procesar tabla con contexto '{seccion_actual}' - {len(filas)} filas, headers: {headers[:3] if len(headers) > 3 else headers}")
+                # '%.100s' trunca al formatear el registro, sin copiar el string antes
+                logger.info(
+                    "📋 Tabla con contexto '%s': %d filas, Primera celda: '%.100s'",
+                    seccion_actual, len(filas), primera_celda
+                )
+                logger.debug(
+                    "Intentando procesar tabla con contexto '%s' - %d filas, headers: %s",
+                    seccion_actual, len(filas), headers[:3]
+                )
                 procesado = self._procesar_tabla_con_contexto(
                     tabla_html, filas, headers, id_periodo, seccion_actual, resultado
                 )
                 # Solo limpiar el contexto si la tabla fue procesada exitosamente
                 if procesado:
-                    logger.debug(f"Contexto '{seccion_actual}' procesado y limpiado")
+                    logger.debug("Contexto '%s' procesado y limpiado", seccion_actual)
                     seccion_actual = None
                 else:
-                    logger.debug(f"Contexto '{seccion_actual}' se mantiene para siguiente tabla")
+                    logger.debug("Contexto '%s' se mantiene para siguiente tabla", seccion_actual)
                 continue
             
             # Identificar y procesar según tipo (sin contexto previo)
@@ -751,15 +1079,15 @@ class UnivalleScraper:
         """
         indice_nombre = -1
         
-        logger.debug(f"  _extraer_nombre: headers={headers}")
-        logger.debug(f"  _extraer_nombre: celdas={celdas}")
+        logger.debug("  _extraer_nombre: headers=%s", headers)
+        logger.debug("  _extraer_nombre: celdas=%s", celdas)
         
         # 1. Buscar exactamente "NOMBRE DE ASIGNATURA" o "NOMBRE ASIGNATURA"
         for j, header in enumerate(headers):
             header_upper = header.upper().strip()
             if "NOMBRE DE ASIGNATURA" in header_upper or "NOMBRE ASIGNATURA" in header_upper:
                 indice_nombre = j
-                logger.debug(f"✓ Columna NOMBRE DE ASIGNATURA encontrada en índice {j}: '{header}'")
+                logger.debug("✓ Columna NOMBRE DE ASIGNATURA encontrada en índice %s: '%s'", j, header)
                 break
         
         # 2. Si no encontró, buscar columna que contenga "NOMBRE" (pero no "CODIGO")
@@ -768,18 +1096,18 @@ class UnivalleScraper:
                 header_upper = header.upper().strip()
                 if "NOMBRE" in header_upper and "CODIGO" not in header_upper:
                     indice_nombre = j
-                    logger.debug(f"✓ Columna NOMBRE encontrada (fallback) en índice {j}: '{header}'")
+                    logger.debug("✓ Columna NOMBRE encontrada (fallback) en índice %s: '%s'", j, header)
                     break
         
         # 3. Extraer valor si se encontró el índice
         if indice_nombre >= 0 and indice_nombre < len(celdas):
             valor = (celdas[indice_nombre] or "").strip()
             # Verificar que no sea un número (para evitar confundir con horas)
-            if valor and not re.match(r'^\d+\.?\d*%?$', valor):
-                logger.debug(f"  → Nombre extraído por índice {indice_nombre}: '{valor}'")
+            if valor and not _es_numero_o_porcentaje(valor):
+                logger.debug("  → Nombre extraído por índice %s: '%s'", indice_nombre, valor)
                 return valor
             else:
-                logger.debug(f"  → Valor descartado (es número o porcentaje): '{valor}'")
+                logger.debug("  → Valor descartado (es número o porcentaje): '%s'", valor)
         
         # 4. Fallback: buscar el texto más largo que parezca un nombre de asignatura
         # (no es código, no es número, no es porcentaje)
@@ -789,20 +1117,20 @@ class UnivalleScraper:
             if not valor:
                 continue
             # Saltar números, porcentajes, códigos cortos
-            if re.match(r'^\d+\.?\d*%?$', valor):
+            if _es_numero_o_porcentaje(valor):
                 continue
             if len(valor) <= 3:  # Códigos muy cortos como "MG", "1", etc.
                 continue
             # Saltar si parece un código (mayúsculas + números, corto)
-            if re.match(r'^[A-Z0-9]{5,8}C?$', valor):
+            if _es_codigo_asignatura(valor):
                 continue
             # Quedarse con el más largo (probablemente el nombre)
             if len(valor) > len(mejor_candidato):
                 mejor_candidato = valor
-                logger.debug(f"  → Candidato encontrado en celda {j}: '{valor}'")
+                logger.debug("  → Candidato encontrado en celda %s: '%s'", j, valor)
         
         if mejor_candidato:
-            logger.debug(f"  → Nombre extraído (fallback texto largo): '{mejor_candidato}'")
+            logger.debug("  → Nombre extraído (fallback texto largo): '%s'", mejor_candidato)
             return mejor_candidato
         
         logger.debug("  → No se encontró nombre de asignatura")
@@ -1328,16 +1656,22 @@ class UnivalleScraper:
         Si no logra extraer el nombre, intenta buscarlo en el HTML plano como último recurso.
         """
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            tablas = soup.find_all('table')
+            soup = BeautifulSoup(html, BS4_PARSER)
+            # Generador perezoso: el loop sale en cuanto encuentra los datos personales
+            # (normalmente en las primeras tablas), sin recorrer todo el documento
+            tablas = (nodo for nodo in soup.descendants if nodo.name == 'table')
             for tabla in tablas:
-                filas = tabla.find_all('tr')
-                if len(filas) < 2:
+                # Detectar si la primera fila tiene los headers relevantes antes de
+                # recorrer todas las filas (las tablas descartadas no se materializan)
+                primera_fila = tabla.find('tr')
+                if primera_fila is None:
                     continue
-                # Detectar si la primera fila tiene los headers relevantes
-                headers_fila1 = [c.get_text(strip=True).upper() for c in filas[0].find_all(['td', 'th'])]
+                headers_fila1 = [c.get_text(strip=True).upper() for c in primera_fila.find_all(['td', 'th'])]
                 if not any(h in headers_fila1 for h in ['CEDULA', 'DOCUMENTO', '1 APELLIDO', '2 APELLIDO', 'NOMBRE', 'UNIDAD ACADEMICA']):
                     continue
+                filas = tabla.find_all('tr')
+                if len(filas) < 2:
+                    continue
                 logger.debug("Tabla de datos personales encontrada con BeautifulSoup")
                 # Procesar fila 2 (valores)
                 fila2 = filas[1]
@@ -1458,12 +1792,12 @@ class UnivalleScraper:
                                 info.escuela = valor
                 # Buscar en filas adicionales (campo=valor)
                 for i in range(4, min(len(filas), 10)):
-                    fila = filas[i]
-                    celdas = fila.find_all(['td', 'th'])
-                    if len(celdas) >= 2:
-                        for j in range(len(celdas) - 1):
-                            campo = celdas[j].get_text(strip=True).upper()
-                            valor = celdas[j + 1].get_text(strip=True)
+                    # Extraer el texto de cada celda una sola vez: cada celda actúa
+                    # como valor de la anterior y como campo de la siguiente
+                    textos = [c.get_text(strip=True) for c in filas[i].find_all(['td', 'th'])]
+                    if len(textos) >= 2:
+                        for campo, valor in zip(textos, textos[1:]):
+                            campo = campo.upper()
                             if not valor:
                                 continue
                             if 'CARGO' in campo and not info.cargo:
@@ -1513,10 +1847,10 @@ class UnivalleScraper:
                     info.escuela = valor
                 elif 'DEPARTAMENTO' in header_upper or 'DPTO' in header_upper:
                     info.departamento = valor
-                    logger.debug(f"DEPARTAMENTO encontrado en fila 2, columna {i}: '{valor}'")
+                    logger.debug("DEPARTAMENTO encontrado en fila 2, columna %s: '%s'", i, valor)
                 elif 'CARGO' in header_upper:
                     info.cargo = valor
-                    logger.debug(f"CARGO encontrado en fila 2, columna {i}: '{valor}'")
+                    logger.debug("CARGO encontrado en fila 2, columna %s: '%s'", i, valor)
         
         # Si DEPARTAMENTO no se encontró por header, intentar por posición (columna 4 según análisis)
         if not info.departamento and len(valores_fila2) > 4:
@@ -1524,7 +1858,7 @@ class UnivalleScraper:
             valor_posicion_4 = valores_fila2[4].strip() if valores_fila2[4] else ''
             if valor_posicion_4 and 'DEPARTAMENTO' in valor_posicion_4.upper():
                 info.departamento = valor_posicion_4
-                logger.debug(f"DEPARTAMENTO encontrado por posición (columna 4): '{valor_posicion_4}'")
+                logger.debug("DEPARTAMENTO encontrado por posición (columna 4): '%s'", valor_posicion_4)
         
         # Mapear valores de fila 4 usando headers si están disponibles
         if len(filas) > 3:
@@ -1574,6 +1908,40 @@ class UnivalleScraper:
                     elif 'ESCUELA' in celda_upper and not info.escuela:
                         info.escuela = valor_siguiente
     
+    def _indices_columnas_asignatura(
+        self,
+        headers: List[str],
+        reglas: Tuple[Tuple[str, Tuple[str, ...], Tuple[str, ...], bool], ...] = _REGLAS_COLUMNAS_ASIGNATURA
+    ) -> Dict[str, int]:
+        """
+        Mapea cada campo de asignatura al índice de su columna según los headers.
+        
+        Aplica las reglas en orden: la primera regla que cumple asigna el índice
+        del header. Los campos sin columna quedan en -1.
+        
+        Args:
+            headers: Headers de la tabla
+            reglas: Tabla de reglas (_REGLAS_COLUMNAS_ASIGNATURA o
+                _REGLAS_COLUMNAS_ASIGNATURA_SECCION)
+        
+        Returns:
+            Diccionario campo -> índice de columna
+        """
+        indices = dict.fromkeys(_CAMPOS_COLUMNAS_ASIGNATURA, -1)
+        
+        for j, header in enumerate(headers):
+            header_upper = header.upper().strip()
+            for campo, requeridas, excluidas, solo_si_vacio in reglas:
+                if solo_si_vacio and indices[campo] >= 0:
+                    continue
+                if (all(p in header_upper for p in requeridas)
+                        and not any(p in header_upper for p in excluidas)):
+                    indices[campo] = j
+                    break
+        
+        logger.debug("Índices de columnas de asignatura: %s", indices)
+        return indices
+    
     def _procesar_asignaturas(
         self,
         filas: List[str],
@@ -1585,53 +1953,29 @@ class UnivalleScraper:
         postgrado = []
         
         # Identificar índices de columnas ANTES del loop de filas
-        indice_horas = -1
-        indice_codigo = -1
-        indice_porc = -1
-        indice_grupo = -1
-        indice_tipo = -1
-        indice_nombre = -1
+        logger.debug("Headers de tabla de asignaturas: %s", headers)
         
-        logger.debug(f"Headers de tabla de asignaturas: {headers}")
+        indices = self._indices_columnas_asignatura(headers)
+        indice_horas = indices['horas']
+        indice_codigo = indices['codigo']
+        indice_grupo = indices['grupo']
+        indice_tipo = indices['tipo']
+        indice_nombre = indices['nombre']
         
-        for j, header in enumerate(headers):
-            header_upper = header.upper().strip()
-            
-            # Columna de HORAS SEMESTRE (prioridad alta)
-            if 'HORAS' in header_upper and 'SEMESTRE' in header_upper:
-                indice_horas = j
-                logger.debug(f"✓ Columna HORAS SEMESTRE: índice {j}, header: '{header}'")
-            # Columna de HORAS (fallback si no hay HORAS SEMESTRE)
-            elif 'HORAS' in header_upper and indice_horas < 0:
-                indice_horas = j
-                logger.debug(f"✓ Columna HORAS (fallback): índice {j}, header: '{header}'")
-            # Columna de CODIGO
-            elif 'CODIGO' in header_upper and 'ESTUDIANTE' not in header_upper:
-                indice_codigo = j
-            # Columna PORC (para evitarla)
-            elif 'PORC' in header_upper:
-                indice_porc = j
-            # Columna GRUPO
-            elif 'GRUPO' in header_upper:
-                indice_grupo = j
-            # Columna TIPO
-            elif 'TIPO' in header_upper and 'COMISION' not in header_upper:
-                indice_tipo = j
-            # Columna NOMBRE DE ASIGNATURA
-            elif 'NOMBRE' in header_upper and 'ASIGNATURA' in header_upper:
-                indice_nombre = j
-                logger.debug(f"✓ Columna NOMBRE DE ASIGNATURA: índice {j}, header: '{header}'")
-        
-        logger.debug(f"Índices: Horas={indice_horas}, Código={indice_codigo}, Nombre={indice_nombre}")
+        logger.debug("Índices: Horas=%s, Código=%s, Nombre=%s", indice_horas, indice_codigo, indice_nombre)
         
         for i in range(1, len(filas)):
             celdas = self.extraer_celdas(filas[i])
             
             # DEBUG: Mostrar celdas extraídas
-            logger.debug(f"Fila {i}: {len(celdas)} celdas extraídas")
-            for idx, celda in enumerate(celdas):
-                if celda and celda.strip():
-                    logger.debug(f"  Celda[{idx}]: '{celda[:50]}...' " if len(celda) > 50 else f"  Celda[{idx}]: '{celda}'")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Fila %d: %d celdas extraídas", i, len(celdas))
+                for idx, celda in enumerate(celdas):
+                    if celda and celda.strip():
+                        logger.debug(
+                            "  Celda[%d]: '%.50s%s'",
+                            idx, celda, '...' if len(celda) > 50 else ''
+                        )
             
             if all(not c or not c.strip() for c in celdas):
                 continue
@@ -1640,13 +1984,13 @@ class UnivalleScraper:
             
             # Extraer NOMBRE de asignatura usando headers específicos
             nombre_docencia = self._extraer_nombre_actividad_docencia(headers, celdas)
-            logger.debug(f"  nombre_docencia extraído: '{nombre_docencia}'")
+            logger.debug("  nombre_docencia extraído: '%s'", nombre_docencia)
             if nombre_docencia:
                 # Limpiar espacios múltiples y porcentajes al final
-                nombre_limpio = re.sub(r'\s*\d+%$', '', nombre_docencia).strip()
-                nombre_limpio = re.sub(r'\s+', ' ', nombre_limpio).strip()
+                nombre_limpio = _quitar_porcentaje_final('', nombre_docencia).strip()
+                nombre_limpio = _RE_ESPACIOS.sub(' ', nombre_limpio).strip()
                 actividad.nombre_asignatura = nombre_limpio
-                logger.debug(f"  Nombre de asignatura extraído: '{nombre_limpio}'")
+                logger.debug("  Nombre de asignatura extraído: '%s'", nombre_limpio)
             else:
                 logger.warning("⚠️ No se pudo extraer nombre de asignatura en fila de docencia")
             
@@ -1654,20 +1998,20 @@ class UnivalleScraper:
             if indice_horas >= 0 and indice_horas < len(celdas):
                 horas_raw = celdas[indice_horas].strip() if celdas[indice_horas] else ''
                 # Limpiar valor de horas (puede tener espacios o caracteres extra)
-                horas_limpia = re.sub(r'[^\d.,]', '', horas_raw).replace(',', '.')
+                horas_limpia = _quitar_no_numericos('', horas_raw).replace(',', '.')
                 if horas_limpia:
                     actividad.horas_semestre = horas_limpia
-                    logger.debug(f"  Horas extraídas: '{horas_limpia}' de columna {indice_horas}")
+                    logger.debug("  Horas extraídas: '%s' de columna %s", horas_limpia, indice_horas)
             
             # Fallback 1: buscar horas en todas las celdas por header
             if not actividad.horas_semestre:
                 for j, header in enumerate(headers):
                     if j < len(celdas) and 'HORAS' in header.upper():
                         horas_raw = celdas[j].strip() if celdas[j] else ''
-                        horas_limpia = re.sub(r'[^\d.,]', '', horas_raw).replace(',', '.')
+                        horas_limpia = _quitar_no_numericos('', horas_raw).replace(',', '.')
                         if horas_limpia:
                             actividad.horas_semestre = horas_limpia
-                            logger.debug(f"  Horas extraídas (fallback header): '{horas_limpia}' de columna {j}")
+                            logger.debug("  Horas extraídas (fallback header): '%s' de columna %s", horas_limpia, j)
                             break
             
             # Fallback 2: buscar número grande (>10) con decimales en las últimas celdas
@@ -1676,10 +2020,10 @@ class UnivalleScraper:
                 for j in range(len(celdas) - 1, -1, -1):  # Buscar desde el final
                     valor = (celdas[j] or '').strip()
                     # Buscar números con decimales >= 10 (típico de horas semestre)
-                    match = re.match(r'^(\d+)\.(\d+)$', valor)
+                    match = _es_decimal(valor)
                     if match and float(valor) >= 10:
                         actividad.horas_semestre = valor
-                        logger.debug(f"  Horas extraídas (fallback número grande): '{valor}' de celda {j}")
+                        logger.debug("  Horas extraídas (fallback número grande): '%s' de celda %s", valor, j)
                         break
             
             # 3. Extraer otros campos usando los índices
@@ -1712,14 +2056,14 @@ class UnivalleScraper:
             if actividad.horas_semestre and actividad.horas_semestre.strip():
                 try:
                     # Limpiar horas: remover caracteres no numéricos excepto punto
-                    horas_limpia = re.sub(r'[^\d.]', '', actividad.horas_semestre)
+                    horas_limpia = _quitar_no_numericos_sin_coma('', actividad.horas_semestre)
                     if horas_limpia:
                         # Convertir a float primero, luego tomar solo la parte entera
                         horas_numero = int(float(horas_limpia))
                         actividad.horas_semestre = str(horas_numero)
-                        logger.debug(f"  ✓ Horas: {horas_numero}")
+                        logger.debug("  ✓ Horas: %s", horas_numero)
                 except (ValueError, TypeError):
-                    logger.debug(f"⚠️ No se pudo convertir horas: '{actividad.horas_semestre}'")
+                    logger.debug("⚠️ No se pudo convertir horas: '%s'", actividad.horas_semestre)
                     actividad.horas_semestre = '0'
             else:
                 actividad.horas_semestre = '0'
@@ -1729,17 +2073,17 @@ class UnivalleScraper:
                 nombre_limpio = actividad.nombre_asignatura.strip()
                 # Solo limpiar porcentajes al final
                 if nombre_limpio.endswith('%'):
-                    nombre_limpio = re.sub(r'\s*\d+%$', '', nombre_limpio).strip()
+                    nombre_limpio = _quitar_porcentaje_final('', nombre_limpio).strip()
                 actividad.nombre_asignatura = nombre_limpio
             
             # Agregar actividad si tiene código O nombre (más permisivo, igual que .gs)
             if actividad.codigo or actividad.nombre_asignatura:
                 if self._es_postgrado(actividad):
                     postgrado.append(actividad)
-                    logger.debug(f"  ✓ Postgrado: '{actividad.nombre_asignatura}' - {actividad.horas_semestre}h")
+                    logger.debug("  ✓ Postgrado: '%s' - %sh", actividad.nombre_asignatura, actividad.horas_semestre)
                 else:
                     pregrado.append(actividad)
-                    logger.debug(f"  ✓ Pregrado: '{actividad.nombre_asignatura}' - {actividad.horas_semestre}h")
+                    logger.debug("  ✓ Pregrado: '%s' - %sh", actividad.nombre_asignatura, actividad.horas_semestre)
         
         return pregrado, postgrado
     
@@ -1767,31 +2111,16 @@ class UnivalleScraper:
         """
         actividades = []
         
-        # Identificar índices de columnas
-        indice_horas = -1
-        indice_codigo = -1
-        indice_grupo = -1
-        indice_tipo = -1
-        indice_nombre = -1
-        
-        logger.debug(f"Procesando asignaturas de {seccion.upper()} con {len(filas)} filas")
-        logger.debug(f"Headers: {headers}")
+        logger.debug("Procesando asignaturas de %s con %s filas", seccion.upper(), len(filas))
+        logger.debug("Headers: %s", headers)
         
-        for j, header in enumerate(headers):
-            header_upper = header.upper().strip()
-            
-            if 'HORAS' in header_upper and 'SEMESTRE' in header_upper:
-                indice_horas = j
-            elif 'HORAS' in header_upper and indice_horas < 0:
-                indice_horas = j
-            elif 'CODIGO' in header_upper and 'ESTUDIANTE' not in header_upper:
-                indice_codigo = j
-            elif 'GRUPO' in header_upper:
-                indice_grupo = j
-            elif 'TIPO' in header_upper and 'COMISION' not in header_upper:
-                indice_tipo = j
-            elif 'NOMBRE' in header_upper and 'ASIGNATURA' in header_upper:
-                indice_nombre = j
+        # Identificar índices de columnas
+        indices = self._indices_columnas_asignatura(headers, _REGLAS_COLUMNAS_ASIGNATURA_SECCION)
+        indice_horas = indices['horas']
+        indice_codigo = indices['codigo']
+        indice_grupo = indices['grupo']
+        indice_tipo = indices['tipo']
+        indice_nombre = indices['nombre']
         
         for i in range(1, len(filas)):
             celdas = self.extraer_celdas(filas[i])
@@ -1804,14 +2133,14 @@ class UnivalleScraper:
             # Extraer NOMBRE de asignatura
             nombre_docencia = self._extraer_nombre_actividad_docencia(headers, celdas)
             if nombre_docencia:
-                nombre_limpio = re.sub(r'\s*\d+%$', '', nombre_docencia).strip()
-                nombre_limpio = re.sub(r'\s+', ' ', nombre_limpio).strip()
+                nombre_limpio = _quitar_porcentaje_final('', nombre_docencia).strip()
+                nombre_limpio = _RE_ESPACIOS.sub(' ', nombre_limpio).strip()
                 actividad.nombre_asignatura = nombre_limpio
             
             # Extraer HORAS
             if indice_horas >= 0 and indice_horas < len(celdas):
                 horas_raw = celdas[indice_horas].strip() if celdas[indice_horas] else ''
-                horas_limpia = re.sub(r'[^\d.,]', '', horas_raw).replace(',', '.')
+                horas_limpia = _quitar_no_numericos('', horas_raw).replace(',', '.')
                 if horas_limpia:
                     try:
                         actividad.horas_semestre = str(float(horas_limpia))
@@ -1887,7 +2216,7 @@ class UnivalleScraper:
             # Imprimir las primeras 3 filas para debugging
             for i in range(min(3, len(filas_internas))):
                 fila_texto = self.extraer_texto_de_celda(filas_internas[i]).upper()
-                logger.debug(f"  Fila {i}: {fila_texto[:100]}")
+                logger.debug("  Fila %d: %.100s", i, fila_texto)
             return actividades
         
         # Procesar filas de datos
@@ -1947,7 +2276,7 @@ class UnivalleScraper:
             if 'ESTUDIANTE' in header_upper or 'CODIGO' in header_upper:
                 indice_estudiante = j
         
-        logger.debug(f"Tesis - Índice horas: {indice_horas}, título: {indice_titulo}, estudiante: {indice_estudiante}")
+        logger.debug("Tesis - Índice horas: %s, título: %s, estudiante: %s", indice_horas, indice_titulo, indice_estudiante)
         
         for i in range(1, len(filas)):
             celdas = self.extraer_celdas(filas[i])
@@ -1981,12 +2310,12 @@ class UnivalleScraper:
                 if key in actividad and actividad[key]:
                     # Verificar que sea un número válido
                     val = actividad[key].strip()
-                    if val and re.match(r'^\d+\.?\d*$', val):
+                    if val and _es_numero(val):
                         horas = val
                         break
             if not horas and indice_horas >= 0 and indice_horas < len(celdas):
                 valor_horas = celdas[indice_horas].strip() if celdas[indice_horas] else ''
-                if valor_horas and re.match(r'^\d+\.?\d*$', valor_horas):
+                if valor_horas and _es_numero(valor_horas):
                     horas = valor_horas
             actividad['HORAS SEMESTRE'] = horas
             
@@ -2000,7 +2329,7 @@ class UnivalleScraper:
                 estudiante = celdas[indice_estudiante].strip() if celdas[indice_estudiante] else ''
             actividad['CODIGO ESTUDIANTE'] = estudiante
             
-            logger.debug(f"Tesis procesada: título='{titulo}', horas='{horas}', estudiante='{estudiante}'")
+            logger.debug("Tesis procesada: título='%s', horas='%s', estudiante='%s'", titulo, horas, estudiante)
             
             actividades.append(actividad)
         
@@ -2023,28 +2352,28 @@ class UnivalleScraper:
         if 'ACTIVIDADES INTELECTUALES' in texto_tabla or 'ARTISTICAS' in texto_tabla:
             actividades = self._procesar_actividades_genericas(filas, headers, id_periodo)
             resultado.actividades_intelectuales.extend(actividades)
-            logger.debug(f"Actividades intelectuales/artísticas encontradas: {len(actividades)}")
+            logger.debug("Actividades intelectuales/artísticas encontradas: %s", len(actividades))
             return  # Evitar que caiga en otras condiciones
         
         # Actividades complementarias
         if any('PARTICIPACION EN' in h for h in headers_upper):
             logger.info(f"🔵 Detectada tabla ACTIVIDADES COMPLEMENTARIAS (por header 'PARTICIPACION EN')")
-            logger.debug(f"Headers: {headers}")
+            logger.debug("Headers: %s", headers)
             actividades = self._procesar_actividades_genericas(filas, headers, id_periodo)
             logger.info(f"✓ Procesadas {len(actividades)} actividades complementarias")
             for act in actividades:
-                logger.debug(f"  Complementaria: Categoría='{act.get('CATEGORIA', '')}', Nombre='{act.get('NOMBRE', '')}', Horas='{act.get('HORAS SEMESTRE', '')}'")
+                logger.debug("  Complementaria: Categoría='%s', Nombre='%s', Horas='%s'", act.get('CATEGORIA', ''), act.get('NOMBRE', ''), act.get('HORAS SEMESTRE', ''))
             resultado.actividades_complementarias.extend(actividades)
             return  # Evitar que caiga en otras condiciones
         
         # Docente en comisión
         elif any('TIPO DE COMISION' in h for h in headers_upper):
             logger.info(f"🔵 Detectada tabla DOCENTE EN COMISION (por header 'TIPO DE COMISION')")
-            logger.debug(f"Headers: {headers}")
+            logger.debug("Headers: %s", headers)
             actividades = self._procesar_actividades_genericas(filas, headers, id_periodo)
             logger.info(f"✓ Procesadas {len(actividades)} actividades de comisión")
             for act in actividades:
-                logger.debug(f"  Comisión: Categoría='{act.get('CATEGORIA', '')}', Descripción='{act.get('DESCRIPCION', '')}', Horas='{act.get('HORAS SEMESTRE', '')}')")
+                logger.debug("  Comisión: Categoría='%s', Descripción='%s', Horas='%s')", act.get('CATEGORIA', ''), act.get('DESCRIPCION', ''), act.get('HORAS SEMESTRE', ''))
             resultado.docente_en_comision.extend(actividades)
         
         # Actividades administrativas
@@ -2086,10 +2415,10 @@ class UnivalleScraper:
             # Priorizar "HORAS SEMESTRE" sobre solo "HORAS"
             if 'HORAS' in header_upper and 'SEMESTRE' in header_upper:
                 indice_horas = j
-                logger.debug(f"✓ Columna HORAS SEMESTRE identificada: índice {j}, header: '{header}'")
+                logger.debug("✓ Columna HORAS SEMESTRE identificada: índice %s, header: '%s'", j, header)
             elif 'HORAS' in header_upper and indice_horas == -1:
                 indice_horas = j
-                logger.debug(f"✓ Columna HORAS identificada: índice {j}, header: '{header}'")
+                logger.debug("✓ Columna HORAS identificada: índice %s, header: '%s'", j, header)
             
             # Identificar columna NOMBRE (con variantes)
             if ('NOMBRE' in header_upper and 'ASIGNATURA' not in header_upper) or \
@@ -2097,17 +2426,17 @@ class UnivalleScraper:
                ('NOMBRE' in header_upper and 'PROYECTO' in header_upper):
                 if indice_nombre == -1:
                     indice_nombre = j
-                    logger.debug(f"✓ Columna NOMBRE identificada: índice {j}, header: '{header}'")
+                    logger.debug("✓ Columna NOMBRE identificada: índice %s, header: '%s'", j, header)
             
             # Identificar columna PARTICIPACION EN (para actividades complementarias)
             if 'PARTICIPACION EN' in header_upper:
                 indice_participacion = j
-                logger.debug(f"✓ Columna PARTICIPACION EN identificada: índice {j}, header: '{header}'")
+                logger.debug("✓ Columna PARTICIPACION EN identificada: índice %s, header: '%s'", j, header)
             
             # Identificar columna TIPO DE COMISION (para comisiones)
             if 'TIPO DE COMISION' in header_upper or ('TIPO' in header_upper and 'COMISION' in header_upper):
                 indice_tipo_comision = j
-                logger.debug(f"✓ Columna TIPO DE COMISION identificada: índice {j}, header: '{header}'")
+                logger.debug("✓ Columna TIPO DE COMISION identificada: índice %s, header: '%s'", j, header)
             
             # Otras columnas
             if 'TITULO' in header_upper:
@@ -2140,22 +2469,22 @@ class UnivalleScraper:
                     total_celdas_no_vacias += 1
                     
                     # Verificar si es un número (probablemente horas, no categoría)
-                    if re.match(r'^\d+\.?\d*$', celda_upper):
+                    if _es_numero(celda_upper):
                         celdas_con_numeros += 1
-                        logger.debug(f"  Celda con número detectada: '{celda_upper}'")
+                        logger.debug("  Celda con número detectada: '%s'", celda_upper)
                         continue
                     
                     # Verificar si es texto muy largo (probablemente nombre de actividad, no categoría)
                     if len(celda_upper) > 50:
                         celdas_con_texto_largo += 1
-                        logger.debug(f"  Celda con texto largo detectada: '{celda_upper[:30]}...'")
+                        logger.debug("  Celda con texto largo detectada: '%.30s...'", celda_upper)
                         continue
                     
                     # Verificar si coincide con alguna categoría conocida
                     for cat in categorias_conocidas:
                         if cat in celda_upper:
                             categorias_encontradas += 1
-                            logger.debug(f"  Categoría encontrada: '{celda_upper}' (coincide con '{cat}')")
+                            logger.debug("  Categoría encontrada: '%s' (coincide con '%s')", celda_upper, cat)
                             break
             
             # Es fila de categorías si:
@@ -2186,9 +2515,7 @@ class UnivalleScraper:
                     )
         
         logger.debug(
-            f"Actividades genéricas - Índices: Horas={indice_horas}, Nombre={indice_nombre}, "
-            f"Participación={indice_participacion}, TipoComisión={indice_tipo_comision}, "
-            f"Inicio datos={inicio_datos}, Es comisión={es_tabla_comision}"
+            "Actividades genéricas - Índices: Horas=%s, Nombre=%s, Participación=%s, TipoComisión=%s, Inicio datos=%s, Es comisión=%s", indice_horas, indice_nombre, indice_participacion, indice_tipo_comision, inicio_datos, es_tabla_comision
         )
         
         # Si hay categorías en la segunda fila, procesar por columnas (estructura matricial)
@@ -2211,30 +2538,30 @@ class UnivalleScraper:
             logger.info(f"🔍 Procesando {len([c for c in categorias_segunda_fila if c])} columnas con categorías...")
             for j, categoria in enumerate(categorias_segunda_fila):
                 if not categoria:
-                    logger.debug(f"  Columna {j}: Sin categoría, saltando")
+                    logger.debug("  Columna %s: Sin categoría, saltando", j)
                     continue
                 
                 if j not in columnas_datos or not columnas_datos[j]:
-                    logger.debug(f"  Columna {j} ('{categoria}'): Sin datos, saltando")
+                    logger.debug("  Columna %s ('%s'): Sin datos, saltando", j, categoria)
                     continue
                 
-                logger.debug(f"  Columna {j} ('{categoria}'): Procesando {len(columnas_datos[j])} valores: {columnas_datos[j]}")
+                logger.debug("  Columna %s ('%s'): Procesando %s valores: %s", j, categoria, len(columnas_datos[j]), columnas_datos[j])
                 
                 # En cada columna, buscar el nombre (texto) y las horas (número)
                 nombre_actividad = ''
                 horas_actividad = ''
                 
                 for valor in columnas_datos[j]:
-                    if re.match(r'^\d+\.?\d*$', valor):
+                    if _es_numero(valor):
                         # Es un número, probablemente las horas
                         if not horas_actividad:  # Solo tomar el primero
                             horas_actividad = valor
-                            logger.debug(f"    Horas encontradas: '{valor}'")
+                            logger.debug("    Horas encontradas: '%s'", valor)
                     else:
                         # Es texto, probablemente el nombre
                         if not nombre_actividad:  # Solo tomar el primero
                             nombre_actividad = valor
-                            logger.debug(f"    Nombre encontrado: '{valor}'")
+                            logger.debug("    Nombre encontrado: '%s'", valor)
                 
                 # Si encontramos ambos (nombre y horas), crear la actividad
                 if nombre_actividad and horas_actividad:
@@ -2283,9 +2610,9 @@ class UnivalleScraper:
             if indice_horas >= 0 and indice_horas < len(celdas):
                 valor_horas = celdas[indice_horas].strip() if celdas[indice_horas] else ''
                 # Validar que sea un número
-                if valor_horas and re.match(r'^\d+\.?\d*$', valor_horas):
+                if valor_horas and _es_numero(valor_horas):
                     horas = valor_horas
-                    logger.debug(f"  Horas extraídas (índice {indice_horas}): '{horas}'")
+                    logger.debug("  Horas extraídas (índice %s): '%s'", indice_horas, horas)
             
             # Fallback: buscar en diccionario por clave
             if not horas:
@@ -2293,9 +2620,9 @@ class UnivalleScraper:
                     if key in actividad and actividad[key]:
                         val = actividad[key].strip()
                         # Verificar que sea un número válido
-                        if val and re.match(r'^\d+\.?\d*$', val):
+                        if val and _es_numero(val):
                             horas = val
-                            logger.debug(f"  Horas extraídas (clave '{key}'): '{horas}'")
+                            logger.debug("  Horas extraídas (clave '%s'): '%s'", key, horas)
                             break
             
             actividad['HORAS SEMESTRE'] = horas
@@ -2305,10 +2632,10 @@ class UnivalleScraper:
             if indice_nombre >= 0 and indice_nombre < len(celdas):
                 nombre_raw = celdas[indice_nombre].strip() if celdas[indice_nombre] else ''
                 # Validar que NO sea un número (las horas no son el nombre)
-                if nombre_raw and not re.match(r'^\d+\.?\d*$', nombre_raw):
+                if nombre_raw and not _es_numero(nombre_raw):
                     nombre = nombre_raw
-                    logger.debug(f"  Nombre extraído (índice {indice_nombre}): '{nombre}'")
-                elif nombre_raw and re.match(r'^\d+\.?\d*$', nombre_raw):
+                    logger.debug("  Nombre extraído (índice %s): '%s'", indice_nombre, nombre)
+                elif nombre_raw and _es_numero(nombre_raw):
                     logger.warning(f"⚠️ La columna NOMBRE contiene un número '{nombre_raw}' - posible error de columnas")
             
             # Fallback: buscar en diccionario por clave
@@ -2317,9 +2644,9 @@ class UnivalleScraper:
                     if key in actividad and actividad[key]:
                         nombre_raw = actividad[key].strip()
                         # Validar que NO sea un número
-                        if nombre_raw and not re.match(r'^\d+\.?\d*$', nombre_raw):
+                        if nombre_raw and not _es_numero(nombre_raw):
                             nombre = nombre_raw
-                            logger.debug(f"  Nombre extraído (clave '{key}'): '{nombre}'")
+                            logger.debug("  Nombre extraído (clave '%s'): '%s'", key, nombre)
                             break
             
             actividad['NOMBRE'] = nombre
@@ -2359,7 +2686,7 @@ class UnivalleScraper:
             actividad['DESCRIPCION'] = descripcion
             
             # Validar que el nombre NO sea un número
-            if nombre and re.match(r'^\d+\.?\d*$', nombre):
+            if nombre and _es_numero(nombre):
                 logger.error(f"❌ ERROR: Nombre de actividad es un número '{nombre}' - las columnas están invertidas")
             
             # Extraer CATEGORIA según el tipo de tabla
@@ -2367,12 +2694,12 @@ class UnivalleScraper:
             if 'CATEGORIA' not in actividad and indice_participacion >= 0:
                 if indice_participacion < len(celdas):
                     categoria_complementaria = celdas[indice_participacion].strip() if celdas[indice_participacion] else ''
-                    if categoria_complementaria and not re.match(r'^\d+\.?\d*$', categoria_complementaria):
+                    if categoria_complementaria and not _es_numero(categoria_complementaria):
                         actividad['CATEGORIA'] = categoria_complementaria
                         actividad['Categoría'] = categoria_complementaria
-                        logger.debug(f"  ✓ Categoría de PARTICIPACION EN extraída (índice {indice_participacion}): '{categoria_complementaria}'")
+                        logger.debug("  ✓ Categoría de PARTICIPACION EN extraída (índice %s): '%s'", indice_participacion, categoria_complementaria)
                     elif not categoria_complementaria:
-                        logger.debug(f"  ⚠️ Columna PARTICIPACION EN vacía en índice {indice_participacion}")
+                        logger.debug("  ⚠️ Columna PARTICIPACION EN vacía en índice %s", indice_participacion)
             
             # 2. Para tablas de comisión: extraer categoría de la columna TIPO DE COMISION
             if 'CATEGORIA' not in actividad and indice_tipo_comision >= 0:
@@ -2381,7 +2708,7 @@ class UnivalleScraper:
                     if categoria_comision:
                         actividad['CATEGORIA'] = categoria_comision
                         actividad['Categoría'] = categoria_comision
-                        logger.debug(f"  ✓ Categoría de comisión extraída (índice {indice_tipo_comision}): '{categoria_comision}'")
+                        logger.debug("  ✓ Categoría de comisión extraída (índice %s): '%s'", indice_tipo_comision, categoria_comision)
             
             # 3. Fallback: intentar extraer categoría de headers que contengan "TIPO"
             if 'CATEGORIA' not in actividad:
@@ -2391,10 +2718,10 @@ class UnivalleScraper:
                         if j < len(celdas):
                             categoria_tipo = celdas[j].strip() if celdas[j] else ''
                             # Validar que no sea un número ni el nombre de la actividad
-                            if categoria_tipo and not re.match(r'^\d+\.?\d*$', categoria_tipo) and categoria_tipo != nombre:
+                            if categoria_tipo and not _es_numero(categoria_tipo) and categoria_tipo != nombre:
                                 actividad['CATEGORIA'] = categoria_tipo
                                 actividad['Categoría'] = categoria_tipo
-                                logger.debug(f"  Categoría extraída de columna TIPO (índice {j}): '{categoria_tipo}'")
+                                logger.debug("  Categoría extraída de columna TIPO (índice %s): '%s'", j, categoria_tipo)
                                 break
             
             # Asegurar que CATEGORIA esté presente (incluso si está vacía)
@@ -2409,11 +2736,7 @@ class UnivalleScraper:
     
     def _buscar_tabla_anidada(self, tabla_html: str) -> Optional[str]:
         """Busca tabla anidada dentro de otra tabla."""
-        match = re.search(
-            r'<tbody[^>]*>[\s\S]*?<tr[^>]*>[\s\S]*?<td[^>]*>[\s\S]*?(<table[^>]*>[\s\S]*?</table>)',
-            tabla_html,
-            re.IGNORECASE
-        )
+        match = _RE_TABLA_ANIDADA.search(tabla_html)
         return match.group(1) if match else None
     
     def _es_postgrado(self, actividad: ActividadAsignatura) -> bool:
@@ -2428,42 +2751,59 @@ class UnivalleScraper:
             return False
         
         # Analizar código numérico
-        codigo_limpio = re.sub(r'[A-Za-z]', '', actividad.codigo)
-        if codigo_limpio and re.match(r'^\d+$', codigo_limpio):
-            if re.match(r'^[7-9]\d{2,}$', codigo_limpio):
+        codigo_limpio = _quitar_letras('', actividad.codigo)
+        if codigo_limpio and _es_solo_digitos(codigo_limpio):
+            if _es_codigo_postgrado(codigo_limpio):
                 return True
-            if re.match(r'^[1-5]\d{3,}$', codigo_limpio):
+            if _es_codigo_pregrado(codigo_limpio):
                 return False
         
         return False
     
-    def obtener_periodos_disponibles(self) -> List[Dict[str, Any]]:
+    def obtener_periodos_disponibles(self, refrescar: bool = False) -> List[Dict[str, Any]]:
         """
         Obtiene los períodos disponibles desde el portal.
         
+        El resultado se guarda en la instancia y en una caché en disco con TTL
+        (PERIODOS_CACHE_FILE / PERIODOS_CACHE_TTL): solo la primera llamada de
+        la ejecución lee la caché o hace el request, las siguientes (incluidas
+        las de otros hilos) reutilizan la lista.
+        
+        Args:
+            refrescar: Si es True, ignora ambas cachés y consulta el portal
+        
         Returns:
             Lista de diccionarios con información de períodos
         """
+        with self._lock_periodos:
+            if refrescar or self._periodos is None:
+                periodos = None if refrescar else _leer_cache_periodos()
+                if periodos is None:
+                    periodos = self._descargar_periodos()
+                    _guardar_cache_periodos(periodos)
+                self._periodos = periodos
+            return list(self._periodos)
+    
+    def _descargar_periodos(self) -> List[Dict[str, Any]]:
+        """Descarga y parsea la lista de períodos desde el portal."""
         logger.info(f"Obteniendo períodos disponibles desde {UNIVALLE_PERIODOS_URL}")
         
         try:
-            response = self.session.get(
+            response = self._get(
                 UNIVALLE_PERIODOS_URL,
                 cookies=self.cookies if self.cookies else None,
                 timeout=REQUEST_TIMEOUT
             )
             response.raise_for_status()
-            response.encoding = 'iso-8859-1'
-            html = response.text
             
-            # Buscar options en select
-            pattern = r'<option[^>]*value=["\']?(\d+)["\']?[^>]*>([\s\S]*?)</option>'
-            matches = re.findall(pattern, html, re.IGNORECASE)
+            # Buscar options en select directamente sobre los bytes; solo se
+            # decodifica (ISO-8859-1) el texto de cada option encontrada
+            matches = _RE_OPTION_PERIODO.findall(response.content)
             
             periodos = []
             for match in matches:
                 id_periodo = int(match[0])
-                label_raw = re.sub(r'<[^>]+>', '', match[1]).strip()
+                label_raw = _quitar_tags(match[1].decode('iso-8859-1')).strip()
                 
                 # Parsear label
                 periodo_info = parsear_periodo_label(label_raw)
@@ -2491,7 +2831,8 @@ class UnivalleScraper:
         id_periodo: Optional[int] = None,
         max_retries: int = 3,
         delay_min: float = 0.5,
-        delay_max: float = 1.0
+        delay_max: float = 1.0,
+        periodo_label: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Scrapea datos de un profesor y retorna lista de actividades.
@@ -2506,6 +2847,8 @@ class UnivalleScraper:
             max_retries: Número máximo de intentos (default: 3)
             delay_min: Delay mínimo entre requests en segundos (default: 0.5)
             delay_max: Delay máximo entre requests en segundos (default: 1.0)
+            periodo_label: Label del período (ej: "2026-1") a asignar en el campo
+                'periodo' de cada actividad. Si es None, se busca por id_periodo
         
         Returns:
             Lista de diccionarios, cada uno representa una actividad del profesor.
@@ -2559,7 +2902,7 @@ class UnivalleScraper:
                 
                 # Hacer request
                 inicio_request = time.time()
-                response = self.session.get(
+                response = self._get(
                     url,
                     cookies=self.cookies if self.cookies else None,
                     timeout=REQUEST_TIMEOUT
@@ -2578,35 +2921,45 @@ class UnivalleScraper:
                 if len(html) < 100:
                     raise ValueError("Respuesta vacía o muy corta del servidor")
                 
-                # Manejar framesets
-                if '<frameset' in html.lower() or '<frame' in html.lower():
+                # Convertir a minúsculas una sola vez para todas las verificaciones
+                html_lower = html.lower()
+                
+                # Manejar framesets ('<frame' también cubre '<frameset')
+                if '<frame' in html_lower:
                     logger.debug("Detectado frameset, extrayendo contenido...")
                     html = self._manejar_frameset(html, url)
+                    html_lower = html.lower()
                 
                 # Verificar si es página de error
-                if '<title>error</title>' in html.lower() or re.search(r'<h1[^>]*>error', html, re.IGNORECASE):
+                if '<title>error</title>' in html_lower or _RE_H1_ERROR.search(html_lower):
                     raise ValueError("El servidor devolvió una página de error")
                 
                 # Parsear y extraer datos
                 logger.info("🔄 Parseando HTML y extrayendo datos...")
                 
-                # Obtener label del período una sola vez
-                periodo_label = str(id_periodo)
-                try:
-                    periodos = self.obtener_periodos_disponibles()
-                    periodo_match = next((p for p in periodos if p['idPeriod'] == id_periodo), None)
-                    if periodo_match:
-                        periodo_label = periodo_match['label']
-                except:
-                    logger.debug(f"No se pudo obtener label del período, usando ID: {id_periodo}")
+                # Obtener label del período una sola vez (si el llamador no lo dio)
+                if periodo_label is None:
+                    periodo_label = str(id_periodo)
+                    try:
+                        periodos = self.obtener_periodos_disponibles()
+                        periodo_match = next((p for p in periodos if p['idPeriod'] == id_periodo), None)
+                        if periodo_match:
+                            periodo_label = periodo_match['label']
+                    except:
+                        logger.debug("No se pudo obtener label del período, usando ID: %s", id_periodo)
                 
                 actividades = self._extraer_actividades_desde_html(html, cedula_limpia, id_periodo, periodo_label)
                 
                 if not actividades:
                     logger.warning("⚠️ No se encontraron actividades en el HTML")
+                    # Sin datos del docente la página puede ser de sesión expirada:
+                    # no reutilizarla en la siguiente ejecución
+                    self._descartar_de_cache(url)
                     # Verificar si es página de login (esto sí es un error)
-                    tiene_formulario = '<form' in html.lower() and 'periodo academico' in html.lower()
-                    tiene_tablas = len(self.extraer_tablas(html)) < 2
+                    tiene_formulario = '<form' in html_lower and 'periodo academico' in html_lower
+                    # Basta con saber si hay al menos dos tablas: no extraerlas todas
+                    primera_tabla = html_lower.find('<table')
+                    tiene_tablas = primera_tabla < 0 or html_lower.find('<table', primera_tabla + 1) < 0
                     if tiene_formulario and tiene_tablas:
                         raise ValueError("Página de login detectada - no se encontraron datos del docente")
                     # No hay actividades para este docente/período
@@ -2749,7 +3102,7 @@ class UnivalleScraper:
                     f"❌ Validación fallida para actividad #{idx} (cédula {cedula}): "
                     f"{', '.join(errores)}"
                 )
-                logger.debug(f"   Actividad problemática: {act}")
+                logger.debug("   Actividad problemática: %s", act)
         
         # Resumen de validación
         if total_errores > 0:
@@ -2803,13 +3156,13 @@ class UnivalleScraper:
         seccion_actual = None
         
         for tabla_idx, tabla_html in enumerate(tablas, 1):
-            logger.debug(f"Procesando tabla {tabla_idx}/{len(tablas)}")
+            logger.debug("Procesando tabla %s/%s", tabla_idx, len(tablas))
             
             # Primero verificar si es una tabla de título de sección
             seccion_detectada = self._detectar_seccion_titulo(tabla_html)
             if seccion_detectada:
                 seccion_actual = seccion_detectada
-                logger.debug(f"Detectada sección: {seccion_actual}")
+                logger.debug("Detectada sección: %s", seccion_actual)
                 continue  # Pasar a la siguiente tabla (que tendrá los datos)
             
             filas = self.extraer_filas(tabla_html)
@@ -2888,8 +3241,7 @@ class UnivalleScraper:
             departamento_original = info.unidad_academica  # Guardar el original
             departamento, escuela = self._extraer_escuela_departamento(info.unidad_academica)
             logger.debug(
-                f"UNIDAD ACADEMICA: '{info.unidad_academica}' -> "
-                f"Departamento: '{departamento}', Escuela: '{escuela}'"
+                "UNIDAD ACADEMICA: '%s' -> Departamento: '%s', Escuela: '%s'", info.unidad_academica, departamento, escuela
             )
         else:
             # Fallback a los campos separados si no hay UNIDAD ACADEMICA
@@ -2898,16 +3250,16 @@ class UnivalleScraper:
             departamento_original = departamento_raw  # Guardar el original
             if escuela_raw:
                 escuela = limpiar_escuela(escuela_raw)
-                logger.debug(f"Escuela (fallback): '{escuela_raw}' -> '{escuela}'")
+                logger.debug("Escuela (fallback): '%s' -> '%s'", escuela_raw, escuela)
             if departamento_raw:
                 departamento = limpiar_departamento(departamento_raw)
-                logger.debug(f"Departamento (fallback): '{departamento_raw}' -> '{departamento}'")
+                logger.debug("Departamento (fallback): '%s' -> '%s'", departamento_raw, departamento)
                 
                 # Determinar escuela correcta basada en el departamento
                 escuela_desde_dept = determinar_escuela_desde_departamento(departamento)
                 if escuela_desde_dept:
                     escuela = escuela_desde_dept
-                    logger.debug(f"Escuela determinada desde departamento: '{escuela}'")
+                    logger.debug("Escuela determinada desde departamento: '%s'", escuela)
         
         vinculacion = info.vinculacion or ''
         dedicacion = info.dedicacion or ''
@@ -2915,19 +3267,19 @@ class UnivalleScraper:
         cargo = (info.cargo or '').strip() or 'SIN CARGO'
         categoria_info = info.categoria or ''
         
-        logger.debug(f"Procesando actividades para período {periodo_label}")
-        logger.debug(f"NIVEL ALCANZADO extraído: '{nivel}'")
-        logger.debug(f"VINCULACION extraída: '{vinculacion}'")
-        logger.debug(f"DEDICACION extraída: '{dedicacion}'")
-        logger.debug(f"CARGO extraído: '{cargo}'")
-        logger.debug(f"CATEGORIA extraída: '{categoria_info}'")
+        logger.debug("Procesando actividades para período %s", periodo_label)
+        logger.debug("NIVEL ALCANZADO extraído: '%s'", nivel)
+        logger.debug("VINCULACION extraída: '%s'", vinculacion)
+        logger.debug("DEDICACION extraída: '%s'", dedicacion)
+        logger.debug("CARGO extraído: '%s'", cargo)
+        logger.debug("CATEGORIA extraída: '%s'", categoria_info)
         
         # Procesar actividades de pregrado
-        logger.debug(f"Total actividades de PREGRADO: {len(datos_docente.actividades_pregrado)}")
+        logger.debug("Total actividades de PREGRADO: %s", len(datos_docente.actividades_pregrado))
         for actividad in datos_docente.actividades_pregrado:
             # Log para debug de cada actividad
             nombre_asig = (actividad.nombre_asignatura or '').strip()
-            logger.debug(f"  Pregrado - nombre_asignatura: '{nombre_asig}', horas_semestre: '{actividad.horas_semestre}'")
+            logger.debug("  Pregrado - nombre_asignatura: '%s', horas_semestre: '%s'", nombre_asig, actividad.horas_semestre)
             
             # Filtrar actividades vacías o con títulos de sección
             if not nombre_asig:
@@ -2937,7 +3289,7 @@ class UnivalleScraper:
             # Verificar que no sea un título de sección
             nombre_upper = nombre_asig.upper()
             if any(titulo in nombre_upper for titulo in ['ACTIVIDADES DE DOCENCIA', 'PREGRADO', 'POSTGRADO']):
-                logger.debug(f"    ⚠️ Saltando título de sección: '{nombre_asig}'")
+                logger.debug("    ⚠️ Saltando título de sección: '%s'", nombre_asig)
                 continue
             
             actividades.append(self._construir_actividad_dict(
@@ -2960,11 +3312,11 @@ class UnivalleScraper:
             ))
         
         # Procesar actividades de postgrado
-        logger.debug(f"Total actividades de POSTGRADO: {len(datos_docente.actividades_postgrado)}")
+        logger.debug("Total actividades de POSTGRADO: %s", len(datos_docente.actividades_postgrado))
         for actividad in datos_docente.actividades_postgrado:
             # Log para debug de cada actividad
             nombre_asig = (actividad.nombre_asignatura or '').strip()
-            logger.debug(f"  Postgrado - nombre_asignatura: '{nombre_asig}', horas_semestre: '{actividad.horas_semestre}'")
+            logger.debug("  Postgrado - nombre_asignatura: '%s', horas_semestre: '%s'", nombre_asig, actividad.horas_semestre)
             
             # Filtrar actividades vacías o con títulos de sección
             if not nombre_asig:
@@ -2974,7 +3326,7 @@ class UnivalleScraper:
             # Verificar que no sea un título de sección
             nombre_upper = nombre_asig.upper()
             if any(titulo in nombre_upper for titulo in ['ACTIVIDADES DE DOCENCIA', 'PREGRADO', 'POSTGRADO']):
-                logger.debug(f"    ⚠️ Saltando título de sección: '{nombre_asig}'")
+                logger.debug("    ⚠️ Saltando título de sección: '%s'", nombre_asig)
                 continue
             
             actividades.append(self._construir_actividad_dict(
@@ -3004,10 +3356,10 @@ class UnivalleScraper:
             return 'Proyecto'
         
         # Procesar actividades de investigación
-        logger.debug(f"Total actividades de INVESTIGACION: {len(datos_docente.actividades_investigacion)}")
+        logger.debug("Total actividades de INVESTIGACION: %s", len(datos_docente.actividades_investigacion))
         for actividad in datos_docente.actividades_investigacion:
             # Log para debug de cada actividad
-            logger.debug(f"  Investigación - nombre_proyecto: '{actividad.nombre_proyecto}', horas_semestre: '{actividad.horas_semestre}'")
+            logger.debug("  Investigación - nombre_proyecto: '%s', horas_semestre: '%s'", actividad.nombre_proyecto, actividad.horas_semestre)
             actividades.append(self._construir_actividad_dict(
                 cedula=cedula,
                 nombre_profesor=nombre_completo,
@@ -3028,13 +3380,13 @@ class UnivalleScraper:
             ))
         
         # Procesar dirección de tesis
-        logger.debug(f"Total actividades de TESIS: {len(datos_docente.actividades_tesis)}")
+        logger.debug("Total actividades de TESIS: %s", len(datos_docente.actividades_tesis))
         for tesis in datos_docente.actividades_tesis:
             titulo_tesis = tesis.get('TITULO DE LA TESIS', '') or tesis.get('Titulo de la Tesis', '') or tesis.get('TITULO', '')
             horas_tesis = tesis.get('HORAS SEMESTRE', '') or tesis.get('Horas Semestre', '')
             codigo_est = tesis.get('CODIGO ESTUDIANTE', '') or tesis.get('Codigo Estudiante', '') or tesis.get('ESTUDIANTE', '')
             
-            logger.debug(f"  Tesis - título: '{titulo_tesis}', horas: '{horas_tesis}', keys: {list(tesis.keys())}")
+            logger.debug("  Tesis - título: '%s', horas: '%s', keys: %s", titulo_tesis, horas_tesis, list(tesis.keys()))
             
             actividades.append(self._construir_actividad_dict(
                 cedula=cedula,
@@ -3160,8 +3512,8 @@ class UnivalleScraper:
                 actividad.get('DESCRIPCION DEL CARGO', '')
             )
             
-            logger.debug(f"  Comisión #{i}: Categoría='{categoria_comision}', Descripción='{descripcion_comision}'")
-            logger.debug(f"    Keys en actividad: {list(actividad.keys())}")
+            logger.debug("  Comisión #%s: Categoría='%s', Descripción='%s'", i, categoria_comision, descripcion_comision)
+            logger.debug("    Keys en actividad: %s", list(actividad.keys()))
             
             actividades.append(self._construir_actividad_dict(
                 cedula=cedula,
@@ -3181,7 +3533,7 @@ class UnivalleScraper:
                 cargo=cargo,
             ))
         
-        logger.debug(f"Total actividades extraídas: {len(actividades)}")
+        logger.debug("Total actividades extraídas: %s", len(actividades))
         
         # Si no hay actividades pero sí hay información personal, crear un registro base
         if len(actividades) == 0:
@@ -3248,7 +3600,7 @@ class UnivalleScraper:
         
         # Limpiar porcentajes al final si existen
         if nombre_actividad_limpio.endswith('%'):
-            nombre_actividad_limpio = re.sub(r'\s*\d+%$', '', nombre_actividad_limpio).strip()
+            nombre_actividad_limpio = _quitar_porcentaje_final('', nombre_actividad_limpio).strip()
         
         # Parsear horas a número
         horas_numero = parsear_horas(numero_horas)
@@ -3319,62 +3671,26 @@ class UnivalleScraper:
             html: HTML completo
             info: Objeto InformacionPersonal a actualizar
         """
-        # Normalizar HTML
-        html_norm = html.replace('&nbsp;', ' ').replace('\n', ' ')
-        html_norm = re.sub(r'\s+', ' ', html_norm)
-        
-        # Patrones para buscar
-        patrones = {
-            'VINCULACION': [
-                r'VINCULACION\s*[=:]\s*([^\s,<>&"\']+)',
-                r'VINCULACI[OÓ]N\s*[=:]\s*([^\s,<>&"\']+)',
-            ],
-            'CATEGORIA': [
-                r'CATEGORIA\s*[=:]\s*([^\s,<>&"\']+)',
-                r'CATEGOR[IÍ]A\s*[=:]\s*([^\s,<>&"\']+)',
-            ],
-            'DEDICACION': [
-                r'DEDICACION\s*[=:]\s*([^\s,<>&"\']+)',
-                r'DEDICACI[OÓ]N\s*[=:]\s*([^\s,<>&"\']+)',
-            ],
-            'NIVEL ALCANZADO': [
-                r'NIVEL\s+ALCANZADO\s*[=:]\s*([^\s,<>&"\']+)',
-            ],
-            'CARGO': [
-                r'CARGO\s*[=:]\s*([^\s,<>&"\']+)',
-            ]
-        }
+        # Solo buscar los campos que aún no están poblados
+        pendientes = [
+            (campo, atributo, patron)
+            for campo, atributo, patron in _PATRONES_TEXTO_PLANO
+            if not getattr(info, atributo)
+        ]
+        if not pendientes:
+            return
         
-        for campo, regexes in patrones.items():
-            # Solo actualizar si el campo no está ya poblado
-            if campo == 'VINCULACION' and info.vinculacion:
-                continue
-            elif campo == 'CATEGORIA' and info.categoria:
-                continue
-            elif campo == 'DEDICACION' and info.dedicacion:
-                continue
-            elif campo == 'NIVEL ALCANZADO' and info.nivel_alcanzado:
-                continue
-            elif campo == 'CARGO' and info.cargo:    
-                continue
-            
-            for regex in regexes:
-                match = re.search(regex, html_norm, re.IGNORECASE)
-                if match:
-                    valor = match.group(1).strip()
-                    if valor and len(valor) < 100 and '<' not in valor:
-                        if campo == 'VINCULACION':
-                            info.vinculacion = valor
-                        elif campo == 'CATEGORIA':
-                            info.categoria = valor
-                        elif campo == 'DEDICACION':
-                            info.dedicacion = valor
-                        elif campo == 'NIVEL ALCANZADO':
-                            info.nivel_alcanzado = valor
-                        elif campo == 'CARGO':
-                            info.cargo = valor    
-                        logger.debug(f"Campo {campo} encontrado en texto plano: {valor}")
-                        break
+        # Normalizar HTML (\s+ ya cubre los saltos de línea)
+        html_norm = _RE_ESPACIOS.sub(' ', html.replace('&nbsp;', ' '))
+        
+        for campo, atributo, patron in pendientes:
+            # search se detiene en la primera coincidencia
+            match = patron.search(html_norm)
+            if match:
+                valor = match.group(1).strip()
+                if valor and len(valor) < 100 and '<' not in valor:
+                    setattr(info, atributo, valor)
+                    logger.debug("Campo %s encontrado en texto plano: %s", campo, valor)
     
     def _construir_nombre_completo(self, info: InformacionPersonal) -> str:
         """
@@ -8,6 +8,11 @@ from typing import Optional, Dict, Any, List
 
 logger = logging.getLogger(__name__)
 
+# Separadores que se eliminan de una cédula (espacios, puntos y guiones)
+_quitar_separadores_cedula = re.compile(r'[\s.\-]').sub
+# Período "YYYY-N" / "YYYY - N" dentro de un texto (parsear_periodo_label, extraer_periodo_desde_texto)
+_buscar_periodo = re.compile(r'(\d{4})\s*[-\s]\s*0?([12])\b').search
+
 
 def validar_cedula(cedula: str) -> bool:
     """
@@ -23,16 +28,10 @@ def validar_cedula(cedula: str) -> bool:
         return False
     
     # Remover espacios, puntos y guiones
-    cedula_limpia = re.sub(r'[\s.\-]', '', cedula)
-    
-    # Debe ser numérica y tener entre 7 y 10 dígitos
-    if not cedula_limpia.isdigit():
-        return False
+    cedula_limpia = _quitar_separadores_cedula('', cedula)
     
-    if len(cedula_limpia) < 6 or len(cedula_limpia) > 11:
-        return False
-    
-    return True
+    # Debe ser numérica y tener entre 6 y 11 dígitos
+    return cedula_limpia.isdigit() and 6 <= len(cedula_limpia) <= 11
 
 
 def limpiar_cedula(cedula: str) -> str:
@@ -48,7 +47,11 @@ def limpiar_cedula(cedula: str) -> str:
     if not cedula:
         return ''
     
-    return re.sub(r'[\s.\-]', '', str(cedula))
+    # Caso común: la cédula ya se limpió antes (lectura de la hoja, procesar_docente)
+    if isinstance(cedula, str) and cedula.isdigit():
+        return cedula
+    
+    return _quitar_separadores_cedula('', str(cedula))
 
 
 def corregir_encoding_mal_interpretado(texto: str) -> str:
@@ -539,7 +542,7 @@ def parsear_periodo_label(label: str) -> Optional[Dict[str, int]]:
         return None
     
     # Buscar patrón YYYY-N o YYYY - N
-    match = re.search(r'(\d{4})\s*[-\s]\s*0?([12])\b', label)
+    match = _buscar_periodo(label)
     
     if match:
         year = int(match.group(1))
@@ -562,7 +565,7 @@ def extraer_periodo_desde_texto(texto: str) -> Optional[str]:
     if not texto:
         return None
     
-    match = re.search(r'(\d{4})\s*[-\s]\s*0?([12])\b', texto)
+    match = _buscar_periodo(texto)
     
     if match:
         year = match.group(1)
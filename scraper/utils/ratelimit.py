@@ -0,0 +1,119 @@
+"""
+Limitador de tasa compartido entre hilos (token bucket)
+"""
+
+import logging
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Token bucket seguro para hilos.
+
+    Se reponen `rate` tokens por segundo hasta un máximo de `burst`. Cada
+    llamada a acquire() consume un token y bloquea solo el tiempo necesario
+    hasta que haya uno disponible, en lugar de dormir un delay fijo.
+
+    Ejemplo:
+        bucket = TokenBucket(rate=2.0, burst=4)
+        bucket.acquire()  # Retorna de inmediato mientras queden tokens
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """
+        Args:
+            rate: Tokens por segundo (<= 0 = sin límite)
+            burst: Tokens acumulables como máximo (default: 1, sin ráfagas)
+        """
+        self.rate = rate
+        self.burst = max(1, burst or 1)
+        self._tokens = float(self.burst)
+        self._ultimo = time.monotonic()
+        self._condicion = threading.Condition()
+
+    def _reponer(self, ahora: float):
+        """Repone los tokens acumulados desde la última lectura."""
+        self._tokens = min(self.burst, self._tokens + (ahora - self._ultimo) * self.rate)
+        self._ultimo = ahora
+
+    def acquire(self):
+        """Consume un token, esperando hasta que haya uno disponible."""
+        if self.rate <= 0:
+            return
+
+        with self._condicion:
+            while True:
+                self._reponer(time.monotonic())
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    # Despertar a otro hilo por si quedan tokens de la ráfaga
+                    self._condicion.notify()
+                    return
+                self._condicion.wait((1 - self._tokens) / self.rate)
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    """
+    Token bucket que ajusta su ritmo según la respuesta del servidor.
+
+    registrar_limite() (429, 5xx, timeouts) reduce el ritmo a la mitad hasta
+    min_rate; cada `exitos_para_subir` éxitos seguidos, registrar_exito() lo sube
+    un 10% sin pasar de max_rate. Con rate <= 0 (sin límite) no se ajusta nada.
+
+    Ejemplo:
+        bucket = AdaptiveTokenBucket(rate=2.0, burst=4)
+        bucket.acquire()
+        bucket.registrar_limite()  # El servidor respondió 429: bajar a 1 req/s
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[int] = None,
+        min_rate: Optional[float] = None,
+        max_rate: Optional[float] = None,
+        exitos_para_subir: int = 10
+    ):
+        """
+        Args:
+            rate: Tokens por segundo iniciales (<= 0 = sin límite)
+            burst: Tokens acumulables como máximo (default: 1, sin ráfagas)
+            min_rate: Ritmo mínimo al reducir (default: rate / 16)
+            max_rate: Ritmo máximo al recuperar (default: rate)
+            exitos_para_subir: Éxitos seguidos necesarios para subir el ritmo
+        """
+        super().__init__(rate, burst)
+        self.min_rate = min_rate if min_rate is not None else rate / 16
+        self.max_rate = max_rate if max_rate is not None else rate
+        self.exitos_para_subir = max(1, exitos_para_subir)
+        self._exitos = 0
+
+    def _ajustar(self, rate: float):
+        """Cambia el ritmo conservando los tokens acumulados hasta ahora."""
+        self._reponer(time.monotonic())
+        if rate != self.rate:
+            logger.info("Ritmo de requests ajustado: %.2f → %.2f req/s", self.rate, rate)
+            self.rate = rate
+            self._condicion.notify_all()
+
+    def registrar_exito(self):
+        """Registra una respuesta correcta; sube el ritmo tras varias seguidas."""
+        if self.rate <= 0:
+            return
+        with self._condicion:
+            self._exitos += 1
+            if self._exitos >= self.exitos_para_subir:
+                self._exitos = 0
+                self._ajustar(min(self.max_rate, self.rate * 1.1))
+
+    def registrar_limite(self):
+        """Registra que el servidor está limitando o saturado; reduce el ritmo."""
+        if self.rate <= 0:
+            return
+        with self._condicion:
+            self._exitos = 0
+            self._ajustar(max(self.min_rate, self.rate * 0.5))
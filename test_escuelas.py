@@ -55,29 +55,34 @@ casos_prueba_escuelas = [
     ("Administracion Y Orga", "Salud Pública"),
 ]
 
-print("="*80)
-print("PRUEBAS DE MAPEO DE ESCUELAS")
-print("="*80)
-print()
+# Acumular la salida y escribirla de una sola vez al final
+salida = []
+
+salida.append("="*80)
+salida.append("PRUEBAS DE MAPEO DE ESCUELAS")
+salida.append("="*80)
+salida.append("")
 
 # Probar departamentos -> escuelas
-print("1. MAPEO DE DEPARTAMENTOS A ESCUELAS")
-print("-" * 80)
+salida.append("1. MAPEO DE DEPARTAMENTOS A ESCUELAS")
+salida.append("-" * 80)
 for departamento, escuela_esperada in casos_prueba_departamentos:
     departamento_limpio = limpiar_departamento(departamento)
     escuela_obtenida = determinar_escuela_desde_departamento(departamento_limpio)
     resultado = "✓ PASS" if escuela_obtenida == escuela_esperada else "✗ FAIL"
-    print(f"{resultado} | {departamento:35} -> {escuela_obtenida:30} (esperado: {escuela_esperada})")
+    salida.append(f"{resultado} | {departamento:35} -> {escuela_obtenida:30} (esperado: {escuela_esperada})")
 
-print()
-print("2. NORMALIZACIÓN DE NOMBRES DE ESCUELAS")
-print("-" * 80)
+salida.append("")
+salida.append("2. NORMALIZACIÓN DE NOMBRES DE ESCUELAS")
+salida.append("-" * 80)
 for escuela_raw, escuela_esperada in casos_prueba_escuelas:
     escuela_obtenida = limpiar_escuela(escuela_raw)
     resultado = "✓ PASS" if escuela_obtenida == escuela_esperada else "✗ FAIL"
-    print(f"{resultado} | {escuela_raw:35} -> {escuela_obtenida:30} (esperado: {escuela_esperada})")
+    salida.append(f"{resultado} | {escuela_raw:35} -> {escuela_obtenida:30} (esperado: {escuela_esperada})")
+
+salida.append("")
+salida.append("="*80)
+salida.append("FIN DE PRUEBAS")
+salida.append("="*80)
 
-print()
-print("="*80)
-print("FIN DE PRUEBAS")
-print("="*80)
+sys.stdout.write("\n".join(salida) + "\n")
@@ -0,0 +1,58 @@
+"""
+Pruebas del checkpoint de flujo_completo (JSON compactado + log JSONL)
+"""
+
+import json
+
+from scraper.main import _cargar_checkpoint
+
+
+def _rutas(tmp_path):
+    return str(tmp_path / "checkpoint_2025_2.json"), str(tmp_path / "checkpoint_2025_2.jsonl")
+
+
+def test_sin_archivos_no_hay_cedulas(tmp_path):
+    assert _cargar_checkpoint(*_rutas(tmp_path)) == {}
+
+
+def test_combina_json_y_log_en_orden(tmp_path):
+    checkpoint_file, checkpoint_log = _rutas(tmp_path)
+    with open(checkpoint_file, "w", encoding="utf-8") as f:
+        json.dump({"cedulas_procesadas": ["111", "222"], "periodo": "2025-2"}, f)
+    with open(checkpoint_log, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"cedula": "333", "ts": 1.0}) + "\n")
+        f.write(json.dumps({"cedula": "111", "ts": 2.0}) + "\n")
+
+    assert list(_cargar_checkpoint(checkpoint_file, checkpoint_log)) == ["111", "222", "333"]
+
+
+def test_ignora_linea_truncada_al_final_del_log(tmp_path):
+    checkpoint_file, checkpoint_log = _rutas(tmp_path)
+    with open(checkpoint_log, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"cedula": "111", "ts": 1.0}) + "\n")
+        f.write(json.dumps({"cedula": "222", "ts": 2.0}) + "\n")
+        # Corte a mitad de escritura
+        f.write('{"cedula": "33')
+
+    assert list(_cargar_checkpoint(checkpoint_file, checkpoint_log)) == ["111", "222"]
+
+
+def test_ignora_lineas_sin_cedula(tmp_path):
+    checkpoint_file, checkpoint_log = _rutas(tmp_path)
+    with open(checkpoint_log, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"ts": 1.0}) + "\n")
+        f.write("[]\n")
+        f.write(json.dumps({"cedula": "444", "ts": 2.0}) + "\n")
+
+    assert list(_cargar_checkpoint(checkpoint_file, checkpoint_log)) == ["444"]
+
+
+def test_json_corrupto_conserva_el_log(tmp_path):
+    checkpoint_file, checkpoint_log = _rutas(tmp_path)
+    with open(checkpoint_file, "w", encoding="utf-8") as f:
+        f.write("{no es json")
+    with open(checkpoint_log, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"cedula": "555", "ts": 1.0}) + "\n")
+
+    assert list(_cargar_checkpoint(checkpoint_file, checkpoint_log)) == ["555"]
+
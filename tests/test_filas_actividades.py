@@ -0,0 +1,96 @@
+"""
+Pruebas del ancho y orden de las filas que construir_filas_actividades escribe
+en la hoja del período
+"""
+
+import logging
+
+from scraper.main import (
+    _ACTIVIDAD_HEADERS,
+    _CAMPOS_FILA_FIN,
+    _CAMPOS_FILA_INICIO,
+    construir_filas_actividades,
+    mapear_tipo_actividad,
+)
+
+logger = logging.getLogger(__name__)
+
+# Campo de la actividad esperado en cada columna, en el orden de _ACTIVIDAD_HEADERS
+_ACTIVIDAD = {
+    'cedula': '1234567',
+    'nombre_profesor': 'PEREZ JUAN',
+    'escuela': 'Escuela de Medicina',
+    'departamento': 'Departamento de Pediatría',
+    'tipo_actividad': 'Pregrado',
+    'categoria': 'Docencia',
+    'nombre_actividad': 'Anatomía',
+    'numero_horas': '64.5',
+    'periodo': '2025-2',
+    'codigo': '601001C',
+    'actividad': 'Docencia',
+    'vinculacion': 'Nombrado',
+    'dedicacion': 'Tiempo Completo',
+    'nivel': 'Doctorado',
+    'cargo': 'Profesor',
+    'departamento_profesor': 'Pediatría',
+}
+
+
+def test_campos_de_fila_cubren_los_headers_sin_fecha():
+    # Campos copiados + horas, período y detalle + departamento del profesor;
+    # 'Fecha' (última columna) no la llena construir_filas_actividades
+    assert len(_CAMPOS_FILA_INICIO) + 3 + len(_CAMPOS_FILA_FIN) + 1 == len(_ACTIVIDAD_HEADERS) - 1
+
+
+def test_ancho_de_fila_igual_a_headers_sin_fecha():
+    filas = construir_filas_actividades([_ACTIVIDAD], '2025-2', logger)
+    assert len(filas) == 1
+    assert len(filas[0]) == len(_ACTIVIDAD_HEADERS) - 1
+
+
+def test_orden_de_columnas():
+    fila, = construir_filas_actividades([_ACTIVIDAD], '2025-2', logger)
+    por_header = dict(zip(_ACTIVIDAD_HEADERS, fila))
+
+    assert por_header == {
+        'Cedula': '1234567',
+        'Nombre Profesor': 'PEREZ JUAN',
+        'Escuela': 'Escuela de Medicina',
+        'Departamento': 'Departamento de Pediatría',
+        'Tipo Actividad': 'Pregrado',
+        'Categoría': 'Docencia',
+        'Nombre Actividad': 'Anatomía',
+        'Número de Horas': 64,
+        'Periodo': '2025-2',
+        'Detalle Actividad': '601001C',
+        'Actividad': 'Docencia',
+        'Vinculación': 'Nombrado',
+        'Dedicación': 'Tiempo Completo',
+        'Nivel': 'Doctorado',
+        'Cargo': 'Profesor',
+        'departamento': 'Pediatría',
+    }
+
+
+def test_campos_faltantes_quedan_vacios_con_el_mismo_ancho():
+    fila, = construir_filas_actividades([{'cedula': '1234567', 'departamento': 'Pediatría'}], '2026-1', logger)
+    por_header = dict(zip(_ACTIVIDAD_HEADERS, fila))
+
+    assert len(fila) == len(_ACTIVIDAD_HEADERS) - 1
+    assert por_header['Número de Horas'] == 0
+    assert por_header['Periodo'] == '2026-1'
+    assert por_header['Cargo'] == ''
+    # Sin departamento_profesor se usa el departamento de la actividad
+    assert por_header['departamento'] == 'Pediatría'
+
+
+def test_horas_no_numericas_quedan_en_cero():
+    actividad = {**_ACTIVIDAD, 'numero_horas': 'N/A'}
+    fila, = construir_filas_actividades([actividad], '2025-2', logger)
+    assert fila[_ACTIVIDAD_HEADERS.index('Número de Horas')] == 0
+
+
+def test_detalle_usa_tipo_mapeado_si_existe():
+    actividad = {**_ACTIVIDAD, 'tipo': 'CL'}
+    fila, = construir_filas_actividades([actividad], '2025-2', logger)
+    assert fila[_ACTIVIDAD_HEADERS.index('Detalle Actividad')] == mapear_tipo_actividad('CL')
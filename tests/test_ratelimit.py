@@ -0,0 +1,94 @@
+"""
+Pruebas de TokenBucket y AdaptiveTokenBucket
+"""
+
+import time
+
+from scraper.utils.ratelimit import AdaptiveTokenBucket, TokenBucket
+
+
+def _medir(funcion) -> float:
+    inicio = time.monotonic()
+    funcion()
+    return time.monotonic() - inicio
+
+
+def test_sin_limite_no_bloquea():
+    bucket = TokenBucket(rate=0)
+    assert _medir(lambda: [bucket.acquire() for _ in range(1000)]) < 0.1
+
+
+def test_rafaga_inicial_sin_espera():
+    bucket = TokenBucket(rate=1, burst=3)
+    assert _medir(lambda: [bucket.acquire() for _ in range(3)]) < 0.05
+
+
+def test_espera_reposicion_al_agotar_rafaga():
+    bucket = TokenBucket(rate=10, burst=2)
+    bucket.acquire()
+    bucket.acquire()
+    # Sin tokens: el siguiente espera ~1/rate segundos
+    espera = _medir(bucket.acquire)
+    assert 0.07 <= espera < 0.5
+
+
+def test_reposicion_no_supera_burst():
+    bucket = TokenBucket(rate=100, burst=2)
+    bucket.acquire()
+    time.sleep(0.1)
+    bucket._reponer(time.monotonic())
+    assert bucket._tokens == 2
+
+
+def test_burst_minimo_es_uno():
+    assert TokenBucket(rate=5, burst=0).burst == 1
+    assert TokenBucket(rate=5).burst == 1
+
+
+def test_adaptativo_reduce_a_la_mitad_hasta_min_rate():
+    bucket = AdaptiveTokenBucket(rate=8, min_rate=2)
+    bucket.registrar_limite()
+    assert bucket.rate == 4
+    bucket.registrar_limite()
+    bucket.registrar_limite()
+    assert bucket.rate == 2
+
+
+def test_adaptativo_min_rate_por_defecto():
+    bucket = AdaptiveTokenBucket(rate=16)
+    for _ in range(10):
+        bucket.registrar_limite()
+    assert bucket.rate == 1
+
+
+def test_adaptativo_recupera_tras_exitos_sin_pasar_max_rate():
+    bucket = AdaptiveTokenBucket(rate=10, exitos_para_subir=3)
+    bucket.registrar_limite()
+    assert bucket.rate == 5
+
+    # Menos éxitos de los necesarios no cambian el ritmo
+    bucket.registrar_exito()
+    bucket.registrar_exito()
+    assert bucket.rate == 5
+    bucket.registrar_exito()
+    assert abs(bucket.rate - 5.5) < 1e-9
+
+    for _ in range(100):
+        bucket.registrar_exito()
+    assert bucket.rate == 10
+
+
+def test_adaptativo_limite_reinicia_racha_de_exitos():
+    bucket = AdaptiveTokenBucket(rate=10, exitos_para_subir=2)
+    bucket.registrar_limite()
+    bucket.registrar_exito()
+    bucket.registrar_limite()
+    bucket.registrar_exito()
+    assert bucket.rate == 2.5
+
+
+def test_adaptativo_sin_limite_no_se_ajusta():
+    bucket = AdaptiveTokenBucket(rate=0)
+    bucket.registrar_limite()
+    bucket.registrar_exito()
+    assert bucket.rate == 0
@@ -0,0 +1,190 @@
+"""
+Pruebas de SheetsWriteBuffer: umbrales de vaciado, avisos de escritura y
+escrituras fallidas
+"""
+
+import threading
+import time
+
+import pytest
+from gspread.exceptions import WorksheetNotFound
+
+from scraper.services.sheets_service import SheetsWriteBuffer
+
+
+class _ServicioFalso:
+    """Sustituto de SheetsService que registra cada agregar_filas_lote."""
+
+    def __init__(self, hojas=None):
+        self.lotes = []
+        self.fallar = False
+        self.hojas = hojas
+        self.intentos = 0
+        self.escrito = threading.Event()
+
+    def agregar_filas_lote(self, filas_por_hoja):
+        self.intentos += 1
+        if self.fallar:
+            raise RuntimeError("cuota excedida")
+        for nombre_hoja in filas_por_hoja:
+            if self.hojas is not None and nombre_hoja not in self.hojas:
+                raise WorksheetNotFound(nombre_hoja)
+        self.lotes.append(dict(filas_por_hoja))
+        self.escrito.set()
+
+
+def test_no_escribe_bajo_el_umbral_de_celdas():
+    servicio = _ServicioFalso()
+    buffer = SheetsWriteBuffer(servicio, max_celdas=10, intervalo=0)
+    buffer.agregar_filas("2025-2", [[1, 2, 3]])
+    buffer.agregar_filas("2025-2", [[4, 5, 6]])
+    assert servicio.lotes == []
+
+
+def test_escribe_al_alcanzar_max_celdas():
+    servicio = _ServicioFalso()
+    buffer = SheetsWriteBuffer(servicio, max_celdas=6, intervalo=0)
+    buffer.agregar_filas("2025-2", [[1, 2, 3]])
+    buffer.agregar_filas("2026-1", [[4, 5, 6]])
+    assert servicio.lotes == [{"2025-2": [[1, 2, 3]], "2026-1": [[4, 5, 6]]}]
+
+    # El buffer queda vacío: flush no vuelve a escribir
+    buffer.flush()
+    assert len(servicio.lotes) == 1
+
+
+def test_filas_vacias_se_ignoran():
+    servicio = _ServicioFalso()
+    with SheetsWriteBuffer(servicio, intervalo=0) as buffer:
+        buffer.agregar_filas("2025-2", [])
+    assert servicio.lotes == []
+
+
+def test_escribe_al_salir_del_bloque_with():
+    servicio = _ServicioFalso()
+    with SheetsWriteBuffer(servicio, max_celdas=1000, intervalo=0) as buffer:
+        buffer.agregar_filas("2025-2", [[1]])
+        assert servicio.lotes == []
+    assert servicio.lotes == [{"2025-2": [[1]]}]
+
+
+def test_agregar_lote_avisa_solo_tras_escribir():
+    servicio = _ServicioFalso()
+    avisos = []
+    with SheetsWriteBuffer(servicio, max_celdas=1000, intervalo=0) as buffer:
+        buffer.agregar_lote({"Periodo_2025-2": [[1]], "Periodo_2025-2_Pregrado": [[2]]}, avisos.append)
+        assert avisos == []
+    assert avisos == [None]
+    assert servicio.lotes == [{"Periodo_2025-2": [[1]], "Periodo_2025-2_Pregrado": [[2]]}]
+
+
+def test_agregar_lote_avisa_el_error_si_se_descarta():
+    servicio = _ServicioFalso(hojas={"Periodo_2025-2"})
+    avisos = []
+    with SheetsWriteBuffer(servicio, max_celdas=1000, intervalo=0) as buffer:
+        buffer.agregar_lote({"Periodo_2025-2": [[1]]}, avisos.append)
+        buffer.agregar_lote({"Periodo_2025-2": [[2]], "Periodo_2025-2_Borrada": [[3]]}, avisos.append)
+    assert avisos[0] is None
+    assert isinstance(avisos[1], WorksheetNotFound)
+
+
+def test_salida_con_flush_fallido_avisa_a_los_pendientes():
+    servicio = _ServicioFalso()
+    servicio.fallar = True
+    avisos = []
+    with pytest.raises(RuntimeError):
+        with SheetsWriteBuffer(servicio, intervalo=0) as buffer:
+            buffer.agregar_lote({"2025-2": [[1]]}, avisos.append)
+    assert len(avisos) == 1 and isinstance(avisos[0], RuntimeError)
+
+
+def test_temporizador_escribe_sin_filas_nuevas():
+    servicio = _ServicioFalso()
+    with SheetsWriteBuffer(servicio, max_celdas=1000, intervalo=0.1) as buffer:
+        buffer.agregar_filas("2025-2", [[1]])
+        assert servicio.escrito.wait(2)
+        assert servicio.lotes == [{"2025-2": [[1]]}]
+
+
+def test_flush_fallido_conserva_las_filas():
+    servicio = _ServicioFalso()
+    buffer = SheetsWriteBuffer(servicio, max_celdas=1000, intervalo=0)
+    buffer.agregar_filas("2025-2", [[1], [2]])
+    servicio.fallar = True
+    with pytest.raises(RuntimeError):
+        buffer.flush()
+
+    # Las filas que llegan después van detrás de las no escritas
+    buffer.agregar_filas("2025-2", [[3]])
+    servicio.fallar = False
+    buffer.flush()
+    assert servicio.lotes == [{"2025-2": [[1], [2], [3]]}]
+
+
+def test_vaciado_por_tamano_fallido_no_propaga_y_reintenta():
+    servicio = _ServicioFalso()
+    buffer = SheetsWriteBuffer(servicio, max_celdas=2, intervalo=0)
+    servicio.fallar = True
+    # El error se registra, no se propaga al hilo que agrega filas
+    buffer.agregar_filas("2025-2", [[1, 2]])
+    assert servicio.lotes == []
+
+    servicio.fallar = False
+    buffer.agregar_filas("2025-2", [[3, 4]])
+    assert servicio.lotes == [{"2025-2": [[1, 2], [3, 4]]}]
+
+
+def test_descarta_las_filas_tras_max_intentos():
+    servicio = _ServicioFalso()
+    buffer = SheetsWriteBuffer(servicio, max_celdas=1000, intervalo=0, max_intentos=2)
+    buffer.agregar_filas("2025-2", [[1]])
+    servicio.fallar = True
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            buffer.flush()
+
+    # Ya no quedan filas que reintentar
+    servicio.fallar = False
+    buffer.flush()
+    assert servicio.intentos == 2
+    assert servicio.lotes == []
+
+
+def test_hoja_inexistente_no_bloquea_las_demas():
+    servicio = _ServicioFalso(hojas={"2025-2"})
+    buffer = SheetsWriteBuffer(servicio, max_celdas=1000, intervalo=0)
+    buffer.agregar_filas("2025-2", [[1]])
+    buffer.agregar_filas("2025-2_borrada", [[2]])
+    buffer.flush()
+    assert servicio.lotes == [{"2025-2": [[1]]}]
+
+    # Las filas de la hoja inexistente se descartaron, no se reintentan
+    buffer.flush()
+    assert servicio.intentos == 2
+
+
+def test_salida_con_excepcion_no_oculta_el_error_original():
+    servicio = _ServicioFalso()
+    servicio.fallar = True
+    with pytest.raises(KeyError):
+        with SheetsWriteBuffer(servicio, intervalo=0) as buffer:
+            buffer.agregar_filas("2025-2", [[1]])
+            raise KeyError("original")
+
+
+def test_agregar_desde_varios_hilos():
+    servicio = _ServicioFalso()
+    with SheetsWriteBuffer(servicio, max_celdas=50, intervalo=0) as buffer:
+        def _agregar(inicio):
+            for i in range(inicio, inicio + 100):
+                buffer.agregar_filas("2025-2", [[i]])
+                time.sleep(0)
+
+        hilos = [threading.Thread(target=_agregar, args=(k * 100,)) for k in range(4)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+    escritas = [fila[0] for lote in servicio.lotes for fila in lote["2025-2"]]
+    assert sorted(escritas) == list(range(400))